@@ -1,7 +1,8 @@
 """Agent Factory Agent - Automatically creates AgentClick agents from descriptions."""
 
 from agents.base_agent import BaseAgent, AgentMetadata
-from typing import Optional
+from agents.prompt_templates import PromptTemplate
+from typing import Optional, List, Union
 import re
 import os
 
@@ -9,18 +10,8 @@ import os
 class AgentFactoryAgent(BaseAgent):
     """Agent that automatically creates other AgentClick agents."""
 
-    @property
-    def metadata(self) -> AgentMetadata:
-        return AgentMetadata(
-            name="Agent Factory Agent",
-            description="Automatically creates AgentClick agents from descriptions without asking questions",
-            icon="🏭",
-            color="#9b59b6"
-        )
-
-    def get_system_prompt(self, context: str, context_folder: Optional[str] = None,
-                         focus_file: Optional[str] = None) -> str:
-        prompt = """You are a specialized Agent Factory Agent that automatically creates AgentClick agents.
+    prompt_template = PromptTemplate(
+        instructions="""You are a specialized Agent Factory Agent that automatically creates AgentClick agents.
 
 **Your Role:**
 When given a description of an agent, you will AUTOMATICALLY create a complete, functional AgentClick agent file WITHOUT asking any questions or requesting confirmation.
@@ -85,25 +76,34 @@ All agents must be saved to: C:\\.agent_click\\agents\\
 Input: "create a code reviewer that finds bugs"
 Output: C:\\.agent_click\\agents\\bug_finder_agent.py
 (And the file is created automatically)
-"""
+""",
+        context_header="\n\n**AgentClick System Context:**\n",
+        folder_lines=("Working in: {context_folder}\n",),
+        focus_lines=("Focus file: {focus_file}\n",),
+        context_footer=(
+            "\nThe AgentClick system is at: C:\\.agent_click\\\n"
+            "Agents folder: C:\\.agent_click\\agents\\\n"
+            "Base class: agents.base_agent.BaseAgent\n"
+        )
+    )
 
-        # Add context about the AgentClick system if available
-        if context_folder or focus_file:
-            prompt += "\n\n**AgentClick System Context:**\n"
-            if context_folder:
-                prompt += f"Working in: {context_folder}\n"
-            if focus_file:
-                prompt += f"Focus file: {focus_file}\n"
-            prompt += "\nThe AgentClick system is at: C:\\.agent_click\\\n"
-            prompt += "Agents folder: C:\\.agent_click\\agents\\\n"
-            prompt += "Base class: agents.base_agent.BaseAgent\n"
+    @property
+    def metadata(self) -> AgentMetadata:
+        return AgentMetadata(
+            name="Agent Factory Agent",
+            description="Automatically creates AgentClick agents from descriptions without asking questions",
+            icon="🏭",
+            color="#9b59b6"
+        )
 
-        return prompt
+    def get_system_prompt(self, context: str, context_folder: Optional[str] = None,
+                         focus_file: Optional[str] = None) -> str:
+        return self.render_system_prompt()
 
     def process(self, text: str, context_folder: Optional[str] = None,
                focus_file: Optional[str] = None, output_mode: str = "AUTO",
-               image_path: Optional[str] = None, verbose_logging: bool = False,
-               log_callback: Optional[callable] = None):
+               image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False,
+               log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None):
         """Process agent creation request.
 
         Args:
@@ -114,13 +114,14 @@ Output: C:\\.agent_click\\agents\\bug_finder_agent.py
             image_path: Optional image path for visual analysis
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
         """
         from agents.output_modes import AgentResult, OutputMode
 
         self.logger.info(f"Creating agent from description: {text[:50]}...")
 
         # Call base class to get the agent code
-        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback)
+        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback, stream_callback)
 
         # Extract the file path from the result
         file_path = result.content.strip().split('\n')[0].strip()
@@ -1,73 +1,196 @@
 """Agent registry for managing available agents."""
 
-from typing import Dict, Optional, List
+from typing import Callable, Dict, Optional, List
 from pathlib import Path
 import importlib.util
+import threading
 from agents.base_agent import BaseAgent
+from agents.prompt_templates import get_prompt_renderer
 from utils.logger import setup_logger
 
 logger = setup_logger('AgentRegistry')
 
 
 class AgentRegistry:
-    """Registry for managing and discovering agents."""
+    """Registry for managing and discovering agents.
 
-    def __init__(self):
-        """Initialize agent registry."""
+    The agents/ folder is watched after discovery: new or edited agent files
+    are (re)loaded and deleted ones are unregistered without a restart.
+    """
+
+    def __init__(self, watch: bool = True):
+        """Initialize agent registry.
+
+        Args:
+            watch: Reload agents when files in agents/ change
+        """
         self.agents: Dict[str, BaseAgent] = {}
         self.agent_names: List[str] = []
         self.current_index = 0
+        self._agent_files: Dict[str, List[str]] = {}  # file path -> agent names
+        self._reload_listeners: List[Callable[[str], None]] = []
+        self._lock = threading.RLock()
+        self.agents_dir = Path(__file__).parent
         self._discover_agents()
 
+        # Rendered system prompts of a reloaded module are stale
+        self.add_reload_listener(get_prompt_renderer().invalidate)
+
+        if watch:
+            self._watch_agents_dir()
+
     def _discover_agents(self) -> None:
         """Discover and load all agent plugins."""
-        agents_dir = Path(__file__).parent
-
-        for agent_file in agents_dir.glob("*.py"):
+        for agent_file in sorted(self.agents_dir.glob("*.py")):
             if agent_file.name.startswith('_'):
                 continue
-
-            try:
-                # Load module dynamically
-                module_name = f"agents.{agent_file.stem}"
-                spec = importlib.util.spec_from_file_location(
-                    module_name,
-                    agent_file
-                )
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
-
-                # Find agent classes
-                for attr_name in dir(module):
-                    attr = getattr(module, attr_name)
-                    if (isinstance(attr, type) and
-                        issubclass(attr, BaseAgent) and
-                        attr is not BaseAgent):
-
-                        # Instantiate and register
-                        agent_instance = attr()
-                        self.agents[agent_instance.metadata.name] = agent_instance
-                        self.agent_names.append(agent_instance.metadata.name)
-                        logger.info(
-                            f"Registered agent: {agent_instance.metadata.name} "
-                            f"({agent_instance.metadata.icon})"
-                        )
-
-            except Exception as e:
-                logger.error(f"Error loading agent from {agent_file}: {e}")
+            self._load_agent_file(agent_file)
 
         if not self.agents:
             logger.warning("No agents found!")
 
+    def _load_agent_file(self, agent_file: Path) -> List[str]:
+        """Load (or reload) agents defined in a single file.
+
+        Args:
+            agent_file: Path to agent module
+
+        Returns:
+            Names of agents registered from the file
+        """
+        names: List[str] = []
+
+        try:
+            # Load module dynamically
+            module_name = f"agents.{agent_file.stem}"
+            spec = importlib.util.spec_from_file_location(
+                module_name,
+                agent_file
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            # Find agent classes defined in this module
+            for attr_name in dir(module):
+                attr = getattr(module, attr_name)
+                if (isinstance(attr, type) and
+                    issubclass(attr, BaseAgent) and
+                    attr is not BaseAgent and
+                    attr.__module__ == module_name):
+
+                    # Instantiate and register
+                    agent_instance = attr()
+                    name = agent_instance.metadata.name
+                    with self._lock:
+                        if name not in self.agents:
+                            self.agent_names.append(name)
+                        self.agents[name] = agent_instance
+                    names.append(name)
+                    logger.info(
+                        f"Registered agent: {name} "
+                        f"({agent_instance.metadata.icon})"
+                    )
+
+        except Exception as e:
+            logger.error(f"Error loading agent from {agent_file}: {e}")
+
+        with self._lock:
+            # Agents that disappeared from a reloaded file
+            for name in self._agent_files.get(str(agent_file), []):
+                if name not in names:
+                    self._unregister(name)
+            if names:
+                self._agent_files[str(agent_file)] = names
+            else:
+                self._agent_files.pop(str(agent_file), None)
+
+        return names
+
+    def _unregister(self, name: str) -> None:
+        """Remove an agent, keeping the current agent selected if possible."""
+        with self._lock:
+            if name not in self.agents:
+                return
+
+            current = self.agent_names[self.current_index] if self.agent_names else None
+            del self.agents[name]
+            self.agent_names.remove(name)
+
+            if current in self.agent_names:
+                self.current_index = self.agent_names.index(current)
+            elif self.agent_names:
+                self.current_index %= len(self.agent_names)
+            else:
+                self.current_index = 0
+
+        logger.info(f"Unregistered agent: {name}")
+
+    def _watch_agents_dir(self) -> None:
+        """Subscribe to changes in the agents folder."""
+        try:
+            from core.file_watcher import get_file_watcher
+            get_file_watcher().subscribe(str(self.agents_dir), self._on_agent_files_changed, recursive=False)
+        except Exception as e:
+            logger.warning(f"Agent hot reload disabled: {e}")
+
+    def _on_agent_files_changed(self, events) -> None:
+        """Reload agent modules changed on disk.
+
+        Args:
+            events: FileEvent batch from the watcher
+        """
+        from core.file_watcher import FileEvent, DELETED, MODIFIED, RESCAN
+
+        if any(event.kind == RESCAN for event in events):
+            # Events were lost - re-check every known and present agent file
+            paths = {str(p) for p in self.agents_dir.glob("*.py")} | set(self._agent_files)
+            events = [FileEvent(p, MODIFIED if Path(p).exists() else DELETED) for p in sorted(paths)]
+
+        for event in events:
+            agent_file = Path(event.path)
+            if agent_file.suffix != ".py" or agent_file.name.startswith('_'):
+                continue
+            if agent_file.parent != self.agents_dir:
+                continue
+
+            module_name = f"agents.{agent_file.stem}"
+            if event.kind == DELETED:
+                with self._lock:
+                    names = self._agent_files.pop(str(agent_file), [])
+                for name in names:
+                    self._unregister(name)
+            else:
+                logger.info(f"Agent file changed: {agent_file.name} - reloading")
+                self._load_agent_file(agent_file)
+
+            self._notify_reload(module_name)
+
+    def add_reload_listener(self, callback: Callable[[str], None]) -> None:
+        """Register a callback invoked after an agent module is (re)loaded or removed.
+
+        Args:
+            callback: Called with the module name (e.g. "agents.tac_bug_planner_agent")
+        """
+        self._reload_listeners.append(callback)
+
+    def _notify_reload(self, module_name: str) -> None:
+        """Invoke reload listeners."""
+        for callback in self._reload_listeners:
+            try:
+                callback(module_name)
+            except Exception as e:
+                logger.error(f"Error in reload listener: {e}")
+
     def get_current_agent(self) -> Optional[BaseAgent]:
         """Get current agent.
 
         Returns:
             Current agent or None if no agents available
         """
-        if not self.agent_names:
-            return None
-        return self.agents[self.agent_names[self.current_index]]
+        with self._lock:
+            if not self.agent_names:
+                return None
+            return self.agents[self.agent_names[self.current_index]]
 
     def next_agent(self) -> Optional[BaseAgent]:
         """Switch to next agent.
@@ -75,11 +198,12 @@ class AgentRegistry:
         Returns:
             Next agent or None if no agents available
         """
-        if not self.agent_names:
-            return None
+        with self._lock:
+            if not self.agent_names:
+                return None
 
-        self.current_index = (self.current_index + 1) % len(self.agent_names)
-        agent = self.get_current_agent()
+            self.current_index = (self.current_index + 1) % len(self.agent_names)
+            agent = self.get_current_agent()
         logger.info(f"Switched to agent: {agent.metadata.name}")
         return agent
 
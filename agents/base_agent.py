@@ -1,10 +1,14 @@
 """Base agent class for AgentClick system."""
 
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Union
 from claude_agent_sdk import query, ClaudeAgentOptions
-from config.sdk_config import create_sdk_options
+from claude_agent_sdk.types import StreamEvent
+from config.sdk_config import create_sdk_options, PROMPT_CACHE_BREAKPOINTS
+from agents.prompt_templates import PromptTemplate, get_prompt_renderer
+from agents.prompt_assembly import PromptAssembly, Stability, get_prompt_cache_stats
 from utils.logger import setup_logger
 
 logger = setup_logger('BaseAgent')
@@ -22,6 +26,12 @@ class AgentMetadata:
 class BaseAgent(ABC):
     """Abstract base class for all agents."""
 
+    # Optional static prompt template; agents that set it can implement
+    # get_system_prompt() with render_system_prompt() to get cached prompts.
+    # Its project-context section goes to the user prompt (_assemble_prompt)
+    # so the system prompt stays identical across projects.
+    prompt_template: Optional[PromptTemplate] = None
+
     def __init__(self):
         """Initialize agent."""
         self.logger = setup_logger(self.__class__.__name__)
@@ -44,7 +54,18 @@ class BaseAgent(ABC):
         """
         pass
 
-    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[str] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None):
+    def render_system_prompt(self) -> str:
+        """Render this agent's prompt_template through the shared prompt cache.
+
+        Only the static instructions are rendered; context folder and focus
+        file are added to the user prompt by _assemble_prompt().
+
+        Returns:
+            System prompt string
+        """
+        return get_prompt_renderer().render(type(self), self.prompt_template)
+
+    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None):
         """Process text with this agent.
 
         Args:
@@ -52,22 +73,26 @@ class BaseAgent(ABC):
             context_folder: Optional context folder path
             focus_file: Optional focus file path
             output_mode: Output mode (AUTO, CLIPBOARD_PURE, etc.)
-            image_path: NOVO - Optional image path for visual analysis
+            image_path: NOVO - Optional image path for visual analysis (a list
+                for several images, e.g. composite input)
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
 
         Returns:
             AgentResult with content and metadata
         """
         from agents.output_modes import OutputMode, AgentResult
 
+        started_at = time.time()  # File output must not clobber changes made after this
         self.logger.info(f"Processing with {self.metadata.name}")
         self.logger.debug(f"Input text: {text[:100]}...")
         self.logger.info(f"Output mode: {output_mode}")
 
         # NOVO: Log se tiver imagem
-        if image_path:
-            self.logger.info(f"Image provided: {image_path}")
+        image_paths = self._image_paths(image_path)
+        for path in image_paths:
+            self.logger.info(f"Image provided: {path}")
 
         if context_folder:
             self.logger.info(f"Context folder: {context_folder}")
@@ -75,15 +100,31 @@ class BaseAgent(ABC):
             self.logger.info(f"Focus file: {focus_file}")
 
         try:
+            # Screenshots may still be encoding in the background
+            image_paths = [self._wait_for_image(path) for path in image_paths]
+
             # Create SDK options
             system_prompt = self.get_system_prompt(text, context_folder, focus_file)
+            self.logger.debug(f"Prompt render cache: {get_prompt_renderer().get_stats()}")
             options = create_sdk_options(system_prompt, cwd=context_folder)
+            if stream_callback:
+                options.include_partial_messages = True  # Text deltas for stream_callback
 
-            # Build prompt with context (NOVO: Pass image_path)
-            prompt = self._build_prompt(text, context_folder, focus_file, image_path)
+            # Build prompt from stable to volatile segments (NOVO: Pass image_path)
+            prompt = self._assemble_prompt(text, context_folder, focus_file, image_paths, output_mode)
+            self.logger.debug(f"Prompt layout: {prompt.describe()}")
 
             # Query Claude SDK with verbose logging support
-            result_text = self._query_sdk(prompt, options, verbose_logging=verbose_logging, log_callback=log_callback)
+            usage: Dict[str, Any] = {}
+            result_text = self._query_sdk(prompt, options, verbose_logging=verbose_logging, log_callback=log_callback, usage=usage, stream_callback=stream_callback)
+
+            # Record prompt-cache effectiveness for this activation
+            token_usage = get_prompt_cache_stats().record(usage)
+            if usage:
+                self.logger.info(
+                    f"Input tokens: {token_usage['cache_read_input_tokens']} cached, "
+                    f"{token_usage['uncached_input_tokens'] + token_usage['cache_creation_input_tokens']} uncached"
+                )
 
             # Parse output to extract thoughts and content (if formatted)
             content, raw_thoughts = self._parse_output(result_text)
@@ -101,7 +142,9 @@ class BaseAgent(ABC):
                     "agent": self.metadata.name,
                     "context_folder": context_folder,
                     "focus_file": focus_file,
-                    "image_path": image_path  # NOVO: Include in metadata
+                    "image_path": image_paths[0] if len(image_paths) == 1 else (image_paths or None),  # NOVO: Include in metadata
+                    "usage": token_usage,
+                    "started_at": started_at
                 },
                 raw_thoughts=raw_thoughts,
                 suggested_filename=suggested_filename
@@ -114,6 +157,35 @@ class BaseAgent(ABC):
             raise
 
 
+    @staticmethod
+    def _image_paths(image_path: Optional[Union[str, List[str]]]) -> List[str]:
+        """Normalize the image_path argument of process() to a list."""
+        if not image_path:
+            return []
+        if isinstance(image_path, str):
+            return [image_path]
+        return [path for path in image_path if path]
+
+    def _wait_for_image(self, image_path: str) -> str:
+        """Wait for a background-encoded image to be written.
+
+        Args:
+            image_path: Image path passed to process()
+
+        Returns:
+            Path of the written file (screenshots are handed out under a
+            provisional path and stored by content, see core.image_store)
+        """
+        from core.image_pipeline import get_image_encoder
+        from core.image_store import get_image_store
+
+        encoder = get_image_encoder()
+        if encoder.is_pending(image_path):
+            start = time.perf_counter()
+            encoder.wait_for(image_path)
+            self.logger.debug(f"Waited {(time.perf_counter() - start) * 1000:.0f}ms for image encoding")
+        return get_image_store().resolve(image_path)
+
     def _parse_output(self, output: str) -> Tuple[str, Optional[str]]:
         """Parse output to extract thoughts and main content.
 
@@ -168,54 +240,106 @@ class BaseAgent(ABC):
 
         return None
 
-    def _build_prompt(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, image_path: Optional[str] = None) -> str:
+    def _build_prompt(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, image_path: Optional[Union[str, List[str]]] = None) -> str:
         """Build prompt for Claude SDK.
 
         Args:
             text: Input text
             context_folder: Optional context folder
             focus_file: Optional focus file
-            image_path: NOVO - Optional image path
+            image_path: NOVO - Optional image path (or list of paths)
 
         Returns:
             Formatted prompt
         """
-        prompt_parts = []
+        return self._assemble_prompt(text, context_folder, focus_file, image_path).to_text()
 
-        # Add context information if available
-        if context_folder or focus_file:
-            prompt_parts.append("CONTEXT INFORMATION:")
+    def _assemble_prompt(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, image_path: Optional[Union[str, List[str]]] = None, output_mode: str = "AUTO") -> PromptAssembly:
+        """Assemble prompt segments ordered from most to least stable.
 
-            if context_folder:
-                prompt_parts.append(f"• Context Folder: {context_folder}")
+        Context folder and focus file rarely change between activations, so
+        they come first; the task and image come last. Agents with a
+        prompt_template get its project-context section here instead of in
+        the system prompt.
 
-            if focus_file:
-                prompt_parts.append(f"• Focus File: {focus_file}")
+        Args:
+            text: Input text
+            context_folder: Optional context folder
+            focus_file: Optional focus file
+            image_path: Optional image path (or list of paths)
+            output_mode: Output mode (PATCH asks for edit blocks instead of whole files)
+
+        Returns:
+            PromptAssembly for the request
+        """
+        assembly = PromptAssembly()
+
+        if output_mode.upper() == "PATCH":
+            from core.output_patch import PATCH_FORMAT_INSTRUCTIONS
+            assembly.add("output_format", PATCH_FORMAT_INSTRUCTIONS, Stability.STATIC)
 
-            prompt_parts.append("")  # Empty line
+        if self.prompt_template and (context_folder or focus_file):
+            assembly.add(
+                "project_context",
+                self.prompt_template.render_context(context_folder, focus_file).strip(),
+                Stability.FOCUS if focus_file else Stability.PROJECT
+            )
+        else:
+            if context_folder:
+                assembly.add("project_context", f"CONTEXT INFORMATION:\n• Context Folder: {context_folder}", Stability.PROJECT)
 
-        # NOVO: Add image information if available
-        if image_path:
-            prompt_parts.append("VISUAL CONTEXT:")
-            prompt_parts.append(f"• Image attached: {image_path}")
-            prompt_parts.append(f"• Use this image for visual analysis if needed")
-            prompt_parts.append("")  # Empty line
+            if focus_file:
+                assembly.add("focus_file", f"FOCUS FILE:\n• Focus File: {focus_file}", Stability.FOCUS)
+
+        # NOVO: Add image information if available (sent inline, see _query_sdk)
+        image_paths = self._image_paths(image_path)
+        if len(image_paths) == 1:
+            assembly.add_image(
+                "visual_context",
+                "VISUAL CONTEXT:\n• Use this image for visual analysis if needed",
+                image_paths[0],
+                Stability.VOLATILE
+            )
+        else:
+            for number, path in enumerate(image_paths, 1):
+                assembly.add_image(
+                    f"visual_context_{number}",
+                    f"VISUAL CONTEXT {number} of {len(image_paths)}:\n"
+                    f"• Use this image for visual analysis if needed",
+                    path,
+                    Stability.VOLATILE
+                )
 
         # Add the main task
-        prompt_parts.append("TASK:")
-        prompt_parts.append(f"Process the following:\n{text}")
-        prompt_parts.append("\nProvide only the result, no explanations.")
+        assembly.add("task", f"TASK:\nProcess the following:\n{text}\n\nProvide only the result, no explanations.", Stability.VOLATILE)
+
+        return assembly
 
-        return "\n".join(prompt_parts)
+    @staticmethod
+    async def _prompt_stream(content: list):
+        """Yield a single user message with structured content (SDK streaming input).
 
-    def _query_sdk(self, prompt: str, options: ClaudeAgentOptions, verbose_logging: bool = False, log_callback: Optional[callable] = None) -> str:
+        Args:
+            content: List of content blocks
+        """
+        yield {
+            "type": "user",
+            "message": {"role": "user", "content": content},
+            "parent_tool_use_id": None,
+            "session_id": "default"
+        }
+
+    def _query_sdk(self, prompt, options: ClaudeAgentOptions, verbose_logging: bool = False, log_callback: Optional[callable] = None, usage: Optional[Dict[str, Any]] = None, stream_callback: Optional[callable] = None) -> str:
         """Query Claude SDK.
 
         Args:
-            prompt: Prompt to send
+            prompt: Prompt to send (string or PromptAssembly)
             options: SDK options
             verbose_logging: Whether to enable verbose logging
             log_callback: Optional callback for verbose log messages
+            usage: Optional dict filled with the token usage reported by the SDK
+            stream_callback: Optional callback receiving text deltas (needs
+                options.include_partial_messages)
 
         Returns:
             Response text
@@ -226,8 +350,20 @@ class BaseAgent(ABC):
             import asyncio
 
             async def run_query():
+                # Structured content is needed to mark cache breakpoints and
+                # to send images inline (saves a Read tool call per image)
+                if isinstance(prompt, PromptAssembly):
+                    if PROMPT_CACHE_BREAKPOINTS or prompt.has_images():
+                        sdk_prompt = self._prompt_stream(
+                            prompt.to_content_blocks(cache_control=PROMPT_CACHE_BREAKPOINTS)
+                        )
+                    else:
+                        sdk_prompt = prompt.to_text()
+                else:
+                    sdk_prompt = prompt
+
                 # Create the query generator
-                query_gen = query(prompt=prompt, options=options)
+                query_gen = query(prompt=sdk_prompt, options=options)
 
                 # Use verbose wrapper if enabled
                 if verbose_logging:
@@ -238,18 +374,26 @@ class BaseAgent(ABC):
                         enabled=True
                     )
                     # Use the wrapped query
-                    async for message in wrapper.wrapped_query():
-                        if hasattr(message, 'content'):
-                            for block in message.content:
-                                if hasattr(block, 'text'):
-                                    result_parts.append(block.text)
+                    messages = wrapper.wrapped_query()
                 else:
                     # Original behavior without verbose logging
-                    async for message in query_gen:
-                        if hasattr(message, 'content'):
-                            for block in message.content:
-                                if hasattr(block, 'text'):
-                                    result_parts.append(block.text)
+                    messages = query_gen
+
+                async for message in messages:
+                    if isinstance(message, StreamEvent):
+                        # Partial message: forward text deltas of the main conversation
+                        event = message.event
+                        if (stream_callback and message.parent_tool_use_id is None
+                                and event.get("type") == "content_block_delta"
+                                and event.get("delta", {}).get("type") == "text_delta"):
+                            stream_callback(event["delta"]["text"])
+                    elif hasattr(message, 'content'):
+                        for block in message.content:
+                            if hasattr(block, 'text'):
+                                result_parts.append(block.text)
+                    elif usage is not None and hasattr(message, 'total_cost_usd'):
+                        # ResultMessage: final token usage for the activation
+                        usage.update(message.usage or {})
 
             asyncio.run(run_query())
 
@@ -23,12 +23,21 @@ class OutputMode(Enum):
     FILE = "FILE"
     """Save output directly to a file in the project."""
 
+    FILES = "FILES"
+    """Save each file-annotated code block to its own file in the project."""
+
+    PATCH = "PATCH"
+    """Apply edit blocks / unified diffs to files in the project."""
+
     INTERACTIVE_EDITOR = "INTERACTIVE_EDITOR"
     """Open preview window for editing before finalizing output."""
 
     PASTE_TEXT = "PASTE_TEXT"
     """Paste text at current cursor insertion point."""
 
+    PASTE_STREAM = "PASTE_STREAM"
+    """Paste text at the cursor while the agent is still generating it."""
+
 
     @property
     def display_name(self) -> str:
@@ -38,8 +47,11 @@ class OutputMode(Enum):
             OutputMode.CLIPBOARD_PURE: "📋 Clipboard (Pure)",
             OutputMode.CLIPBOARD_RICH: "📋 Clipboard (Rich)",
             OutputMode.FILE: "💾 Save to File",
+            OutputMode.FILES: "📂 Save Files (from code blocks)",
+            OutputMode.PATCH: "🩹 Apply Patch (edit files in place)",
             OutputMode.INTERACTIVE_EDITOR: "✏️ Interactive Editor",
-            OutputMode.PASTE_TEXT: "📝 Paste Text (at cursor)"
+            OutputMode.PASTE_TEXT: "📝 Paste Text (at cursor)",
+            OutputMode.PASTE_STREAM: "⚡ Paste Text (streaming)"
         }
         return display_map.get(self, self.value)
 
@@ -52,8 +64,11 @@ class OutputMode(Enum):
             OutputMode.CLIPBOARD_PURE: "Raw content without formatting or metadata",
             OutputMode.CLIPBOARD_RICH: "Formatted content with markdown structure",
             OutputMode.FILE: "Automatically save to file in project folder",
+            OutputMode.FILES: "Write each code block annotated with a path to that file in the project folder",
+            OutputMode.PATCH: "Agent outputs search/replace edits or diffs that are applied to files in the project folder",
             OutputMode.INTERACTIVE_EDITOR: "Preview and edit before final output",
-            OutputMode.PASTE_TEXT: "Paste text directly at cursor insertion point"
+            OutputMode.PASTE_TEXT: "Paste text directly at cursor insertion point",
+            OutputMode.PASTE_STREAM: "Paste text at the cursor sentence by sentence as it is generated"
         }
         return desc_map.get(self, "")
 
@@ -80,7 +95,7 @@ class OutputMode(Enum):
 
     def should_use_file(self) -> bool:
         """Check if this mode requires file output."""
-        return self == OutputMode.FILE
+        return self in (OutputMode.FILE, OutputMode.FILES, OutputMode.PATCH)
 
 
     def should_use_clipboard(self) -> bool:
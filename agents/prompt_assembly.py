@@ -0,0 +1,246 @@
+"""Prompt assembly for AgentClick agents.
+
+Builds the user prompt from named segments ordered from most to least
+stable, so consecutive activations share the longest possible prefix and
+upstream prompt caching can reuse it:
+
+    agent instructions (system prompt) -> project context -> focus file -> task
+
+Also tracks cached vs. uncached input tokens reported by the SDK so the
+savings can be verified.
+"""
+
+import threading
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('PromptAssembly')
+
+
+class Stability(IntEnum):
+    """How often a prompt segment changes (lower = more stable)."""
+    STATIC = 0    # Agent instructions
+    PROJECT = 1   # Context folder / project context pack
+    FOCUS = 2     # Focus file
+    VOLATILE = 3  # Task text, images - changes every activation
+
+
+@dataclass
+class PromptSegment:
+    """A named piece of the prompt.
+
+    Attributes:
+        name: Segment name (for logging)
+        text: Segment text
+        stability: How often the segment changes
+        cache_breakpoint: Mark the end of this segment as a cache breakpoint
+        image_path: Image sent after the text (as an inline image block)
+    """
+    name: str
+    text: str
+    stability: Stability
+    cache_breakpoint: bool = False
+    image_path: Optional[str] = None
+
+
+class PromptAssembly:
+    """Ordered collection of prompt segments."""
+
+    SEPARATOR = "\n\n"
+
+    def __init__(self):
+        """Initialize empty assembly."""
+        self.segments: List[PromptSegment] = []
+
+    def add(self, name: str, text: str, stability: Stability) -> None:
+        """Add a segment (empty text is ignored).
+
+        Args:
+            name: Segment name
+            text: Segment text
+            stability: How often the segment changes
+        """
+        if text:
+            self.segments.append(PromptSegment(name, text, stability))
+
+    def add_image(self, name: str, text: str, image_path: str,
+                  stability: Stability = Stability.VOLATILE) -> None:
+        """Add an image segment.
+
+        Content blocks carry the image itself; plain text only has its path.
+
+        Args:
+            name: Segment name
+            text: Text placed before the image
+            image_path: Image file path
+            stability: How often the segment changes
+        """
+        self.segments.append(PromptSegment(name, text, stability, image_path=image_path))
+
+    def has_images(self) -> bool:
+        """Check if any segment carries an image.
+
+        Returns:
+            True if the prompt needs content blocks to include its images
+        """
+        return any(s.image_path for s in self.segments)
+
+    def ordered(self) -> List[PromptSegment]:
+        """Get segments from most to least stable.
+
+        A cache breakpoint is placed after the last non-volatile segment.
+        Insertion order is kept within the same stability level.
+
+        Returns:
+            Ordered list of segments
+        """
+        segments = sorted(self.segments, key=lambda s: s.stability)
+        for segment in segments:
+            segment.cache_breakpoint = False
+
+        stable = [s for s in segments if s.stability < Stability.VOLATILE]
+        if stable and len(stable) < len(segments):
+            stable[-1].cache_breakpoint = True
+
+        return segments
+
+    def to_text(self) -> str:
+        """Render the prompt as a single string.
+
+        Returns:
+            Prompt text
+        """
+        return self.SEPARATOR.join(self._segment_text(s) for s in self.ordered())
+
+    @staticmethod
+    def _segment_text(segment: PromptSegment) -> str:
+        """Text of a segment when its image cannot be sent inline."""
+        if segment.image_path:
+            return f"{segment.text}\n• Image attached: {segment.image_path}"
+        return segment.text
+
+    def to_content_blocks(self, cache_control: bool = False) -> List[Dict[str, Any]]:
+        """Render the prompt as content blocks split at cache breakpoints.
+
+        Image segments become a text block followed by an image block
+        (core.image_pipeline.ImageBlockCache); an image that cannot be sent
+        inline is referenced by path instead.
+
+        Args:
+            cache_control: Attach cache_control markers to breakpoint blocks
+
+        Returns:
+            List of {"type": "text"/"image", ...} content blocks
+        """
+        blocks: List[Dict[str, Any]] = []
+        pending: List[str] = []
+
+        for segment in self.ordered():
+            if segment.image_path:
+                from core.image_pipeline import get_image_block_cache
+                image_block = get_image_block_cache().get_block(segment.image_path)
+                if image_block is not None:
+                    if segment.cache_breakpoint and cache_control:
+                        image_block = dict(image_block, cache_control={"type": "ephemeral"})
+                    pending.append(segment.text)
+                    blocks.append({"type": "text", "text": self.SEPARATOR.join(pending)})
+                    blocks.append(image_block)
+                    pending = []
+                    continue
+
+            pending.append(self._segment_text(segment))
+            if segment.cache_breakpoint:
+                block = {"type": "text", "text": self.SEPARATOR.join(pending) + self.SEPARATOR}
+                if cache_control:
+                    block["cache_control"] = {"type": "ephemeral"}
+                blocks.append(block)
+                pending = []
+
+        if pending:
+            blocks.append({"type": "text", "text": self.SEPARATOR.join(pending)})
+
+        return blocks
+
+    def describe(self) -> str:
+        """Describe the layout for logging.
+
+        Returns:
+            e.g. "project_context(120) | focus_file(60) || task(530)"
+        """
+        parts = []
+        for segment in self.ordered():
+            parts.append(f"{segment.name}({len(segment.text)}{', image' if segment.image_path else ''})")
+            if segment.cache_breakpoint:
+                parts.append("||")
+        return " ".join(parts)
+
+
+class PromptCacheStats:
+    """Aggregates prompt-cache token usage reported by the SDK."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        self.activations = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(self, usage: Optional[Dict[str, Any]]) -> Dict[str, int]:
+        """Record the usage of one activation.
+
+        Args:
+            usage: Usage dict from the SDK ResultMessage
+
+        Returns:
+            Normalized per-activation usage (uncached, cache_read, cache_creation)
+        """
+        usage = usage or {}
+        entry = {
+            "uncached_input_tokens": int(usage.get("input_tokens") or 0),
+            "cache_read_input_tokens": int(usage.get("cache_read_input_tokens") or 0),
+            "cache_creation_input_tokens": int(usage.get("cache_creation_input_tokens") or 0),
+            "output_tokens": int(usage.get("output_tokens") or 0),
+        }
+
+        with self._lock:
+            self.activations += 1
+            self.input_tokens += entry["uncached_input_tokens"]
+            self.cache_read_tokens += entry["cache_read_input_tokens"]
+            self.cache_creation_tokens += entry["cache_creation_input_tokens"]
+
+        return entry
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get aggregated counters.
+
+        Returns:
+            Dictionary with token totals and cache hit ratio
+        """
+        with self._lock:
+            total = self.input_tokens + self.cache_read_tokens + self.cache_creation_tokens
+            return {
+                "activations": self.activations,
+                "uncached_input_tokens": self.input_tokens,
+                "cache_read_input_tokens": self.cache_read_tokens,
+                "cache_creation_input_tokens": self.cache_creation_tokens,
+                "cache_hit_ratio": (self.cache_read_tokens / total) if total else 0.0,
+            }
+
+
+# Singleton instance
+_cache_stats: Optional[PromptCacheStats] = None
+
+
+def get_prompt_cache_stats() -> PromptCacheStats:
+    """Get the shared PromptCacheStats instance.
+
+    Returns:
+        The singleton PromptCacheStats
+    """
+    global _cache_stats
+    if _cache_stats is None:
+        _cache_stats = PromptCacheStats()
+    return _cache_stats
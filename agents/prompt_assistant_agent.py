@@ -4,13 +4,38 @@ Expands and refines user prompts with better context and structure.
 """
 
 from agents.base_agent import BaseAgent, AgentMetadata
-from typing import Optional
+from agents.prompt_templates import PromptTemplate
+from typing import Optional, List, Union
 from pathlib import Path
 
 
 class PromptAssistantAgent(BaseAgent):
     """Agent for assisting with prompt creation and refinement."""
 
+    prompt_template = PromptTemplate(
+        instructions="""You are an expert at crafting clear, well-structured prompts for AI interactions.
+
+Your task is to take the user's input and transform it into a polished, professional prompt that:
+1. Has clear context and background
+2. States requirements precisely
+3. Provides structure and organization
+4. Uses appropriate formatting (markdown, bullet points, etc.)
+5. Includes relevant examples or constraints if helpful
+
+IMPORTANT:
+- Return ONLY the refined prompt, no explanations
+- Make it actionable and specific
+- Use professional language
+- Add relevant technical context when appropriate
+- Format for readability
+
+The user's original input will be provided - transform it into an excellent prompt.""",
+        context_header="\n\nADDITIONAL CONTEXT:\n",
+        folder_lines=("The user is working in a project located at: {context_folder}\n",),
+        focus_lines=("There is a focus file at: {focus_file}\n",),
+        context_footer="Consider this project context when refining the prompt."
+    )
+
     @property
     def metadata(self) -> AgentMetadata:
         """Return agent metadata."""
@@ -32,36 +57,9 @@ class PromptAssistantAgent(BaseAgent):
         Returns:
             System prompt
         """
-        base_prompt = """You are an expert at crafting clear, well-structured prompts for AI interactions.
-
-Your task is to take the user's input and transform it into a polished, professional prompt that:
-1. Has clear context and background
-2. States requirements precisely
-3. Provides structure and organization
-4. Uses appropriate formatting (markdown, bullet points, etc.)
-5. Includes relevant examples or constraints if helpful
-
-IMPORTANT:
-- Return ONLY the refined prompt, no explanations
-- Make it actionable and specific
-- Use professional language
-- Add relevant technical context when appropriate
-- Format for readability
-
-The user's original input will be provided - transform it into an excellent prompt."""
-
-        # Add context-specific instructions
-        if context_folder or focus_file:
-            base_prompt += "\n\nADDITIONAL CONTEXT:\n"
-            if context_folder:
-                base_prompt += f"The user is working in a project located at: {context_folder}\n"
-            if focus_file:
-                base_prompt += f"There is a focus file at: {focus_file}\n"
-            base_prompt += "Consider this project context when refining the prompt."
-
-        return base_prompt
+        return self.render_system_prompt()
 
-    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[str] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None) -> str:
+    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None) -> str:
         """Process text with prompt assistant.
 
         Args:
@@ -72,10 +70,11 @@ The user's original input will be provided - transform it into an excellent prom
             image_path: Optional image path for visual analysis
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
 
         Returns:
             Refined, expanded prompt
         """
         self.logger.info("Prompt Assistant: Refining prompt")
-        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback)
+        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback, stream_callback)
         return result
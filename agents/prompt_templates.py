@@ -0,0 +1,171 @@
+"""Prompt templates and cached rendering for AgentClick agents.
+
+System prompts are mostly static text plus a small project-context section
+that depends only on (context_folder, focus_file). Templates are compiled
+once per agent class and rendered prompts are memoized, so an activation
+costs a dictionary lookup instead of rebuilding kilobytes of text. Agents
+render only the static instructions as their system prompt and put the
+project-context section in the user prompt, keeping the prompt prefix
+byte-identical across activations and projects for upstream prompt caching.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('PromptTemplates')
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """System prompt template.
+
+    Attributes:
+        instructions: Static agent instructions (always rendered first)
+        context_header: Text opening the project-context section
+        folder_lines: Lines rendered when a context folder is set ({context_folder})
+        focus_lines: Lines rendered when a focus file is set ({focus_file})
+        context_footer: Text closing the project-context section
+    """
+    instructions: str
+    context_header: str = "\n\n## PROJECT CONTEXT\n"
+    folder_lines: Tuple[str, ...] = ()
+    focus_lines: Tuple[str, ...] = ()
+    context_footer: str = ""
+    _folder_block: str = field(init=False, repr=False, compare=False)
+    _focus_block: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Compile line tuples into single format strings."""
+        object.__setattr__(self, '_folder_block', "".join(self.folder_lines))
+        object.__setattr__(self, '_focus_block', "".join(self.focus_lines))
+
+    def render_context(self, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Render only the project-context section.
+
+        Args:
+            context_folder: Optional context folder
+            focus_file: Optional focus file
+
+        Returns:
+            Context section or empty string if neither is set
+        """
+        if not (context_folder or focus_file):
+            return ""
+
+        parts = [self.context_header]
+        if context_folder:
+            parts.append(self._folder_block.format(context_folder=context_folder))
+        if focus_file:
+            parts.append(self._focus_block.format(focus_file=focus_file))
+        parts.append(self.context_footer)
+        return "".join(parts)
+
+    def render(self, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Render the full system prompt.
+
+        Args:
+            context_folder: Optional context folder
+            focus_file: Optional focus file
+
+        Returns:
+            Instructions followed by the project-context section
+        """
+        return self.instructions + self.render_context(context_folder, focus_file)
+
+
+class PromptRenderer:
+    """Memoizing renderer for agent prompt templates.
+
+    Rendered prompts are cached per (agent class, context_folder, focus_file)
+    in a bounded LRU. Entries for a module are dropped when the agent
+    registry reloads it.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize prompt renderer.
+
+        Args:
+            max_entries: Maximum number of rendered prompts kept
+        """
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, Tuple[PromptTemplate, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, agent_class: type, template: PromptTemplate,
+               context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Render a template, reusing a cached result when possible.
+
+        Args:
+            agent_class: Agent class owning the template (part of the cache key)
+            template: Template to render
+            context_folder: Optional context folder
+            focus_file: Optional focus file
+
+        Returns:
+            Rendered system prompt
+        """
+        key = (agent_class.__module__, agent_class.__qualname__, context_folder, focus_file)
+
+        with self._lock:
+            cached = self._cache.get(key)
+            # Identity check guards against a reloaded class with a new template
+            if cached is not None and cached[0] is template:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        rendered = template.render(context_folder, focus_file)
+
+        with self._lock:
+            self._cache[key] = (template, rendered)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        logger.debug(f"Rendered prompt for {agent_class.__name__} ({len(rendered)} chars)")
+        return rendered
+
+    def invalidate(self, module_name: Optional[str] = None) -> None:
+        """Drop cached prompts.
+
+        Args:
+            module_name: Only drop prompts of agents defined in this module
+                         (None drops everything)
+        """
+        with self._lock:
+            if module_name is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == module_name]:
+                    del self._cache[key]
+        logger.debug(f"Invalidated prompt cache ({module_name or 'all'})")
+
+    def get_stats(self) -> dict:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses and cached entry count
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+
+# Singleton instance
+_renderer: Optional[PromptRenderer] = None
+
+
+def get_prompt_renderer() -> PromptRenderer:
+    """Get the shared PromptRenderer instance.
+
+    Returns:
+        The singleton PromptRenderer
+    """
+    global _renderer
+    if _renderer is None:
+        _renderer = PromptRenderer()
+    return _renderer
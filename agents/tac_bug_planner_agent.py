@@ -4,35 +4,16 @@ Creates detailed bug fix plans with root cause analysis, reproduction steps, and
 """
 
 from agents.base_agent import BaseAgent, AgentMetadata
-from typing import Optional
+from agents.prompt_templates import PromptTemplate
+from typing import Optional, List, Union
 from pathlib import Path
 
 
 class TacBugPlannerAgent(BaseAgent):
     """Agent for planning and documenting bug fixes."""
 
-    @property
-    def metadata(self) -> AgentMetadata:
-        """Return agent metadata."""
-        return AgentMetadata(
-            name="TAC Bug Planner",
-            description="Creates detailed bug fix plans with root cause analysis, reproduction steps, and minimal surgical changes",
-            icon="🐛",
-            color="#e74c3c"
-        )
-
-    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
-        """Get system prompt for TAC bug planner.
-
-        Args:
-            context: Bug description or report
-            context_folder: Optional context folder (used to determine relevant files)
-            focus_file: Optional focus file
-
-        Returns:
-            System prompt
-        """
-        base_prompt = """You are a specialized agent that creates detailed bug fix plans using the TAC (Thoughtful Actionable Bug) methodology.
+    prompt_template = PromptTemplate(
+        instructions="""You are a specialized agent that creates detailed bug fix plans using the TAC (Thoughtful Actionable Bug) methodology.
 
 Your task is to take a bug description and generate a comprehensive, actionable plan following the exact format specified below.
 
@@ -207,20 +188,41 @@ The user will provide:
 - A bug description or report
 - Optionally: a context_folder to help identify relevant files
 
-Your output will be saved directly to specs/*.md, so ensure it's complete and ready to use."""
+Your output will be saved directly to specs/*.md, so ensure it's complete and ready to use.""",
+        context_header="\n\n## PROJECT CONTEXT\n",
+        folder_lines=(
+            "• Context Folder: {context_folder}\n",
+            "  → Use this folder to explore and find the bug\n",
+        ),
+        focus_lines=(
+            "• Focus File: {focus_file}\n",
+            "  → This file is likely related to the bug\n",
+        ),
+        context_footer="\nStart your research by reading the README.md in the context folder, then explore the codebase to locate and understand the bug before planning the fix."
+    )
 
-        # Add context-specific instructions
-        if context_folder or focus_file:
-            base_prompt += "\n\n## PROJECT CONTEXT\n"
-            if context_folder:
-                base_prompt += f"• Context Folder: {context_folder}\n"
-                base_prompt += "  → Use this folder to explore and find the bug\n"
-            if focus_file:
-                base_prompt += f"• Focus File: {focus_file}\n"
-                base_prompt += "  → This file is likely related to the bug\n"
-            base_prompt += "\nStart your research by reading the README.md in the context folder, then explore the codebase to locate and understand the bug before planning the fix."
+    @property
+    def metadata(self) -> AgentMetadata:
+        """Return agent metadata."""
+        return AgentMetadata(
+            name="TAC Bug Planner",
+            description="Creates detailed bug fix plans with root cause analysis, reproduction steps, and minimal surgical changes",
+            icon="🐛",
+            color="#e74c3c"
+        )
+
+    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Get system prompt for TAC bug planner.
+
+        Args:
+            context: Bug description or report
+            context_folder: Optional context folder (used to determine relevant files)
+            focus_file: Optional focus file
 
-        return base_prompt
+        Returns:
+            System prompt
+        """
+        return self.render_system_prompt()
 
     def _generate_filename(self, task: str, context_folder: Optional[str]) -> Optional[str]:
         """Generate suggested filename based on task.
@@ -260,7 +262,7 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
 
         return "specs/bug_fix.md"
 
-    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[str] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None) -> str:
+    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None) -> str:
         """Process bug description and generate fix plan.
 
         Args:
@@ -271,6 +273,7 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
             image_path: Optional image path for visual analysis
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
 
         Returns:
             Detailed bug fix plan
@@ -285,5 +288,5 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
             if not specs_path.exists():
                 self.logger.warning(f"specs/ folder does not exist in {context_folder} - it will be created")
 
-        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback)
+        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback, stream_callback)
         return result
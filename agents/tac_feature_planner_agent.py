@@ -4,35 +4,16 @@ Generates detailed feature implementation plans with user stories, testing strat
 """
 
 from agents.base_agent import BaseAgent, AgentMetadata
-from typing import Optional
+from agents.prompt_templates import PromptTemplate
+from typing import Optional, List, Union
 from pathlib import Path
 
 
 class TacFeaturePlannerAgent(BaseAgent):
     """Agent for planning and documenting feature implementation steps."""
 
-    @property
-    def metadata(self) -> AgentMetadata:
-        """Return agent metadata."""
-        return AgentMetadata(
-            name="TAC Feature Planner",
-            description="Generates detailed feature implementation plans with user stories, testing strategy, and acceptance criteria",
-            icon="✨",
-            color="#9b59b6"
-        )
-
-    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
-        """Get system prompt for TAC feature planner.
-
-        Args:
-            context: Feature description or task text
-            context_folder: Optional context folder (used to determine relevant files)
-            focus_file: Optional focus file
-
-        Returns:
-            System prompt
-        """
-        base_prompt = """You are a specialized agent that creates detailed implementation plans for new features using the TAC (Thoughtful Actionable Feature) methodology.
+    prompt_template = PromptTemplate(
+        instructions="""You are a specialized agent that creates detailed implementation plans for new features using the TAC (Thoughtful Actionable Feature) methodology.
 
 Your task is to take a feature description and generate a comprehensive, actionable plan following the exact format specified below.
 
@@ -219,21 +200,42 @@ The user will provide:
 - A feature description or idea
 - Optionally: a context_folder to help identify relevant files
 
-Your output will be saved directly to specs/*.md, so ensure it's complete and ready to use."""
+Your output will be saved directly to specs/*.md, so ensure it's complete and ready to use.""",
+        context_header="\n\n## PROJECT CONTEXT\n",
+        folder_lines=(
+            "• Context Folder: {context_folder}\n",
+            "  → Use this folder to explore and find relevant files\n",
+            "  → Look for existing patterns to follow\n",
+        ),
+        focus_lines=(
+            "• Focus File: {focus_file}\n",
+            "  → This file should be considered as part of the relevant files\n",
+        ),
+        context_footer="\nStart your research by reading the README.md in the context folder, then explore the codebase to understand existing patterns before planning the feature."
+    )
 
-        # Add context-specific instructions
-        if context_folder or focus_file:
-            base_prompt += "\n\n## PROJECT CONTEXT\n"
-            if context_folder:
-                base_prompt += f"• Context Folder: {context_folder}\n"
-                base_prompt += "  → Use this folder to explore and find relevant files\n"
-                base_prompt += "  → Look for existing patterns to follow\n"
-            if focus_file:
-                base_prompt += f"• Focus File: {focus_file}\n"
-                base_prompt += "  → This file should be considered as part of the relevant files\n"
-            base_prompt += "\nStart your research by reading the README.md in the context folder, then explore the codebase to understand existing patterns before planning the feature."
+    @property
+    def metadata(self) -> AgentMetadata:
+        """Return agent metadata."""
+        return AgentMetadata(
+            name="TAC Feature Planner",
+            description="Generates detailed feature implementation plans with user stories, testing strategy, and acceptance criteria",
+            icon="✨",
+            color="#9b59b6"
+        )
+
+    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Get system prompt for TAC feature planner.
+
+        Args:
+            context: Feature description or task text
+            context_folder: Optional context folder (used to determine relevant files)
+            focus_file: Optional focus file
 
-        return base_prompt
+        Returns:
+            System prompt
+        """
+        return self.render_system_prompt()
 
     def _generate_filename(self, task: str, context_folder: Optional[str]) -> Optional[str]:
         """Generate suggested filename based on task.
@@ -273,7 +275,7 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
 
         return "specs/feature_plan.md"
 
-    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[str] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None) -> str:
+    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None) -> str:
         """Process feature description and generate implementation plan.
 
         Args:
@@ -284,6 +286,7 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
             image_path: Optional image path for visual analysis
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
 
         Returns:
             Detailed feature implementation plan
@@ -298,5 +301,5 @@ Your output will be saved directly to specs/*.md, so ensure it's complete and re
             if not specs_path.exists():
                 self.logger.warning(f"specs/ folder does not exist in {context_folder} - it will be created")
 
-        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback)
+        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback, stream_callback)
         return result
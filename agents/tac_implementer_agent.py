@@ -4,35 +4,16 @@ Reads and implements TAC plans from specs/*.md files with step-by-step execution
 """
 
 from agents.base_agent import BaseAgent, AgentMetadata
-from typing import Optional
+from agents.prompt_templates import PromptTemplate
+from typing import Optional, List, Union
 from pathlib import Path
 
 
 class TacImplementerAgent(BaseAgent):
     """Agent for implementing TAC plans from specs/*.md files."""
 
-    @property
-    def metadata(self) -> AgentMetadata:
-        """Return agent metadata."""
-        return AgentMetadata(
-            name="TAC Implementer",
-            description="Reads and implements TAC plans from specs/*.md files with step-by-step execution and completion reports",
-            icon="🚀",
-            color="#3498db"
-        )
-
-    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
-        """Get system prompt for TAC implementer.
-
-        Args:
-            context: Plan content (specs/*.md file content)
-            context_folder: Optional context folder (where the codebase is)
-            focus_file: Optional focus file
-
-        Returns:
-            System prompt
-        """
-        base_prompt = """You are a specialized agent that implements TAC plans by reading plan files and executing them step by step.
+    prompt_template = PromptTemplate(
+        instructions="""You are a specialized agent that implements TAC plans by reading plan files and executing them step by step.
 
 Your task is to:
 1. Read and understand the provided plan (from specs/*.md)
@@ -141,21 +122,42 @@ The user will provide:
 - The full content of a specs/*.md plan file
 - Optionally: a context_folder where the codebase is located
 
-Your job is to implement that plan and report the completed work."""
+Your job is to implement that plan and report the completed work.""",
+        context_header="\n\n## PROJECT CONTEXT\n",
+        folder_lines=(
+            "• Context Folder (Codebase): {context_folder}\n",
+            "  → All file paths are relative to this folder\n",
+            "  → Use this folder to locate and modify files\n",
+        ),
+        focus_lines=(
+            "• Focus File: {focus_file}\n",
+            "  → This file may be relevant to the implementation\n",
+        ),
+        context_footer="\nRead the plan carefully, then implement all steps in order."
+    )
 
-        # Add context-specific instructions
-        if context_folder or focus_file:
-            base_prompt += "\n\n## PROJECT CONTEXT\n"
-            if context_folder:
-                base_prompt += f"• Context Folder (Codebase): {context_folder}\n"
-                base_prompt += "  → All file paths are relative to this folder\n"
-                base_prompt += "  → Use this folder to locate and modify files\n"
-            if focus_file:
-                base_prompt += f"• Focus File: {focus_file}\n"
-                base_prompt += "  → This file may be relevant to the implementation\n"
-            base_prompt += "\nRead the plan carefully, then implement all steps in order."
+    @property
+    def metadata(self) -> AgentMetadata:
+        """Return agent metadata."""
+        return AgentMetadata(
+            name="TAC Implementer",
+            description="Reads and implements TAC plans from specs/*.md files with step-by-step execution and completion reports",
+            icon="🚀",
+            color="#3498db"
+        )
+
+    def get_system_prompt(self, context: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None) -> str:
+        """Get system prompt for TAC implementer.
+
+        Args:
+            context: Plan content (specs/*.md file content)
+            context_folder: Optional context folder (where the codebase is)
+            focus_file: Optional focus file
 
-        return base_prompt
+        Returns:
+            System prompt
+        """
+        return self.render_system_prompt()
 
     def _generate_filename(self, task: str, context_folder: Optional[str]) -> Optional[str]:
         """Generate suggested filename based on task.
@@ -171,7 +173,7 @@ Your job is to implement that plan and report the completed work."""
         # But if needed, generate implementation report filename
         return "implementation_report.md"
 
-    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[str] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None) -> str:
+    def process(self, text: str, context_folder: Optional[str] = None, focus_file: Optional[str] = None, output_mode: str = "AUTO", image_path: Optional[Union[str, List[str]]] = None, verbose_logging: bool = False, log_callback: Optional[callable] = None, stream_callback: Optional[callable] = None) -> str:
         """Process plan file and implement it.
 
         Args:
@@ -182,6 +184,7 @@ Your job is to implement that plan and report the completed work."""
             image_path: Optional image path for visual analysis
             verbose_logging: Whether to enable verbose SDK logging
             log_callback: Optional callback function for verbose log messages
+            stream_callback: Optional callback receiving response text as it streams
 
         Returns:
             Implementation completion report
@@ -203,5 +206,5 @@ Your job is to implement that plan and report the completed work."""
         else:
             self.logger.warning("Input doesn't appear to be a TAC plan file")
 
-        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback)
+        result = super().process(text, context_folder, focus_file, output_mode, image_path, verbose_logging, log_callback, stream_callback)
         return result
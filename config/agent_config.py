@@ -32,12 +32,18 @@ class AgentSettings:
     output_mode: str = "AUTO"
     allowed_inputs: list[str] = None  # NOVO: List of allowed input types
     verbose_logging: bool = True  # NOVO: Enable verbose SDK logging (always enabled by default)
+    screenshot_mode: str = "FULL_SCREEN"  # Part of the screen captured by Ctrl+Shift+Pause
+    composite_inputs: list[str] = None  # Sources captured together when allowed_inputs is ["composite"]
+    log_file: Optional[str] = None  # Log file read by the log_tail input
+    reuse_image_results: bool = True  # Reuse the clipboard result of an identical image
 
     def __post_init__(self):
         """Initialize allowed_inputs with defaults if not provided."""
         if self.allowed_inputs is None:
             # Default: all input types allowed
             self.allowed_inputs = ["text_selection", "selected_text", "vscode_active_file", "file_upload", "clipboard_image", "screenshot"]
+        if self.composite_inputs is None:
+            self.composite_inputs = ["selected_text", "screenshot", "vscode_active_file"]
 
     def to_dict(self) -> dict:
         """Convert to dictionary."""
@@ -51,7 +57,11 @@ class AgentSettings:
             focus_file=data.get('focus_file'),
             output_mode=data.get('output_mode', 'AUTO'),
             allowed_inputs=data.get('allowed_inputs', ["text_selection", "selected_text", "vscode_active_file", "file_upload", "clipboard_image", "screenshot"]),
-            verbose_logging=data.get('verbose_logging', True)
+            verbose_logging=data.get('verbose_logging', True),
+            screenshot_mode=data.get('screenshot_mode', 'FULL_SCREEN'),
+            composite_inputs=data.get('composite_inputs'),
+            log_file=data.get('log_file'),
+            reuse_image_results=data.get('reuse_image_results', True)
         )
 
 
@@ -84,7 +94,9 @@ class AgentConfigManager:
 
         self.config_file = config_file
         self.configs: dict[str, AgentSettings] = {}
+        self._saved_mtime: Optional[int] = None
         self._load()
+        self._watch_config_file()
         logger.info(f"Config manager initialized: {self.config_file}")
         AgentConfigManager._initialized = True
 
@@ -98,14 +110,42 @@ class AgentConfigManager:
             with open(self.config_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
 
+            configs = {}
             for agent_name, settings_data in data.items():
-                self.configs[agent_name] = AgentSettings.from_dict(settings_data)
+                configs[agent_name] = AgentSettings.from_dict(settings_data)
+            self.configs = configs
 
             logger.info(f"Loaded configs for {len(self.configs)} agents")
 
         except Exception as e:
             logger.error(f"Error loading config: {e}")
 
+    def _watch_config_file(self) -> None:
+        """Reload configuration when the file is edited outside the app."""
+        try:
+            from core.file_watcher import get_file_watcher
+            get_file_watcher().subscribe(str(self.config_file), self._on_config_file_changed)
+        except Exception as e:
+            logger.warning(f"Config file watching disabled: {e}")
+
+    def _on_config_file_changed(self, events) -> None:
+        """Handle watcher events for the config file.
+
+        Args:
+            events: FileEvent batch for the config file
+        """
+        try:
+            mtime = self.config_file.stat().st_mtime_ns
+        except OSError:
+            return
+
+        # Ignore the event caused by our own _save()
+        if mtime == self._saved_mtime:
+            return
+
+        logger.info("Config file changed on disk - reloading")
+        self._load()
+
     def _save(self) -> None:
         """Save configurations to file."""
         try:
@@ -121,6 +161,7 @@ class AgentConfigManager:
             # Save
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
+            self._saved_mtime = self.config_file.stat().st_mtime_ns
 
             logger.info(f"Saved configs for {len(self.configs)} agents")
 
@@ -200,6 +241,30 @@ class AgentConfigManager:
         settings = self.get_settings(agent_name)
         return settings.focus_file
 
+    def get_log_file(self, agent_name: str) -> Optional[str]:
+        """Get log file for an agent.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            Path to log file or None
+        """
+        settings = self.get_settings(agent_name)
+        return settings.log_file
+
+    def set_log_file(self, agent_name: str, file: Optional[str]) -> None:
+        """Set log file for an agent.
+
+        Args:
+            agent_name: Name of the agent
+            file: Path to log file (None to clear)
+        """
+        settings = self.get_settings(agent_name)
+        settings.log_file = file
+        self._save()
+        logger.info(f"Set log file for {agent_name}: {file}")
+
     def set_output_mode(self, agent_name: str, mode: str) -> None:
         """Set output mode for an agent.
 
@@ -301,6 +366,104 @@ class AgentConfigManager:
 
         self._save()
 
+    def is_composite(self, agent_name: str) -> bool:
+        """Check if an agent captures several sources per activation.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            True if the composite input is selected
+        """
+        return "composite" in self.get_allowed_inputs(agent_name)
+
+    def get_composite_inputs(self, agent_name: str) -> list[str]:
+        """Get the sources captured together by a composite agent.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            List of input types (e.g., ["selected_text", "screenshot"])
+        """
+        settings = self.get_settings(agent_name)
+        return settings.composite_inputs
+
+    def set_composite_inputs(self, agent_name: str, sources: list[str]) -> None:
+        """Set the sources captured together by a composite agent.
+
+        Args:
+            agent_name: Name of the agent
+            sources: List of input types (any input type except "composite")
+        """
+        from core.input_strategy import InputType
+
+        # Validate input types
+        valid_types = [t.value for t in InputType if t != InputType.COMPOSITE]
+        for source in sources:
+            if source not in valid_types:
+                raise ValueError(f"Invalid composite source: {source}. Must be one of: {valid_types}")
+
+        settings = self.get_settings(agent_name)
+        settings.composite_inputs = sources
+        self._save()
+        logger.info(f"Set composite inputs for {agent_name}: {sources}")
+
+    def get_screenshot_mode(self, agent_name: str) -> str:
+        """Get screenshot capture mode for an agent.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            Capture mode string (FULL_SCREEN, ACTIVE_WINDOW, MONITOR, REGION)
+        """
+        settings = self.get_settings(agent_name)
+        return settings.screenshot_mode
+
+    def set_screenshot_mode(self, agent_name: str, mode: str) -> None:
+        """Set screenshot capture mode for an agent.
+
+        Args:
+            agent_name: Name of the agent
+            mode: Capture mode string (FULL_SCREEN, ACTIVE_WINDOW, MONITOR, REGION)
+        """
+        from core.capture_region import CaptureMode
+
+        # Validate mode
+        valid_modes = [m.value for m in CaptureMode]
+        if mode not in valid_modes:
+            raise ValueError(f"Invalid screenshot mode: {mode}. Must be one of: {valid_modes}")
+
+        settings = self.get_settings(agent_name)
+        settings.screenshot_mode = mode
+        self._save()
+        logger.info(f"Set screenshot mode for {agent_name}: {mode}")
+
+    def get_reuse_image_results(self, agent_name: str) -> bool:
+        """Get whether results are reused for identical images.
+
+        Args:
+            agent_name: Name of the agent
+
+        Returns:
+            True if a result may be reused for an identical image
+        """
+        settings = self.get_settings(agent_name)
+        return settings.reuse_image_results
+
+    def set_reuse_image_results(self, agent_name: str, enabled: bool) -> None:
+        """Set whether results are reused for identical images.
+
+        Args:
+            agent_name: Name of the agent
+            enabled: Reuse results of identical images
+        """
+        settings = self.get_settings(agent_name)
+        settings.reuse_image_results = enabled
+        self._save()
+        logger.info(f"Set image result reuse for {agent_name}: {enabled}")
+
     def get_verbose_logging(self, agent_name: str) -> bool:
         """Get verbose logging setting for an agent.
 
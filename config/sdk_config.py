@@ -6,6 +6,11 @@ from utils.logger import setup_logger
 
 logger = setup_logger('SDKConfig')
 
+# Send prompts as content blocks with cache_control markers at the end of the
+# stable segments. Off by default: the CLI already caches the system prompt and
+# places its own breakpoints, and the API rejects requests with more than four.
+PROMPT_CACHE_BREAKPOINTS = False
+
 
 def create_sdk_options(
     system_prompt: str,
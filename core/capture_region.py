@@ -0,0 +1,177 @@
+"""Screenshot capture modes for AgentClick system.
+
+Instead of grabbing every monitor, an agent can capture only the active
+window, the monitor under the mouse cursor, or a region the user drags out
+on screen (see ui.region_selector). Regions are (left, top, width, height)
+in physical screen pixels, the coordinates ImageGrab uses.
+"""
+
+import sys
+from enum import Enum
+from typing import Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('CaptureRegion')
+
+Region = Tuple[int, int, int, int]
+
+
+class CaptureMode(Enum):
+    """Which part of the screen a screenshot covers."""
+
+    FULL_SCREEN = "FULL_SCREEN"
+    """Entire (primary) screen."""
+
+    ACTIVE_WINDOW = "ACTIVE_WINDOW"
+    """Foreground window."""
+
+    MONITOR = "MONITOR"
+    """Monitor under the mouse cursor."""
+
+    REGION = "REGION"
+    """Rectangle selected with the mouse."""
+
+    @property
+    def display_name(self) -> str:
+        """Human-readable name for UI display."""
+        display_map = {
+            CaptureMode.FULL_SCREEN: "🖥️ Full Screen",
+            CaptureMode.ACTIVE_WINDOW: "🪟 Active Window",
+            CaptureMode.MONITOR: "🖥️ Monitor Under Cursor",
+            CaptureMode.REGION: "✂️ Select Region"
+        }
+        return display_map.get(self, self.value)
+
+    @property
+    def description(self) -> str:
+        """Text describing the captured area to the agent."""
+        desc_map = {
+            CaptureMode.FULL_SCREEN: "entire screen",
+            CaptureMode.ACTIVE_WINDOW: "active window",
+            CaptureMode.MONITOR: "monitor under the cursor",
+            CaptureMode.REGION: "selected region"
+        }
+        return desc_map.get(self, "screen")
+
+    @classmethod
+    def from_string(cls, value: Optional[str]) -> 'CaptureMode':
+        """Convert string to CaptureMode.
+
+        Args:
+            value: String value to convert
+
+        Returns:
+            CaptureMode (FULL_SCREEN for unknown values)
+        """
+        try:
+            return cls((value or "").upper())
+        except ValueError:
+            logger.warning(f"Invalid capture mode: {value}, defaulting to FULL_SCREEN")
+            return cls.FULL_SCREEN
+
+
+def _rect_to_region(left: int, top: int, right: int, bottom: int) -> Optional[Region]:
+    """Convert a (left, top, right, bottom) rectangle to a region."""
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
+
+
+def active_window_region() -> Optional[Region]:
+    """Get the bounds of the foreground window.
+
+    Uses the DWM frame bounds where available, which exclude the invisible
+    resize borders that GetWindowRect includes.
+
+    Returns:
+        Region, or None if unavailable (non-Windows, minimized window...)
+    """
+    if sys.platform != "win32":
+        return None
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        hwnd = user32.GetForegroundWindow()
+        if not hwnd or user32.IsIconic(hwnd):
+            return None
+
+        rect = wintypes.RECT()
+        DWMWA_EXTENDED_FRAME_BOUNDS = 9
+        result = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+            wintypes.HWND(hwnd), DWMWA_EXTENDED_FRAME_BOUNDS, ctypes.byref(rect), ctypes.sizeof(rect)
+        )
+        if result != 0 and not user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+            return None
+
+        return _rect_to_region(rect.left, rect.top, rect.right, rect.bottom)
+
+    except Exception as e:
+        logger.debug(f"Could not get active window bounds: {e}")
+        return None
+
+
+def monitor_region_under_cursor() -> Optional[Region]:
+    """Get the bounds of the monitor under the mouse cursor.
+
+    Returns:
+        Region, or None if unavailable
+    """
+    if sys.platform != "win32":
+        return None
+
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class MONITORINFO(ctypes.Structure):
+            _fields_ = [
+                ("cbSize", wintypes.DWORD),
+                ("rcMonitor", wintypes.RECT),
+                ("rcWork", wintypes.RECT),
+                ("dwFlags", wintypes.DWORD),
+            ]
+
+        user32 = ctypes.windll.user32
+        point = wintypes.POINT()
+        if not user32.GetCursorPos(ctypes.byref(point)):
+            return None
+
+        MONITOR_DEFAULTTONEAREST = 2
+        monitor = user32.MonitorFromPoint(point, MONITOR_DEFAULTTONEAREST)
+        info = MONITORINFO()
+        info.cbSize = ctypes.sizeof(MONITORINFO)
+        if not monitor or not user32.GetMonitorInfoW(monitor, ctypes.byref(info)):
+            return None
+
+        rect = info.rcMonitor
+        return _rect_to_region(rect.left, rect.top, rect.right, rect.bottom)
+
+    except Exception as e:
+        logger.debug(f"Could not get monitor bounds: {e}")
+        return None
+
+
+def resolve_capture_region(mode: CaptureMode) -> Optional[Region]:
+    """Get the region of a non-interactive capture mode.
+
+    REGION needs user interaction (ui.region_selector) and is not handled here.
+
+    Args:
+        mode: Capture mode
+
+    Returns:
+        Region, or None to capture the full screen
+    """
+    if mode == CaptureMode.ACTIVE_WINDOW:
+        region = active_window_region()
+    elif mode == CaptureMode.MONITOR:
+        region = monitor_region_under_cursor()
+    else:
+        return None
+
+    if region is None:
+        logger.warning(f"Could not resolve {mode.description} - capturing full screen")
+    return region
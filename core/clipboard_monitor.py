@@ -0,0 +1,147 @@
+"""Clipboard change tracking for AgentClick system.
+
+Wraps a clipboard backend and caches the last decoded text and image,
+keyed by the clipboard change counter. When the clipboard has not changed
+since the previous activation, reads return the cached value instead of
+pasting/decoding again.
+
+Backends without a change counter are read every time, but a value with
+the same content hash as the cached one returns the cached object, so work
+keyed on it downstream (e.g. the saved clipboard image) is reused.
+"""
+
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+from core.clipboard_snapshot import ClipboardBackend
+from utils.logger import setup_logger
+
+logger = setup_logger('ClipboardMonitor')
+
+_UNSET = object()
+
+
+class ClipboardMonitor(ClipboardBackend):
+    """Caching clipboard backend.
+
+    Values are reused while backend.change_count() returns the same
+    number; backends without a change counter (None) are always read and
+    the cached value is kept while the content hash matches.
+    """
+
+    def __init__(self, backend: Optional[ClipboardBackend] = None):
+        """Initialize monitor.
+
+        Args:
+            backend: Backend to read from (system clipboard by default)
+        """
+        self.backend = backend or ClipboardBackend()
+        self._cache: Dict[str, tuple] = {}  # format -> (("count"|"content", key), value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def change_count(self) -> Optional[int]:
+        """Get the change counter of the wrapped backend."""
+        return self.backend.change_count()
+
+    def save_formats(self) -> Optional[Dict[int, Any]]:
+        """Save all clipboard formats (not cached)."""
+        return self.backend.save_formats()
+
+    def restore_formats(self, saved: Dict[int, Any]) -> bool:
+        """Restore clipboard formats (not cached)."""
+        return self.backend.restore_formats(saved)
+
+    def read_text(self) -> Optional[str]:
+        """Read clipboard text, cached while the clipboard is unchanged."""
+        return self._read("text", self.backend.read_text)
+
+    def read_image(self) -> Any:
+        """Read clipboard image, cached while the clipboard is unchanged."""
+        return self._read("image", self.backend.read_image)
+
+    def _read(self, fmt: str, reader) -> Any:
+        """Return the cached value for a format or read it.
+
+        Args:
+            fmt: Format name
+            reader: Backend read function
+
+        Returns:
+            Clipboard value
+        """
+        count = self.backend.change_count()
+
+        if count is None:
+            return self._read_by_content(fmt, reader)
+
+        with self._lock:
+            cached_key, value = self._cache.get(fmt, (None, _UNSET))
+            if cached_key == ("count", count) and value is not _UNSET:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = reader()
+
+        # Re-check: the clipboard may have changed while it was read
+        if self.backend.change_count() == count:
+            with self._lock:
+                self._cache[fmt] = (("count", count), value)
+        return value
+
+    def _read_by_content(self, fmt: str, reader) -> Any:
+        """Read a format and reuse the cached value if the content is the same.
+
+        Args:
+            fmt: Format name
+            reader: Backend read function
+
+        Returns:
+            Clipboard value (the cached object if its content hash matches)
+        """
+        value = reader()
+        digest = self._content_hash(value)
+        if digest is None:
+            with self._lock:
+                self.misses += 1
+            return value
+
+        with self._lock:
+            cached_key, cached = self._cache.get(fmt, (None, _UNSET))
+            if cached_key == ("content", digest) and cached is not _UNSET:
+                self.hits += 1
+                return cached
+            self.misses += 1
+            self._cache[fmt] = (("content", digest), value)
+        return value
+
+    @staticmethod
+    def _content_hash(value: Any) -> Optional[bytes]:
+        """Hash clipboard text or image content (None if it cannot be hashed)."""
+        if value is None:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(value, str):
+            digest.update(value.encode("utf-8", "surrogatepass"))
+        elif hasattr(value, "tobytes") and hasattr(value, "size"):
+            digest.update(f"{getattr(value, 'mode', '')}:{value.size}".encode())
+            digest.update(value.tobytes())
+        else:
+            return None
+        return digest.digest()
+
+    def clear(self) -> None:
+        """Drop cached values."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with hits and misses
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,342 @@
+"""Clipboard snapshot for AgentClick system.
+
+An activation reads the clipboard through a single ClipboardSnapshot that is
+shared by every input strategy. Each clipboard format (text, image) is read
+from the backend at most once and only when a strategy asks for it; the
+snapshot is discarded once the input has been captured.
+
+Run this module to benchmark backend calls per activation with a fake
+clipboard backend:
+
+    python -m core.clipboard_snapshot
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('ClipboardSnapshot')
+
+_UNSET = object()
+
+
+class ClipboardBackend:
+    """Reads the system clipboard (pyperclip for text, Pillow for images)."""
+
+    def change_count(self) -> Optional[int]:
+        """Get a counter that changes whenever the clipboard content changes.
+
+        Returns:
+            Clipboard sequence number, or None if the platform has none
+        """
+        if sys.platform == "win32":
+            try:
+                import ctypes
+                # 0 means no clipboard access - treat as unknown
+                return ctypes.windll.user32.GetClipboardSequenceNumber() or None
+            except Exception:
+                return None
+        return None
+
+    def read_text(self) -> Optional[str]:
+        """Read clipboard text.
+
+        Returns:
+            Clipboard text or None
+        """
+        from core.selection_manager import SelectionManager
+        return SelectionManager.get_selected_text()
+
+    def read_image(self) -> Any:
+        """Read clipboard image.
+
+        Returns:
+            PIL image, list of file names, or None
+        """
+        try:
+            from PIL import ImageGrab
+            return ImageGrab.grabclipboard()
+        except ImportError:
+            logger.error("PIL not installed - install with: pip install Pillow")
+            return None
+        except Exception as e:
+            logger.debug(f"Error reading clipboard image: {e}")
+            return None
+
+    def save_formats(self) -> Optional[Dict[int, Any]]:
+        """Save the clipboard content in every format that can be copied.
+
+        Returns:
+            Format -> data mapping, or None if the platform is not supported
+        """
+        if sys.platform != "win32":
+            return None
+        try:
+            import win32clipboard
+        except ImportError:
+            return None
+
+        saved: Dict[int, Any] = {}
+        if not _open_clipboard(win32clipboard):
+            return None
+        try:
+            fmt = win32clipboard.EnumClipboardFormats(0)
+            while fmt:
+                try:
+                    saved[fmt] = win32clipboard.GetClipboardData(fmt)
+                except Exception:
+                    # GDI handles and delayed-render formats cannot be copied
+                    pass
+                fmt = win32clipboard.EnumClipboardFormats(fmt)
+        finally:
+            win32clipboard.CloseClipboard()
+        return saved
+
+    def restore_formats(self, saved: Dict[int, Any]) -> bool:
+        """Restore clipboard content saved with save_formats().
+
+        Args:
+            saved: Format -> data mapping
+
+        Returns:
+            True if the clipboard was restored
+        """
+        try:
+            import win32clipboard
+        except ImportError:
+            return False
+
+        if not _open_clipboard(win32clipboard):
+            return False
+        try:
+            win32clipboard.EmptyClipboard()
+            for fmt, data in saved.items():
+                try:
+                    win32clipboard.SetClipboardData(fmt, data)
+                except Exception as e:
+                    logger.debug(f"Could not restore clipboard format {fmt}: {e}")
+            return True
+        finally:
+            win32clipboard.CloseClipboard()
+
+
+def _open_clipboard(win32clipboard, attempts: int = 5) -> bool:
+    """Open the Windows clipboard, retrying while another app holds it."""
+    for attempt in range(attempts):
+        try:
+            win32clipboard.OpenClipboard()
+            return True
+        except Exception:
+            time.sleep(0.01 * (attempt + 1))
+    logger.warning("Clipboard is locked by another application")
+    return False
+
+
+def wait_for_clipboard_change(
+    backend: ClipboardBackend,
+    since: Optional[int],
+    previous_text: Optional[str] = None,
+    timeout: float = 0.5,
+    initial_interval: float = 0.002,
+    max_interval: float = 0.05
+) -> bool:
+    """Wait until the clipboard changes, polling with exponential backoff.
+
+    Uses the backend change counter; without one, waits for the clipboard
+    text to differ from previous_text.
+
+    Args:
+        backend: Clipboard backend
+        since: Change counter read before the clipboard was modified
+        previous_text: Clipboard text before (used without a change counter)
+        timeout: Maximum seconds to wait
+        initial_interval: First polling interval
+        max_interval: Longest polling interval
+
+    Returns:
+        True if the clipboard changed before the deadline
+    """
+    deadline = time.perf_counter() + timeout
+    interval = initial_interval
+
+    while True:
+        if since is not None:
+            current = backend.change_count()
+            if current is not None and current != since:
+                return True
+        elif backend.read_text() != previous_text:
+            return True
+
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            return False
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 2, max_interval)
+
+
+class ClipboardSnapshot:
+    """Lazily-read, activation-scoped view of the clipboard.
+
+    Safe to share between probe threads: each format is read under a lock.
+    """
+
+    def __init__(self, backend: Optional[ClipboardBackend] = None):
+        """Initialize snapshot.
+
+        Args:
+            backend: Clipboard backend (system clipboard by default)
+        """
+        self.backend = backend or ClipboardBackend()
+        self._text: Any = _UNSET
+        self._image: Any = _UNSET
+        self._lock = threading.Lock()
+
+    @property
+    def text(self) -> Optional[str]:
+        """Clipboard text (read on first access)."""
+        with self._lock:
+            if self._text is _UNSET:
+                self._text = self.backend.read_text()
+            return self._text
+
+    @property
+    def image(self) -> Any:
+        """Clipboard image content (read on first access)."""
+        with self._lock:
+            if self._image is _UNSET:
+                self._image = self.backend.read_image()
+            return self._image
+
+    def prefetch(self, text: bool = True, image: bool = False) -> None:
+        """Read formats now (e.g. before a Ctrl+C can change the clipboard).
+
+        Args:
+            text: Read the text format
+            image: Read the image format
+        """
+        if text:
+            _ = self.text
+        if image:
+            _ = self.image
+
+    def has_text(self) -> bool:
+        """Check if the clipboard holds non-blank text."""
+        return bool(self.text and self.text.strip())
+
+    def has_image(self) -> bool:
+        """Check if the clipboard holds an image."""
+        image = self.image
+        return image is not None and hasattr(image, 'save')
+
+    def invalidate(self) -> None:
+        """Forget cached formats (after the clipboard was changed on purpose)."""
+        with self._lock:
+            self._text = _UNSET
+            self._image = _UNSET
+
+    def close(self) -> None:
+        """Release cached content (images can be large)."""
+        self.invalidate()
+
+
+class _CountingBackend(ClipboardBackend):
+    """Fake clipboard backend counting reads, used by the benchmark."""
+
+    def __init__(self, text: Optional[str] = None, image: Any = None, sequence: Optional[int] = None):
+        self.text = text
+        self.image = image
+        self.sequence = sequence  # None = no change counter
+        self.calls = {"text": 0, "image": 0}
+
+    def change_count(self) -> Optional[int]:
+        return self.sequence
+
+    def read_text(self) -> Optional[str]:
+        self.calls["text"] += 1
+        return self.text
+
+    def read_image(self) -> Any:
+        self.calls["image"] += 1
+        return self.image
+
+
+def benchmark_clipboard_snapshot(activations: int = 100) -> dict:
+    """Count clipboard backend calls per activation.
+
+    Runs text and clipboard-image auto-detection through the real strategies
+    with a fake backend, comparing a shared snapshot against a fresh snapshot
+    per call (the previous behavior), and a ClipboardMonitor over an
+    unchanged clipboard (repeated activations on the same content).
+
+    Args:
+        activations: Number of simulated activations per scenario
+
+    Returns:
+        Dictionary of average backend calls per activation by scenario
+    """
+    import logging
+    import tempfile
+    from pathlib import Path
+    from core.input_strategies import TextSelectionStrategy, ClipboardImageStrategy
+    from core.clipboard_monitor import ClipboardMonitor
+    from core.image_store import ImageStore
+    from PIL import Image
+
+    text_strategy = TextSelectionStrategy()
+    image_strategy = ClipboardImageStrategy(deduplicate=False, store=ImageStore(root=Path(tempfile.mkdtemp())))
+
+    scenarios = {
+        "text": _CountingBackend(text="selected text"),
+        "image": _CountingBackend(image=Image.new("RGB", (64, 64))),
+    }
+    results = {}
+
+    monitored = {
+        "text": ClipboardMonitor(_CountingBackend(text="selected text", sequence=1)),
+        "image": ClipboardMonitor(_CountingBackend(image=Image.new("RGB", (64, 64)), sequence=1)),
+    }
+
+    # Strategies log every capture - keep the benchmark output readable
+    logging.disable(logging.INFO)
+    try:
+        results.update(_run_scenarios(scenarios, (text_strategy, image_strategy), activations))
+        for name, monitor in monitored.items():
+            run = _run_scenarios({name: monitor.backend}, (text_strategy, image_strategy), activations,
+                                 snapshot_backend=monitor, modes=(True,))
+            results[f"{name}/monitored"] = run[f"{name}/shared"]
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return results
+
+
+def _run_scenarios(scenarios: dict, strategies: tuple, activations: int,
+                   snapshot_backend: Optional[ClipboardBackend] = None, modes: tuple = (False, True)) -> dict:
+    """Run benchmark scenarios (see benchmark_clipboard_snapshot)."""
+    results = {}
+
+    for name, backend in scenarios.items():
+        source = snapshot_backend or backend
+        for shared in modes:
+            backend.calls = {"text": 0, "image": 0}
+            for _ in range(activations):
+                shared_snapshot = ClipboardSnapshot(source)
+                for strategy in strategies:
+                    snap = shared_snapshot if shared else ClipboardSnapshot(source)
+                    if strategy.is_available(snapshot=snap):
+                        snap = snap if shared else ClipboardSnapshot(source)
+                        strategy.capture_input(snapshot=snap)
+                        break
+                shared_snapshot.close()
+
+            label = f"{name}/{'shared' if shared else 'unshared'}"
+            results[label] = {k: v / activations for k, v in backend.calls.items()}
+
+    return results
+
+
+if __name__ == "__main__":
+    for scenario, calls in benchmark_clipboard_snapshot().items():
+        print(f"{scenario:<16} text reads: {calls['text']:.1f}  image reads: {calls['image']:.1f}")
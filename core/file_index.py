@@ -0,0 +1,364 @@
+"""File name index for AgentClick system.
+
+Maps bare file names to the absolute paths where they live, so a name taken
+from a window title can be resolved with a dictionary lookup instead of
+walking the project tree on every activation.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set
+from utils.logger import setup_logger
+
+logger = setup_logger('FileIndex')
+
+# Directories that are never indexed (large, generated or VCS internals)
+IGNORED_DIRS = {
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache'
+}
+
+
+class FileNameIndex:
+    """Index of file name -> absolute paths for a set of root folders.
+
+    Roots are scanned on a background thread. Until a root has been scanned
+    the index simply has no entries for it, so callers can fall back to a
+    direct search while the index warms up. With a FileWatcher the index is
+    kept fresh incrementally; without one it is rescanned periodically.
+
+    When several paths share a name, resolution prefers paths inside a folder
+    matching the hint (e.g. the workspace name in the VSCode title), then the
+    most recently resolved path, then the shortest path.
+    """
+
+    def __init__(self, max_depth: int = 8, max_files: int = 200_000,
+                 refresh_interval: float = 300.0, watcher=None):
+        """Initialize file name index.
+
+        Args:
+            max_depth: Maximum directory depth scanned below each root
+            max_files: Maximum number of files indexed per root
+            refresh_interval: Seconds between background rescans of all roots
+                              (0 disables periodic rescans; ignored with a watcher)
+            watcher: Optional FileWatcher used to keep the index fresh
+        """
+        self.max_depth = max_depth
+        self.max_files = max_files
+        self.refresh_interval = 0 if watcher else refresh_interval
+        self.watcher = watcher
+        self.logger = logger
+
+        self._index: Dict[str, Set[str]] = {}
+        self._roots: Set[str] = set()
+        self._scanned_roots: Set[str] = set()
+        self._last_access: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._scan_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._subscriptions: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Roots
+    # ------------------------------------------------------------------
+
+    def set_roots(self, roots: Iterable[Optional[str]]) -> None:
+        """Set the folders covered by the index.
+
+        New roots are scanned in the background; entries for roots that are
+        no longer configured are dropped. Calling this with an unchanged set
+        is cheap, so it can be done on every activation.
+
+        Args:
+            roots: Folder paths (None and missing folders are ignored)
+        """
+        normalized = set()
+        for root in roots:
+            if root and os.path.isdir(root):
+                normalized.add(os.path.normcase(os.path.abspath(root)))
+
+        # Nested roots are already covered by their parent
+        normalized = {
+            root for root in normalized
+            if not any(root.startswith(other + os.sep) for other in normalized)
+        }
+
+        with self._lock:
+            if normalized == self._roots:
+                return
+
+            added = normalized - self._roots
+            removed = self._roots - normalized
+            self._roots = normalized
+
+            for root in removed:
+                self._drop_root(root)
+
+        if self.watcher:
+            for root in removed:
+                self.watcher.unsubscribe(self._subscriptions.pop(root, 0))
+            for root in added:
+                self._subscriptions[root] = self.watcher.subscribe(root, self._on_file_events)
+
+        if added:
+            self.logger.info(f"Indexing {len(added)} new root(s): {sorted(added)}")
+            self._start_scan(sorted(added))
+
+        self._ensure_refresh_thread()
+
+    def get_roots(self) -> List[str]:
+        """Get indexed root folders.
+
+        Returns:
+            Sorted list of root paths
+        """
+        with self._lock:
+            return sorted(self._roots)
+
+    def is_ready(self) -> bool:
+        """Check if every configured root has been scanned at least once.
+
+        Returns:
+            True if the index is warm
+        """
+        with self._lock:
+            return bool(self._roots) and self._roots <= self._scanned_roots
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def resolve(self, filename: str, folder_hint: Optional[str] = None) -> Optional[str]:
+        """Resolve a bare file name to an absolute path.
+
+        Args:
+            filename: File name (no directories)
+            folder_hint: Optional folder name expected somewhere in the path
+
+        Returns:
+            Absolute path or None if the name is not indexed
+        """
+        with self._lock:
+            candidates = list(self._index.get(os.path.normcase(filename), ()))
+
+        if not candidates:
+            return None
+
+        hint = os.path.normcase(folder_hint) if folder_hint else None
+
+        def score(path: str):
+            in_hint = bool(hint) and hint in path.split(os.sep)
+            return (in_hint, self._last_access.get(path, 0.0), -len(path))
+
+        for path in sorted(candidates, key=score, reverse=True):
+            if os.path.isfile(path):
+                self.touch(path)
+                return path
+            # Stale entry (file removed since the last scan)
+            self.remove_path(path)
+
+        return None
+
+    def touch(self, path: str) -> None:
+        """Record that a path was just used (for recency ranking).
+
+        Args:
+            path: Absolute file path
+        """
+        with self._lock:
+            self._last_access[os.path.normcase(os.path.abspath(path))] = time.time()
+
+    def __len__(self) -> int:
+        """Number of indexed paths."""
+        with self._lock:
+            return sum(len(paths) for paths in self._index.values())
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def add_path(self, path: str) -> None:
+        """Add a single file to the index.
+
+        Args:
+            path: Absolute file path
+        """
+        path = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            if not self._covers(path):
+                return
+            self._index.setdefault(os.path.basename(path), set()).add(path)
+
+    def remove_path(self, path: str) -> None:
+        """Remove a file (or every file under a folder) from the index.
+
+        Args:
+            path: Absolute file or folder path
+        """
+        path = os.path.normcase(os.path.abspath(path))
+        with self._lock:
+            paths = self._index.get(os.path.basename(path))
+            if paths and path in paths:
+                paths.discard(path)
+                if not paths:
+                    del self._index[os.path.basename(path)]
+                self._last_access.pop(path, None)
+                return
+
+            # Not a known file - treat as a removed folder
+            self._drop_prefix(path + os.sep)
+
+    def _on_file_events(self, events) -> None:
+        """Apply a batch of FileWatcher events to the index."""
+        from core.file_watcher import CREATED, DELETED, RESCAN
+
+        rescan = []
+        for event in events:
+            if event.kind == RESCAN:
+                rescan.append(os.path.normcase(event.path))
+            elif event.kind == DELETED:
+                self.remove_path(event.path)
+            elif event.kind == CREATED and not event.is_dir:
+                if not IGNORED_DIRS.intersection(event.path.split(os.sep)):
+                    self.add_path(event.path)
+
+        if rescan:
+            self._start_scan([root for root in self.get_roots() if any(
+                root == path or root.startswith(path + os.sep) for path in rescan
+            )])
+
+    # ------------------------------------------------------------------
+    # Scanning
+    # ------------------------------------------------------------------
+
+    def _start_scan(self, roots: List[str]) -> None:
+        """Scan roots on a daemon thread."""
+        thread = threading.Thread(
+            target=self._scan_roots,
+            args=(roots,),
+            name="FileIndexScan",
+            daemon=True
+        )
+        thread.start()
+
+    def _scan_roots(self, roots: List[str]) -> None:
+        """Scan roots and merge the results into the index."""
+        with self._scan_lock:
+            for root in roots:
+                with self._lock:
+                    if root not in self._roots:
+                        continue
+
+                start = time.perf_counter()
+                found = self._scan_root(root)
+
+                with self._lock:
+                    if root not in self._roots:
+                        continue
+                    self._drop_root(root)
+                    for name, paths in found.items():
+                        self._index.setdefault(name, set()).update(paths)
+                    self._scanned_roots.add(root)
+
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                file_count = sum(len(p) for p in found.values())
+                self.logger.info(f"Indexed {file_count} files under {root} in {elapsed_ms:.0f}ms")
+
+    def _scan_root(self, root: str) -> Dict[str, Set[str]]:
+        """Walk a root folder (depth limited) collecting file names.
+
+        Args:
+            root: Normalized root folder
+
+        Returns:
+            Mapping of file name to paths under root
+        """
+        found: Dict[str, Set[str]] = {}
+        stack = [(root, 0)]
+        count = 0
+
+        while stack:
+            directory, depth = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if depth < self.max_depth and entry.name not in IGNORED_DIRS:
+                                    stack.append((entry.path, depth + 1))
+                            elif entry.is_file(follow_symlinks=False):
+                                path = os.path.normcase(entry.path)
+                                found.setdefault(os.path.basename(path), set()).add(path)
+                                count += 1
+                                if count >= self.max_files:
+                                    self.logger.warning(f"Index limit reached for {root} ({count} files)")
+                                    return found
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.logger.debug(f"Cannot scan {directory}: {e}")
+
+        return found
+
+    def _ensure_refresh_thread(self) -> None:
+        """Start the periodic rescan thread if enabled and not running."""
+        if self.refresh_interval <= 0:
+            return
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop,
+            name="FileIndexRefresh",
+            daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_loop(self) -> None:
+        """Rescan all roots every refresh_interval seconds."""
+        while not self._stop_event.wait(self.refresh_interval):
+            self._scan_roots(self.get_roots())
+
+    def refresh(self) -> None:
+        """Rescan all roots in the background (e.g. after a lookup missed a file).
+
+        Does nothing while a scan is already running.
+        """
+        if self._scan_lock.locked():
+            return
+        self._start_scan(self.get_roots())
+
+    def stop(self) -> None:
+        """Stop background refreshes and watcher subscriptions."""
+        self._stop_event.set()
+        if self.watcher:
+            for token in self._subscriptions.values():
+                self.watcher.unsubscribe(token)
+            self._subscriptions.clear()
+
+    # ------------------------------------------------------------------
+    # Helpers (call with lock held)
+    # ------------------------------------------------------------------
+
+    def _covers(self, path: str) -> bool:
+        """Check if path lies under one of the roots."""
+        return any(path == root or path.startswith(root + os.sep) for root in self._roots)
+
+    def _drop_root(self, root: str) -> None:
+        """Drop all entries under root."""
+        self._scanned_roots.discard(root)
+        self._drop_prefix(root + os.sep)
+
+    def _drop_prefix(self, prefix: str) -> None:
+        """Drop all entries whose path starts with prefix."""
+        for name in list(self._index):
+            paths = self._index[name]
+            stale = {p for p in paths if p.startswith(prefix)}
+            if stale:
+                paths -= stale
+                if not paths:
+                    del self._index[name]
+        for path in [p for p in self._last_access if p.startswith(prefix)]:
+            del self._last_access[path]
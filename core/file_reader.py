@@ -0,0 +1,459 @@
+"""Memory-mapped text file reading for AgentClick system.
+
+Dropped files can be hundreds of megabytes (logs). MappedTextFile maps the
+file instead of reading it, counts lines and detects binary content chunk
+by chunk, and decodes only the part that is needed: a line range, or the
+head and tail of the file.
+
+The encoding (and whether the file is binary) is decided once from the BOM
+and a leading sample. read_text_file() caches decoded content by path, size
+and modification time, so repeated activations on the same file skip the
+read entirely.
+
+Run this module to compare peak memory against reading the whole file:
+
+    python -m core.file_reader
+"""
+
+import codecs
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('FileReader')
+
+# Bytes scanned per step when counting or locating lines
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# Bytes inspected for encoding and binary detection
+BINARY_SAMPLE_SIZE = 8192
+
+# Byte order marks, longest first (UTF-32 LE starts with the UTF-16 LE mark)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def sniff_encoding(sample: bytes) -> Optional[str]:
+    """Decide the encoding of a file from its leading bytes.
+
+    Order: byte order mark, BOM-less UTF-16 (NUL in every other byte),
+    NUL bytes (binary), valid UTF-8, and latin-1 as the last resort.
+
+    Args:
+        sample: First bytes of the file (BINARY_SAMPLE_SIZE is enough)
+
+    Returns:
+        Codec name, or None if the content is binary
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    if b"\0" in sample:
+        even_nuls = sample[0::2].count(0)
+        odd_nuls = sample[1::2].count(0)
+        pairs = len(sample) // 2
+        # Mostly-ASCII UTF-16 text has a NUL in one half of nearly every pair
+        if pairs >= 4 and odd_nuls > 0.7 * pairs and even_nuls == 0:
+            return "utf-16-le"
+        if pairs >= 4 and even_nuls > 0.7 * pairs and odd_nuls == 0:
+            return "utf-16-be"
+        return None
+
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is fine
+        if len(sample) == BINARY_SAMPLE_SIZE and e.start >= len(sample) - 3:
+            return "utf-8"
+    return "latin-1"
+
+
+class MappedTextFile:
+    """Read-only, memory-mapped view of a text file.
+
+    Use as a context manager:
+
+        with MappedTextFile(path) as f:
+            if not f.is_binary():
+                text = f.read_lines(100, 200)
+
+    Line operations work on the raw bytes for ASCII-compatible encodings;
+    UTF-16/32 files are decoded whole first.
+    """
+
+    def __init__(self, path: str, encoding: Optional[str] = None):
+        """Open and map a file.
+
+        Args:
+            path: File path
+            encoding: Text encoding (sniffed from the content if None)
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self.encoding = encoding or sniff_encoding(self._data[:BINARY_SAMPLE_SIZE])
+        self._wide = self.encoding is not None and codecs.lookup(self.encoding).name.startswith(("utf-16", "utf-32"))
+        self._line_count: Optional[int] = None
+        self._text: Optional[str] = None  # Whole text of UTF-16/32 files
+
+    def __enter__(self) -> 'MappedTextFile':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def is_binary(self) -> bool:
+        """Check if the file looks binary (see sniff_encoding).
+
+        Returns:
+            True if the file should not be treated as text
+        """
+        return self.encoding is None
+
+    def _wide_text(self) -> str:
+        """Whole decoded text of a UTF-16/32 file (line operations use it)."""
+        if self._text is None:
+            self._text = self._decode(0, self.size)
+        return self._text
+
+    def line_count(self) -> int:
+        """Count lines (a final line without newline counts; an empty file has none).
+
+        Returns:
+            Number of lines, as len(text.splitlines()) would give for "\\n" endings
+        """
+        if self._line_count is None and self._wide:
+            text = self._wide_text()
+            self._line_count = text.count("\n") + (not text.endswith("\n") and bool(text))
+        if self._line_count is None:
+            newlines = 0
+            for start in range(0, self.size, CHUNK_SIZE):
+                newlines += self._data[start:start + CHUNK_SIZE].count(b"\n")
+            unterminated = self.size > 0 and self._data[self.size - 1:self.size] != b"\n"
+            self._line_count = newlines + unterminated
+        return self._line_count
+
+    def _line_offset(self, line: int, start: int = 0, start_line: int = 1) -> int:
+        """Byte offset where a line begins.
+
+        Args:
+            line: 1-based line number
+            start: Offset of start_line (to continue a previous search)
+            start_line: Line beginning at start
+
+        Returns:
+            Offset (file size if the file has fewer lines)
+        """
+        remaining = line - start_line
+        position = start
+        while remaining > 0 and position < self.size:
+            chunk = self._data[position:position + CHUNK_SIZE]
+            found = chunk.count(b"\n")
+            if found < remaining:
+                remaining -= found
+                position += len(chunk)
+                continue
+            index = -1
+            for _ in range(remaining):
+                index = chunk.index(b"\n", index + 1)
+            return position + index + 1
+        return position if remaining <= 0 else self.size
+
+    def _decode(self, start: int, end: int, errors: str = "replace") -> str:
+        """Decode a byte range with universal newlines (like text-mode open).
+
+        Decodes straight from the mapping; slicing it would copy the bytes first.
+        """
+        with memoryview(self._data) as view, view[start:end] as chunk:
+            text = str(chunk, self.encoding, errors)
+        return text.replace("\r\n", "\n")
+
+    def read_text(self, errors: str = "strict") -> str:
+        """Decode the whole file.
+
+        Args:
+            errors: Codec error handler ("replace" substitutes invalid bytes)
+
+        Returns:
+            File text
+
+        Raises:
+            UnicodeDecodeError: If the file is not valid text (errors="strict")
+        """
+        return self._decode(0, self.size, errors=errors)
+
+    def read_lines(self, first: int, last: Optional[int] = None) -> str:
+        """Decode a range of lines.
+
+        Args:
+            first: First line (1-based, inclusive)
+            last: Last line (inclusive, None = end of file)
+
+        Returns:
+            Text of the lines (without the final newline)
+        """
+        first = max(first, 1)
+        if self._wide:
+            lines = self._wide_text().split("\n")
+            return "\n".join(lines[first - 1:last])
+        start = self._line_offset(first)
+        end = self.size if last is None else self._line_offset(last + 1, start, first)
+        return self._decode(start, end).removesuffix("\n")
+
+    def read_head_tail(self, max_bytes: int, head_ratio: float = 0.6) -> Tuple[str, int]:
+        """Decode the beginning and end of the file, cut at line boundaries.
+
+        Args:
+            max_bytes: Maximum bytes decoded in total
+            head_ratio: Share of max_bytes taken from the beginning
+
+        Returns:
+            Tuple of (text with an omission marker, omitted line count);
+            the whole text and 0 if the file fits
+        """
+        if self.size <= max_bytes:
+            return self._decode(0, self.size), 0
+        if self._wide:
+            return self._wide_head_tail(max_bytes, head_ratio)
+
+        head_end = int(max_bytes * head_ratio)
+        tail_start = self.size - (max_bytes - head_end)
+
+        # Cut at newlines (never inside a multi-byte character)
+        newline = self._data.rfind(b"\n", 0, head_end)
+        if newline > 0:
+            head_end = newline + 1
+        newline = self._data.find(b"\n", tail_start)
+        if 0 <= newline < self.size - 1:
+            tail_start = newline + 1
+
+        head_lines = self._data[:head_end].count(b"\n")
+        tail_lines = self._data[tail_start:].count(b"\n") + (self._data[self.size - 1:self.size] != b"\n")
+        omitted = max(self.line_count() - head_lines - tail_lines, 0)
+        omitted_bytes = tail_start - head_end
+
+        marker = f"... [{omitted} lines ({omitted_bytes} bytes) not read from this large file] ...\n"
+        return self._decode(0, head_end) + marker + self._decode(tail_start, self.size), omitted
+
+    def _wide_head_tail(self, max_bytes: int, head_ratio: float) -> Tuple[str, int]:
+        """read_head_tail() for UTF-16/32 files, cut on the decoded text."""
+        text = self._wide_text()
+        keep = int(len(text) * max_bytes / self.size)
+        head_end = text.rfind("\n", 0, int(keep * head_ratio)) + 1
+        tail_start = text.find("\n", len(text) - (keep - int(keep * head_ratio))) + 1
+        if head_end <= 0 or tail_start <= head_end:
+            return text, 0
+
+        omitted = text.count("\n", head_end, tail_start)
+        marker = f"... [{omitted} lines not read from this large file] ...\n"
+        return text[:head_end] + marker + text[tail_start:], omitted
+
+
+@dataclass
+class DecodedFile:
+    """Text read from a file by read_text_file().
+
+    Attributes:
+        text: Decoded text (possibly a line range or head + tail)
+        encoding: Codec used
+        size: File size in bytes
+        line_count: Lines in the whole file
+        omitted_lines: Lines left out by a head + tail read
+    """
+    text: str
+    encoding: str
+    size: int
+    line_count: int
+    omitted_lines: int = 0
+
+
+class FileContentCache:
+    """LRU cache of decoded files keyed by path, size and modification time."""
+
+    def __init__(self, max_entries: int = 16, max_chars: int = 32 * 1024 * 1024):
+        """Initialize cache.
+
+        Args:
+            max_entries: Maximum cached reads
+            max_chars: Maximum total characters kept
+        """
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[tuple, DecodedFile]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[DecodedFile]:
+        """Get a cached read (None on miss)."""
+        with self._lock:
+            decoded = self._entries.get(key)
+            if decoded is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return decoded
+
+    def put(self, key: tuple, decoded: DecodedFile) -> None:
+        """Cache a read, evicting the least recently used ones."""
+        if len(decoded.text) > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous.text)
+            self._entries[key] = decoded
+            self._chars += len(decoded.text)
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                _, evicted = self._entries.popitem(last=False)
+                self._chars -= len(evicted.text)
+
+    def clear(self) -> None:
+        """Drop all cached reads."""
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+# Singleton instance
+_cache: Optional[FileContentCache] = None
+
+
+def get_file_content_cache() -> FileContentCache:
+    """Get the shared FileContentCache instance.
+
+    Returns:
+        The singleton FileContentCache
+    """
+    global _cache
+    if _cache is None:
+        _cache = FileContentCache()
+    return _cache
+
+
+def read_text_file(
+    path: str,
+    max_read_bytes: Optional[int] = None,
+    line_range: Optional[Tuple[int, Optional[int]]] = None,
+    cache: Optional[FileContentCache] = None
+) -> Optional[DecodedFile]:
+    """Read a text file once, detecting encoding and binary content.
+
+    Args:
+        path: File path
+        max_read_bytes: Read only head + tail of larger files (None = no limit)
+        line_range: Optional (first, last) lines to read, 1-based and inclusive
+        cache: Decoded content cache (shared cache by default)
+
+    Returns:
+        DecodedFile, or None if the file is binary
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    cache = cache or get_file_content_cache()
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns, max_read_bytes, line_range)
+
+    decoded = cache.get(key)
+    if decoded is not None:
+        logger.debug(f"File content cache hit: {os.path.basename(path)}")
+        return decoded
+
+    with MappedTextFile(path) as mapped:
+        if mapped.is_binary():
+            return None
+
+        omitted_lines = 0
+        if line_range:
+            text = mapped.read_lines(*line_range)
+        elif max_read_bytes is not None and mapped.size > max_read_bytes:
+            text, omitted_lines = mapped.read_head_tail(max_read_bytes)
+        else:
+            # Invalid bytes past the sample become U+FFFD; files whose sample
+            # is not UTF-8 were already sniffed as latin-1
+            text = mapped.read_text(errors="replace")
+
+        decoded = DecodedFile(
+            text=text,
+            encoding=mapped.encoding,
+            size=mapped.size,
+            line_count=mapped.line_count(),
+            omitted_lines=omitted_lines
+        )
+
+    cache.put(key, decoded)
+    return decoded
+
+
+def benchmark_file_reader(size_mb: int = 100) -> dict:
+    """Compare peak memory and time of reading a large log file.
+
+    Args:
+        size_mb: Size of the synthetic log file
+
+    Returns:
+        Dictionary by method with peak_mb and ms
+    """
+    import tempfile
+    import time
+    import tracemalloc
+
+    line = "2024-05-01 12:00:00,123 INFO [worker-7] Processed request id=42 in 13ms status=200\n"
+    path = os.path.join(tempfile.mkdtemp(), "large.log")
+    with open(path, "w", encoding="utf-8") as f:
+        block = line * 10000
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+
+    def read_whole():
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        return len(content.splitlines())
+
+    def read_mapped():
+        with MappedTextFile(path) as mapped:
+            mapped.is_binary()
+            mapped.read_head_tail(1024 * 1024)
+            return mapped.line_count()
+
+    results = {}
+    try:
+        for name, method in (("read + split (old)", read_whole), ("mmap head/tail", read_mapped)):
+            tracemalloc.start()
+            start = time.perf_counter()
+            lines = method()
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {"peak_mb": peak / 1024 / 1024, "ms": elapsed * 1000, "lines": lines}
+    finally:
+        os.remove(path)
+
+    return results
+
+
+if __name__ == "__main__":
+    for method, sample in benchmark_file_reader().items():
+        print(f"{method:<20} peak: {sample['peak_mb']:7.1f}MB  time: {sample['ms']:7.1f}ms  lines: {sample['lines']}")
@@ -0,0 +1,568 @@
+"""File watcher service for AgentClick system.
+
+A single watcher shared by every component that caches something derived
+from the filesystem (file index, agent registry, configuration, ...).
+
+Components subscribe by path prefix and receive coalesced batches of
+FileEvent objects. On Linux the watcher uses inotify; everywhere else (or if
+inotify is unavailable) it falls back to polling file modification times.
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from core.file_index import IGNORED_DIRS
+from utils.logger import setup_logger
+
+logger = setup_logger('FileWatcher')
+
+
+# Event kinds
+CREATED = "created"
+MODIFIED = "modified"
+DELETED = "deleted"
+RESCAN = "rescan"  # Events were lost - subscribers should rebuild their cache
+
+
+@dataclass(frozen=True)
+class FileEvent:
+    """A coalesced filesystem change.
+
+    Attributes:
+        path: Absolute path that changed
+        kind: One of CREATED, MODIFIED, DELETED, RESCAN
+        is_dir: True if path is a directory
+    """
+    path: str
+    kind: str
+    is_dir: bool = False
+
+
+@dataclass
+class _Subscription:
+    """Subscriber registered for a path prefix."""
+    prefix: str
+    callback: Callable[[List[FileEvent]], None]
+
+    def matches(self, path: str) -> bool:
+        """Check if path is the prefix itself or lies below it."""
+        return path == self.prefix or path.startswith(self.prefix + os.sep)
+
+
+def _merge_kinds(previous: str, current: str) -> Optional[str]:
+    """Coalesce two consecutive event kinds for the same path.
+
+    Returns:
+        Resulting kind or None if the events cancel out
+    """
+    if previous == RESCAN or current == RESCAN:
+        return RESCAN
+    if previous == CREATED and current == DELETED:
+        return None  # Temp file created and removed within the window
+    if previous == CREATED:
+        return CREATED
+    if previous == DELETED and current == CREATED:
+        return MODIFIED  # Atomic replace (write temp + rename)
+    return current
+
+
+def _is_below(path: str, root: str) -> bool:
+    """Check if path is root itself or lies below it."""
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+class _InotifyBackend:
+    """Linux inotify backend (via ctypes, no extra dependencies).
+
+    add_root() runs on the caller's thread while poll() runs on the watcher
+    thread; the watch tables are guarded by a lock, which is never held
+    while events are emitted.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    WATCH_MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+        IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    )
+
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, emit: Callable[[str, str, bool], None], max_depth: int = 8):
+        """Initialize inotify backend.
+
+        Args:
+            emit: Callback receiving (path, kind, is_dir) for each raw event
+
+        Raises:
+            OSError: If inotify is not available
+        """
+        import ctypes
+        import ctypes.util
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._ctypes = ctypes
+        self._emit = emit
+        self.max_depth = max_depth
+        self._lock = threading.Lock()
+        self._wd_to_path: Dict[int, str] = {}
+        self._path_to_wd: Dict[str, int] = {}
+        self._recursive_roots: Dict[str, bool] = {}
+
+    def add_root(self, path: str, recursive: bool) -> None:
+        """Start watching a file or folder."""
+        if os.path.isdir(path):
+            with self._lock:
+                self._recursive_roots[path] = recursive
+            self._add_tree(path, 0 if recursive else self.max_depth)
+        else:
+            # Single file: watch its parent folder, subscribers filter by path
+            self._add_watch(os.path.dirname(path))
+
+    def remove_root(self, path: str) -> None:
+        """Stop treating a folder as a recursive root.
+
+        Existing watches are kept until close(); subscribers filter by path.
+        """
+        with self._lock:
+            self._recursive_roots.pop(path, None)
+
+    def _add_tree(self, directory: str, depth: int) -> None:
+        """Watch directory and (within depth) its subfolders."""
+        if not self._add_watch(directory) or depth >= self.max_depth:
+            return
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False) and entry.name not in IGNORED_DIRS:
+                        self._add_tree(entry.path, depth + 1)
+        except OSError:
+            pass
+
+    def _add_watch(self, directory: str) -> bool:
+        """Add an inotify watch for a single directory."""
+        with self._lock:
+            if directory in self._path_to_wd:
+                return True
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), self.WATCH_MASK
+            )
+            if wd >= 0:
+                self._wd_to_path[wd] = directory
+                self._path_to_wd[directory] = wd
+                return True
+            errno = self._ctypes.get_errno()
+        logger.warning(f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+        return False
+
+    def _is_recursive(self, directory: str) -> bool:
+        """Check if directory lies under a recursively watched root."""
+        with self._lock:
+            return any(
+                recursive and _is_below(directory, root)
+                for root, recursive in self._recursive_roots.items()
+            )
+
+    def poll(self, timeout: float) -> None:
+        """Wait up to timeout seconds for events and emit them."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        header = self.EVENT_HEADER
+        while offset + header.size <= len(data):
+            wd, mask, _cookie, length = header.unpack_from(data, offset)
+            offset += header.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            self._handle(wd, mask, os.fsdecode(name))
+
+    def _handle(self, wd: int, mask: int, name: str) -> None:
+        """Translate one inotify event."""
+        if mask & self.IN_Q_OVERFLOW:
+            with self._lock:
+                roots = list(self._recursive_roots) or list(self._path_to_wd)
+            for root in roots:
+                self._emit(root, RESCAN, True)
+            return
+
+        with self._lock:
+            directory = self._wd_to_path.get(wd)
+            if directory is not None and mask & self.IN_IGNORED:
+                del self._wd_to_path[wd]
+                if self._path_to_wd.get(directory) == wd:
+                    del self._path_to_wd[directory]
+        if directory is None or mask & self.IN_IGNORED:
+            return
+
+        is_dir = bool(mask & self.IN_ISDIR)
+        path = os.path.join(directory, name) if name else directory
+
+        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            self._emit(path, CREATED, is_dir)
+            if is_dir and self._is_recursive(directory):
+                # Watch the new folder and report files created before the watch existed
+                self._add_tree(path, 0)
+                self._emit_existing(path)
+        elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+            self._emit(path, DELETED, is_dir)
+        elif mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+            self._emit(directory, DELETED, True)
+        else:
+            self._emit(path, MODIFIED, is_dir)
+
+    def _emit_existing(self, directory: str) -> None:
+        """Emit CREATED for files already present in a new folder."""
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            for name in files:
+                self._emit(os.path.join(root, name), CREATED, False)
+
+    def close(self) -> None:
+        """Release the inotify file descriptor."""
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class _PollingBackend:
+    """Portable backend comparing modification times at a fixed interval.
+
+    Only the outermost roots are scanned (a root below a recursively watched
+    root is already covered by it), and the interval grows with the scan
+    time so large trees never keep the watcher thread busy.
+    """
+
+    def __init__(self, emit: Callable[[str, str, bool], None], interval: float = 2.0,
+                 max_depth: int = 8, max_files: int = 50_000, max_busy: float = 0.1):
+        """Initialize polling backend.
+
+        Args:
+            emit: Callback receiving (path, kind, is_dir) for each raw event
+            interval: Minimum seconds between scans
+            max_depth: Maximum folder depth scanned below each root
+            max_files: Maximum files tracked per root
+            max_busy: Maximum fraction of the time spent scanning
+        """
+        self._emit = emit
+        self.interval = interval
+        self.max_depth = max_depth
+        self.max_files = max_files
+        self.max_busy = max_busy
+        self._lock = threading.Lock()
+        self._roots: Dict[str, bool] = {}
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._next_scan = 0.0
+
+    def add_root(self, path: str, recursive: bool) -> None:
+        """Start watching a file or folder."""
+        with self._lock:
+            if self._covered(path, self._roots):
+                self._roots[path] = recursive
+                return
+        snapshot = self._snapshot(path, recursive)
+        with self._lock:
+            self._roots[path] = recursive
+            self._snapshots[path] = snapshot
+
+    def remove_root(self, path: str) -> None:
+        """Stop watching a file or folder."""
+        with self._lock:
+            self._roots.pop(path, None)
+            self._snapshots.pop(path, None)
+
+    @staticmethod
+    def _covered(path: str, roots: Dict[str, bool]) -> bool:
+        """Check if path lies below another recursively watched root."""
+        return any(
+            recursive and root != path and path.startswith(root.rstrip(os.sep) + os.sep)
+            for root, recursive in roots.items()
+        )
+
+    def _snapshot(self, root: str, recursive: bool) -> Dict[str, Tuple[int, int]]:
+        """Collect (mtime, size) for every file under root."""
+        result: Dict[str, Tuple[int, int]] = {}
+
+        if not os.path.isdir(root):
+            try:
+                st = os.stat(root)
+                result[root] = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                pass
+            return result
+
+        stack = [(root, 0)]
+        while stack and len(result) < self.max_files:
+            directory, depth = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if recursive and depth < self.max_depth and entry.name not in IGNORED_DIRS:
+                                    stack.append((entry.path, depth + 1))
+                            elif entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                result[entry.path] = (st.st_mtime_ns, st.st_size)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return result
+
+    def poll(self, timeout: float) -> None:
+        """Sleep up to timeout, rescanning roots when the interval elapsed."""
+        now = time.monotonic()
+        if now < self._next_scan:
+            time.sleep(min(timeout, self._next_scan - now))
+            return
+
+        with self._lock:
+            roots = dict(self._roots)
+        scanned = {root: recursive for root, recursive in roots.items()
+                   if not self._covered(root, roots)}
+
+        for root, recursive in scanned.items():
+            new = self._snapshot(root, recursive)
+            with self._lock:
+                if root not in self._roots:
+                    continue  # Removed while scanning
+                old = self._snapshots.get(root)
+                self._snapshots[root] = new
+            if old is None:
+                continue  # No longer covered by an outer root: baseline only
+
+            for path, stamp in new.items():
+                previous = old.get(path)
+                if previous is None:
+                    self._emit(path, CREATED, False)
+                elif previous != stamp:
+                    self._emit(path, MODIFIED, False)
+            for path in old.keys() - new.keys():
+                self._emit(path, DELETED, False)
+
+        with self._lock:
+            # Roots now covered by an outer root no longer need their own snapshot
+            for root in roots.keys() - scanned.keys():
+                self._snapshots.pop(root, None)
+
+        elapsed = time.monotonic() - now
+        self._next_scan = now + max(self.interval, elapsed / self.max_busy)
+        if elapsed > self.interval * self.max_busy:
+            logger.debug(f"Polling scan took {elapsed * 1000:.0f}ms, next in {self._next_scan - now:.1f}s")
+
+    def close(self) -> None:
+        """Nothing to release."""
+        pass
+
+
+class FileWatcher:
+    """Shared filesystem watcher with prefix subscriptions.
+
+    Raw events from the backend are collected and delivered to subscribers
+    once the filesystem has been quiet for `debounce` seconds (or at most
+    `max_latency` seconds after the first event), so a burst such as a git
+    checkout produces one batch per subscriber instead of thousands of calls.
+    Callbacks run on the watcher thread and must not block for long.
+    """
+
+    def __init__(self, debounce: float = 0.3, max_latency: float = 2.0,
+                 poll_interval: float = 2.0, force_polling: bool = False):
+        """Initialize file watcher.
+
+        Args:
+            debounce: Quiet period (seconds) before a batch is delivered
+            max_latency: Maximum delay (seconds) for the first event of a batch
+            poll_interval: Scan interval for the polling backend
+            force_polling: Use polling even where inotify is available
+        """
+        self.debounce = debounce
+        self.max_latency = max_latency
+        self.logger = logger
+
+        self._lock = threading.RLock()
+        self._subscriptions: Dict[int, _Subscription] = {}
+        self._next_token = 1
+        self._watched: Dict[str, bool] = {}
+        self._pending: Dict[str, FileEvent] = {}
+        self._first_pending = 0.0
+        self._last_pending = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        self._backend = None
+        if sys.platform.startswith("linux") and not force_polling:
+            try:
+                self._backend = _InotifyBackend(self._on_raw_event)
+                self.backend_name = "inotify"
+            except (OSError, AttributeError) as e:
+                self.logger.warning(f"inotify unavailable ({e}), using polling")
+        if self._backend is None:
+            self._backend = _PollingBackend(self._on_raw_event, interval=poll_interval)
+            self.backend_name = "polling"
+
+        self.logger.info(f"File watcher initialized ({self.backend_name} backend)")
+
+    def subscribe(self, prefix: str, callback: Callable[[List[FileEvent]], None],
+                  recursive: bool = True) -> int:
+        """Subscribe to changes of a file or below a folder.
+
+        Args:
+            prefix: File or folder path
+            callback: Called with a list of FileEvent for each batch
+            recursive: Watch subfolders too (folders only)
+
+        Returns:
+            Subscription token for unsubscribe()
+        """
+        prefix = os.path.abspath(prefix)
+
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._subscriptions[token] = _Subscription(prefix, callback)
+
+            if prefix not in self._watched or (recursive and not self._watched[prefix]):
+                self._watched[prefix] = recursive
+                try:
+                    self._backend.add_root(prefix, recursive)
+                except Exception as e:
+                    self.logger.error(f"Cannot watch {prefix}: {e}")
+
+        self.logger.debug(f"Subscribed #{token} to {prefix}")
+        self.start()
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        """Remove a subscription.
+
+        Args:
+            token: Token returned by subscribe()
+        """
+        with self._lock:
+            subscription = self._subscriptions.pop(token, None)
+            if subscription is None:
+                return
+            prefix = subscription.prefix
+            if any(s.prefix == prefix for s in self._subscriptions.values()):
+                return
+            self._watched.pop(prefix, None)
+            try:
+                self._backend.remove_root(prefix)
+            except Exception as e:
+                self.logger.error(f"Cannot unwatch {prefix}: {e}")
+
+    def start(self) -> None:
+        """Start the watcher thread (no-op if running)."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="FileWatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watcher thread and release backend resources."""
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._backend.close()
+        self.logger.info("File watcher stopped")
+
+    def _on_raw_event(self, path: str, kind: str, is_dir: bool) -> None:
+        """Collect a raw backend event into the pending batch."""
+        now = time.monotonic()
+        with self._lock:
+            existing = self._pending.get(path)
+            if existing is None:
+                if not self._pending:
+                    self._first_pending = now
+                self._pending[path] = FileEvent(path, kind, is_dir)
+            else:
+                merged = _merge_kinds(existing.kind, kind)
+                if merged is None:
+                    del self._pending[path]
+                else:
+                    self._pending[path] = FileEvent(path, merged, is_dir or existing.is_dir)
+            self._last_pending = now
+
+    def _run(self) -> None:
+        """Watcher loop: read backend events and flush coalesced batches."""
+        while not self._stop_event.is_set():
+            try:
+                self._backend.poll(timeout=min(self.debounce, 0.25))
+            except Exception as e:
+                self.logger.error(f"Watcher backend error: {e}")
+                time.sleep(1.0)
+            self._flush_if_due()
+
+    def _flush_if_due(self) -> None:
+        """Deliver the pending batch once it is quiet or old enough."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._pending:
+                return
+            quiet = now - self._last_pending >= self.debounce
+            overdue = now - self._first_pending >= self.max_latency
+            if not (quiet or overdue):
+                return
+            events = list(self._pending.values())
+            self._pending = {}
+            subscriptions = list(self._subscriptions.values())
+
+        for subscription in subscriptions:
+            matched = [e for e in events if subscription.matches(e.path) or
+                       (e.kind == RESCAN and _is_below(subscription.prefix, e.path))]
+            if not matched:
+                continue
+            try:
+                subscription.callback(matched)
+            except Exception as e:
+                self.logger.error(f"Error in watcher callback for {subscription.prefix}: {e}", exc_info=True)
+
+
+# Singleton instance
+_instance: Optional[FileWatcher] = None
+_instance_lock = threading.Lock()
+
+
+def get_file_watcher() -> FileWatcher:
+    """Get the shared FileWatcher instance.
+
+    Returns:
+        The singleton FileWatcher
+    """
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = FileWatcher()
+        return _instance
@@ -0,0 +1,315 @@
+"""Perceptual-hash deduplication of captured images.
+
+Screenshots and clipboard images are fingerprinted with a 64-bit difference
+hash (dHash). Candidates with a small Hamming distance are confirmed on a
+downscaled grayscale probe (a hash alone misses small dialogs or edits),
+so only near-identical images - e.g. differing in a ticking clock - reuse
+the file stored for the earlier capture. Agent results are only reused for
+exact duplicates: they are keyed by pixel_digest() of the capture, which is
+computed off the capture path (ImageEncoder.digest).
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('ImageDedup')
+
+
+def dhash(image, hash_size: int = 8) -> int:
+    """Compute the difference hash of an image.
+
+    Pass the probe_image() of a capture rather than the capture itself: the
+    hash only needs a 9x8 thumbnail, and the probe avoids a second pass
+    over the full-resolution pixels.
+
+    Args:
+        image: PIL image (usually a probe)
+        hash_size: Hash grid size (8 -> 64-bit hash)
+
+    Returns:
+        Hash as an integer
+    """
+    from PIL import Image
+
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    pixels = small.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def pixel_digest(image) -> str:
+    """Exact content hash of an image (mode, size and every pixel).
+
+    A full-resolution pass - run it on the encoder thread, not on the
+    capture path.
+
+    Args:
+        image: PIL image
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image.mode}:{image.size}".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count differing bits between two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def probe_image(image, probe_width: int = 512):
+    """Downscaled grayscale copy of an image.
+
+    The only full-resolution pass of a capture: change detection and
+    dhash() work on the probe (the store names files by their encoded bytes).
+
+    Args:
+        image: PIL image
+        probe_width: Width of the copy
+
+    Returns:
+        Grayscale PIL image
+    """
+    from PIL import Image
+
+    height = max(1, round(image.height * probe_width / image.width))
+    return image.convert("L").resize((probe_width, height), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def _changed_mask(previous_probe, current_probe, threshold: int):
+    """Binary mask of pixels that differ between two probes."""
+    from PIL import ImageChops
+    return ImageChops.difference(previous_probe, current_probe).point(lambda v: 255 if v >= threshold else 0)
+
+
+def difference_ratio(previous_probe, current_probe, threshold: int = 24) -> float:
+    """Share of pixels that differ between two probes.
+
+    Args:
+        previous_probe: probe_image() of the previous image
+        current_probe: probe_image() of the current image
+        threshold: Minimum gray level difference counted as a change
+
+    Returns:
+        Ratio in [0, 1] (1.0 if the probes have different sizes)
+    """
+    if previous_probe.size != current_probe.size:
+        return 1.0
+    changed = _changed_mask(previous_probe, current_probe, threshold).histogram()[255]
+    return changed / (current_probe.width * current_probe.height)
+
+
+def changed_region(previous_probe, current_probe, current_size: Tuple[int, int],
+                   threshold: int = 24) -> Optional[Tuple[int, int, int, int]]:
+    """Find the bounding box of what changed since a previous image.
+
+    The comparison runs on the probes; the box is scaled back to the
+    coordinates of the current image (with a small margin).
+
+    Args:
+        previous_probe: probe_image() of the previous image
+        current_probe: probe_image() of the current image
+        current_size: (width, height) of the current image
+        threshold: Minimum gray level difference counted as a change
+
+    Returns:
+        (left, top, right, bottom) box in the current image, or None if
+        nothing changed or the probes have different sizes
+    """
+    if previous_probe.size != current_probe.size:
+        return None
+
+    box = _changed_mask(previous_probe, current_probe, threshold).getbbox()
+    if box is None:
+        return None
+
+    width, height = current_size
+    scale = width / current_probe.width
+    margin = 2
+    left, top, right, bottom = box
+    return (
+        max(0, int((left - margin) * scale)),
+        max(0, int((top - margin) * scale)),
+        min(width, int((right + margin) * scale) + 1),
+        min(height, int((bottom + margin) * scale) + 1),
+    )
+
+
+@dataclass
+class ImageEntry:
+    """A stored image known to the index.
+
+    Attributes:
+        image_hash: dHash of the image
+        path: Stored file
+        source: Input type that captured it ("screenshot", "clipboard_image")
+        size: (width, height) of the captured image
+        probe: probe_image() of the captured image
+        created: Capture time
+    """
+    image_hash: int
+    path: str
+    source: str
+    size: Tuple[int, int]
+    probe: Any = None
+    created: float = field(default_factory=time.time)
+
+
+class ImageDedupIndex:
+    """Index of recent images by perceptual hash."""
+
+    def __init__(self, max_entries: int = 32, max_distance: int = 6,
+                 max_changed_ratio: float = 0.002, result_ttl: float = 600.0):
+        """Initialize index.
+
+        Args:
+            max_entries: Number of recent images remembered
+            max_distance: Maximum Hamming distance of duplicate candidates
+            max_changed_ratio: Maximum share of changed probe pixels for a duplicate
+            result_ttl: Seconds a cached agent result stays reusable
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.max_changed_ratio = max_changed_ratio
+        self.result_ttl = result_ttl
+        self._entries: "OrderedDict[str, ImageEntry]" = OrderedDict()
+        # (pixel digest, agent name, input key) -> (time, result)
+        self._results: "OrderedDict[Tuple[str, str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, image_hash: int, size: Tuple[int, int], probe=None) -> Optional[ImageEntry]:
+        """Find a stored near-identical image.
+
+        Args:
+            image_hash: dHash of the new image
+            size: (width, height) of the new image (must match)
+            probe: probe_image() of the new image (confirms candidates)
+
+        Returns:
+            Matching entry or None
+        """
+        from core.image_pipeline import get_image_encoder
+        from core.image_store import get_image_store
+
+        with self._lock:
+            best = None
+            for entry in reversed(self._entries.values()):
+                if entry.size != size:
+                    continue
+                distance = hamming_distance(entry.image_hash, image_hash)
+                if distance > self.max_distance or (best is not None and distance >= best[0]):
+                    continue
+                if probe is not None and entry.probe is not None:
+                    if difference_ratio(entry.probe, probe) > self.max_changed_ratio:
+                        continue
+                best = (distance, entry)
+            if best is None:
+                return None
+            entry = best[1]
+
+        stored = get_image_store().resolve(entry.path)  # Screenshots are registered by provisional path
+        if not (os.path.exists(stored) or get_image_encoder().is_pending(entry.path)):
+            self.remove(entry.path)
+            return None
+
+        with self._lock:
+            self._entries.move_to_end(entry.path)
+        logger.info(f"Near-duplicate image (distance {best[0]}) - reusing {os.path.basename(entry.path)}")
+        return entry
+
+    def add(self, image_hash: int, path: str, source: str, size: Tuple[int, int], probe=None) -> ImageEntry:
+        """Register a stored image.
+
+        Args:
+            image_hash: dHash of the image
+            path: Stored file
+            source: Input type that captured it
+            size: (width, height) of the captured image
+            probe: probe_image() of the image
+
+        Returns:
+            The new entry
+        """
+        entry = ImageEntry(image_hash, path, source, size, probe)
+        with self._lock:
+            self._entries[path] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def remove(self, path: str) -> None:
+        """Forget an image."""
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def store_result(self, digest: str, agent_name: str, text: str, result: Any) -> None:
+        """Remember an agent result produced for an image.
+
+        Args:
+            digest: pixel_digest() of the captured image
+            agent_name: Agent name
+            text: Input key (text and settings the result depends on)
+            result: AgentResult
+        """
+        with self._lock:
+            self._results[(digest, agent_name, text)] = (time.time(), result)
+            self._results.move_to_end((digest, agent_name, text))
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+    def has_results(self, agent_name: str, text: str) -> bool:
+        """Check if any result is cached for an agent and input key.
+
+        Lets callers skip waiting for the pixel digest when nothing can match.
+        """
+        with self._lock:
+            return any(key[1:] == (agent_name, text) for key in self._results)
+
+    def get_result(self, digest: str, agent_name: str, text: str) -> Optional[Any]:
+        """Get a cached agent result for an exact duplicate image.
+
+        Args:
+            digest: pixel_digest() of the captured image
+            agent_name: Agent name
+            text: Input key
+
+        Returns:
+            AgentResult or None
+        """
+        with self._lock:
+            cached = self._results.get((digest, agent_name, text))
+            if cached is None:
+                return None
+            if time.time() - cached[0] > self.result_ttl:
+                del self._results[(digest, agent_name, text)]
+                return None
+            return cached[1]
+
+
+# Singleton instance
+_index: Optional[ImageDedupIndex] = None
+
+
+def get_image_dedup_index() -> ImageDedupIndex:
+    """Get the shared ImageDedupIndex instance.
+
+    Returns:
+        The singleton ImageDedupIndex
+    """
+    global _index
+    if _index is None:
+        _index = ImageDedupIndex()
+    return _index
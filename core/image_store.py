@@ -0,0 +1,332 @@
+"""Content-addressed temp image store for AgentClick system.
+
+Screenshots and clipboard images are stored in one temp folder under names
+derived from a hash of their encoded bytes, so storing the same image twice
+reuses the file. Screenshots are encoded in the background: the capture
+hands out a provisional path that is aliased to the content-named file once
+it is written (see resolve()). A background task keeps the folder under a
+byte budget by evicting the least recently used files; images pinned by
+in-flight agent jobs (or still being encoded) are never evicted.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('ImageStore')
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Folders used before the shared store existed (swept on start)
+LEGACY_DIRS = ("agent_click_screenshots", "agent_click_images")
+
+
+class ImageStore:
+    """Size-bounded, content-addressed image folder."""
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES,
+                 check_interval: float = 60.0):
+        """Initialize image store.
+
+        Args:
+            root: Store folder (default: %TEMP%/agent_click_store)
+            max_bytes: Total size budget
+            check_interval: Seconds between background eviction passes
+        """
+        self.root = Path(root) if root else Path(tempfile.gettempdir()) / "agent_click_store"
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+
+        self._files: "OrderedDict[str, int]" = OrderedDict()  # path -> size, LRU first
+        self._total_bytes = 0
+        self._pins: Dict[str, int] = {}
+        self._aliases: Dict[str, str] = {}  # provisional path -> content-named file
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.evicted_files = 0
+
+        self._scan()
+
+    @staticmethod
+    def content_digest(data: bytes) -> str:
+        """Content hash of an encoded image file.
+
+        Args:
+            data: Encoded file bytes (exactly what is stored and sent)
+
+        Returns:
+            Hex digest
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def store_bytes(self, prefix: str, data: bytes, extension: str) -> Path:
+        """Write encoded image bytes under their content name (reused if present).
+
+        Args:
+            prefix: File name prefix ("screenshot", "clipboard")
+            data: Encoded file bytes
+            extension: File extension including the dot
+
+        Returns:
+            Path of the stored file
+        """
+        path = self.path_for(prefix, self.content_digest(data), extension)
+        if path.exists():
+            self.touch(path)
+            return path
+
+        temp_path = f"{path}.{threading.get_ident()}.part"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        self.add(path)
+        return path
+
+    def alias(self, path, target) -> None:
+        """Point a provisional path at the file that was stored for it.
+
+        Pins taken on the provisional path move to the target.
+
+        Args:
+            path: Provisional path handed out before the content was known
+            target: Content-named file
+        """
+        path, target = str(path), str(target)
+        with self._lock:
+            self._aliases[path] = target
+            count = self._pins.pop(path, 0)
+            if count:
+                self._pins[target] = self._pins.get(target, 0) + count
+
+    def resolve(self, path) -> str:
+        """Get the stored file for a path (provisional paths are resolved).
+
+        Args:
+            path: File path
+
+        Returns:
+            Content-named file, or path itself if it is not an alias
+        """
+        with self._lock:
+            return self._aliases.get(str(path), str(path))
+
+    def path_for(self, prefix: str, digest: str, extension: str) -> Path:
+        """Get the store path for a content hash.
+
+        Args:
+            prefix: File name prefix ("screenshot", "clipboard")
+            digest: Content hash
+            extension: File extension including the dot
+
+        Returns:
+            Path inside the store
+        """
+        return self.root / f"{prefix}_{digest}{extension}"
+
+    def add(self, path) -> None:
+        """Account for a file written to the store.
+
+        Args:
+            path: File path
+        """
+        path = str(path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+
+        with self._lock:
+            self._total_bytes += size - self._files.pop(path, 0)
+            self._files[path] = size
+            over_budget = self._total_bytes > self.max_bytes
+
+        if over_budget:
+            self._wakeup.set()
+
+    def touch(self, path) -> None:
+        """Mark a stored file as recently used.
+
+        Args:
+            path: File path
+        """
+        with self._lock:
+            path = self._aliases.get(str(path), str(path))
+            if path in self._files:
+                self._files.move_to_end(path)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def pin(self, path) -> None:
+        """Protect a file from eviction (e.g. while an agent job uses it).
+
+        Args:
+            path: File path (None is ignored)
+        """
+        if not path:
+            return
+        with self._lock:
+            path = self._aliases.get(str(path), str(path))
+            self._pins[path] = self._pins.get(path, 0) + 1
+        self.touch(path)
+
+    def unpin(self, path) -> None:
+        """Release a pin taken with pin().
+
+        Args:
+            path: File path (None is ignored)
+        """
+        if not path:
+            return
+        with self._lock:
+            path = self._aliases.get(str(path), str(path))
+            count = self._pins.get(path, 0) - 1
+            if count > 0:
+                self._pins[path] = count
+            else:
+                self._pins.pop(path, None)
+
+    def _scan(self) -> None:
+        """Index files already in the store (oldest first)."""
+        entries = []
+        for file_path in self.root.iterdir():
+            if file_path.is_file() and not file_path.name.endswith(".part"):
+                stat = file_path.stat()
+                entries.append((stat.st_mtime, str(file_path), stat.st_size))
+
+        with self._lock:
+            for _, path, size in sorted(entries):
+                self._files[path] = size
+                self._total_bytes += size
+
+        logger.debug(f"Image store: {len(entries)} files, {self._total_bytes / 1024 / 1024:.1f}MB")
+
+    def _sweep_legacy_dirs(self) -> None:
+        """Delete images left in the folders used before the store existed."""
+        removed = 0
+        for name in LEGACY_DIRS:
+            legacy_dir = Path(tempfile.gettempdir()) / name
+            if not legacy_dir.is_dir():
+                continue
+            for file_path in legacy_dir.iterdir():
+                try:
+                    file_path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Removed {removed} images from legacy temp folders")
+
+    def evict(self) -> int:
+        """Delete least recently used files until the store fits its budget.
+
+        Returns:
+            Number of bytes freed
+        """
+        from core.image_pipeline import get_image_encoder
+        encoder = get_image_encoder()
+        freed = 0
+
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return 0
+            candidates = [p for p in self._files if p not in self._pins]
+
+        for path in candidates:
+            with self._lock:
+                if self._total_bytes <= self.max_bytes:
+                    break
+                if path in self._pins or path not in self._files:
+                    continue
+            if encoder.is_pending(path):
+                continue
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Could not evict {path}: {e}")
+                continue
+
+            with self._lock:
+                size = self._files.pop(path, 0)
+                self._total_bytes -= size
+                self.evicted_files += 1
+                for alias in [a for a, target in self._aliases.items() if target == path]:
+                    del self._aliases[alias]
+            freed += size
+
+        if freed:
+            logger.info(f"Evicted {freed / 1024 / 1024:.1f}MB of images (budget {self.max_bytes / 1024 / 1024:.0f}MB)")
+        return freed
+
+    def start(self) -> None:
+        """Start the background eviction task."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ImageStore", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background eviction task."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self) -> None:
+        """Background loop: evict when over budget or every check_interval."""
+        self._sweep_legacy_dirs()
+        while not self._stop.is_set():
+            try:
+                self.evict()
+            except Exception as e:
+                logger.error(f"Error evicting images: {e}")
+            self._wakeup.wait(self.check_interval)
+            self._wakeup.clear()
+
+    def get_stats(self) -> dict:
+        """Get store counters.
+
+        Returns:
+            Dictionary with file count, total bytes, pinned files and evictions
+        """
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "pinned": len(self._pins),
+                "evicted_files": self.evicted_files,
+            }
+
+
+# Singleton instance
+_store: Optional[ImageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    """Get the shared ImageStore instance (starts its background task).
+
+    Returns:
+        The singleton ImageStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore()
+            _store.start()
+    return _store
@@ -0,0 +1,483 @@
+"""Input budgeting for AgentClick system.
+
+Keeps captured input within a token budget before it reaches an agent.
+Tokens are estimated locally (no tokenizer dependency) and oversized text is
+reduced with the cheapest strategy that fits:
+
+1. Log deduplication - collapse repeated lines (timestamps/numbers ignored)
+2. Code body trimming - elide the largest bodies until the code fits
+3. Code outline - keep imports and definitions, elide every body
+4. Head/tail window - keep the beginning and end of the text
+
+What was dropped is reported so it can be surfaced in the result metadata.
+
+Large inputs are processed in place: tokens are counted chunk by chunk and
+lines are scanned with offsets into the one text buffer, so a 50 MB
+selection is never split into a list of lines or words.
+
+Run this module to measure time and peak memory for a 50 MB input:
+
+    python -m core.input_budget
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from core.input_strategy import InputContent
+from utils.logger import setup_logger
+
+logger = setup_logger('InputBudget')
+
+# Default budget for captured input (roughly 30% of a 200k context window)
+DEFAULT_MAX_INPUT_TOKENS = 60_000
+
+CODE_EXTENSIONS = {
+    '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.kt', '.cs', '.go', '.rs',
+    '.c', '.h', '.cpp', '.hpp', '.cc', '.rb', '.php', '.swift', '.scala',
+}
+LOG_EXTENSIONS = {'.log', '.out', '.err'}
+
+# Lines kept by the code outline (declarations, imports, decorators)
+_OUTLINE_PATTERN = re.compile(
+    r'^\s*(?:@|import\b|from\b|#include\b|using\b|package\b|'
+    r'(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:def|class|function|interface|type|enum|struct|trait|impl|fn|func)\b|'
+    r'(?:public|private|protected|internal|static|abstract|final|override)\b.*[({]\s*$)'
+)
+# Estimated tokens of the marker replacing an elided code body
+_ELISION_TOKENS = 8
+# Volatile parts of log lines ignored when deduplicating
+_LOG_NOISE_PATTERN = re.compile(r'\d+(?:[.:\-/T]\d+)*|0x[0-9a-fA-F]+')
+_WORD_PATTERN = re.compile(r'\w+|[^\w\s]')
+_LONG_WORD_PATTERN = re.compile(r'\w{7,}')
+
+# Characters counted per step by estimate_tokens (bounds the match lists)
+_ESTIMATE_CHUNK_CHARS = 1024 * 1024
+
+# Longer texts are estimated from evenly spaced samples. Any text this long
+# is far over every budget (even one long word is 1 token per 6 characters),
+# so sampling only affects the reported original size, not the decisions.
+_SAMPLED_ESTIMATE_CHARS = 8 * _ESTIMATE_CHUNK_CHARS
+_ESTIMATE_SAMPLES = 32
+_SAMPLE_CHARS = 128 * 1024
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text.
+
+    Counts words and punctuation and corrects for long words, which is
+    close enough to BPE tokenizers for budgeting purposes. Long texts are
+    counted in chunks cut at whitespace; very long texts are sampled.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Estimated token count
+    """
+    if not text:
+        return 0
+    if len(text) <= _ESTIMATE_CHUNK_CHARS:
+        return _estimate_chunk(text)
+
+    if len(text) > _SAMPLED_ESTIMATE_CHARS:
+        step = len(text) // _ESTIMATE_SAMPLES
+        sampled = sum(
+            _estimate_chunk(text[i * step:i * step + _SAMPLE_CHARS])
+            for i in range(_ESTIMATE_SAMPLES)
+        )
+        return int(sampled * len(text) / (_ESTIMATE_SAMPLES * _SAMPLE_CHARS))
+
+    total = 0
+    start = 0
+    while start < len(text):
+        end = start + _ESTIMATE_CHUNK_CHARS
+        if end < len(text):
+            cut = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+            if cut > start:
+                end = cut
+        total += _estimate_chunk(text[start:end])
+        start = end
+    return total
+
+
+def _estimate_chunk(text: str) -> int:
+    """Estimate the tokens of a chunk (see estimate_tokens)."""
+    pieces = len(_WORD_PATTERN.findall(text))
+    long_extra = sum(len(word) // 6 for word in _LONG_WORD_PATTERN.findall(text))
+    return pieces + long_extra
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield the lines of a text without building a list of them.
+
+    Lines end at "\n"; a trailing "\r" is removed.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end < 0:
+            end = length
+        line = text[start:end]
+        yield line[:-1] if line.endswith("\r") else line
+        start = end + 1
+
+
+@dataclass
+class BudgetReport:
+    """What the budgeting stage did to an input.
+
+    Attributes:
+        original_tokens: Estimated tokens before budgeting
+        final_tokens: Estimated tokens after budgeting
+        max_tokens: Budget applied
+        strategies: Strategies applied, in order
+        dropped: Human readable notes about what was removed
+    """
+    original_tokens: int
+    final_tokens: int
+    max_tokens: int
+    strategies: List[str] = field(default_factory=list)
+    dropped: List[str] = field(default_factory=list)
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the input was reduced."""
+        return bool(self.strategies)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (for result metadata)."""
+        return {
+            "original_tokens": self.original_tokens,
+            "final_tokens": self.final_tokens,
+            "max_tokens": self.max_tokens,
+            "truncated": self.truncated,
+            "strategies": list(self.strategies),
+            "dropped": list(self.dropped),
+        }
+
+
+class InputBudget:
+    """Applies a token budget to captured input."""
+
+    def __init__(self, max_tokens: int = DEFAULT_MAX_INPUT_TOKENS, head_ratio: float = 0.6):
+        """Initialize input budget.
+
+        Args:
+            max_tokens: Maximum estimated tokens for the input text
+            head_ratio: Share of the window kept from the beginning of the text
+        """
+        self.max_tokens = max_tokens
+        self.head_ratio = head_ratio
+
+    def apply(self, content: InputContent) -> Optional[BudgetReport]:
+        """Reduce the text of an input in place if it exceeds the budget.
+
+        The report is also stored in content.metadata["input_budget"].
+
+        Args:
+            content: Captured input
+
+        Returns:
+            BudgetReport or None if the input has no text
+        """
+        if not content.text:
+            return None
+
+        extension = ""
+        if content.metadata:
+            extension = (content.metadata.get("extension") or "").lower()
+
+        text, report = self.fit(content.text, extension)
+        if report.truncated:
+            content.text = text
+            logger.info(
+                f"Input reduced from ~{report.original_tokens} to ~{report.final_tokens} tokens "
+                f"({', '.join(report.strategies)})"
+            )
+
+        if content.metadata is None:
+            content.metadata = {}
+        content.metadata["input_budget"] = report.to_dict()
+        return report
+
+    def fit(self, text: str, extension: str = "") -> Tuple[str, BudgetReport]:
+        """Fit a text into the budget.
+
+        Args:
+            text: Text to fit
+            extension: File extension hint (".py", ".log", ...)
+
+        Returns:
+            Tuple of (text, report)
+        """
+        tokens = estimate_tokens(text)
+        report = BudgetReport(original_tokens=tokens, final_tokens=tokens, max_tokens=self.max_tokens)
+        if tokens <= self.max_tokens:
+            return text, report
+
+        strategies: List[Tuple[str, Callable[[str], Tuple[str, Optional[str]]]]] = []
+        if extension in LOG_EXTENSIONS or self._looks_like_log(text):
+            strategies.append(("log_dedup", self._dedup_log_lines))
+        if extension in CODE_EXTENSIONS:
+            strategies.append(("code_trim", self._trim_code_bodies))
+            strategies.append(("code_outline", self._outline_code))
+
+        for name, strategy in strategies:
+            reduced, note = strategy(text)
+            if note is None:
+                continue
+            text = reduced
+            tokens = estimate_tokens(text)
+            report.strategies.append(name)
+            report.dropped.append(note)
+            if tokens <= self.max_tokens:
+                break
+
+        if tokens > self.max_tokens:
+            text, note = self._head_tail_window(text, tokens)
+            tokens = estimate_tokens(text)
+            report.strategies.append("head_tail")
+            report.dropped.append(note)
+
+        report.final_tokens = tokens
+        return text, report
+
+    @staticmethod
+    def _looks_like_log(text: str) -> bool:
+        """Heuristic: most of the first lines start with a timestamp or level."""
+        lines = [line for line in text[:20_000].splitlines()[:50] if line.strip()]
+        if len(lines) < 10:
+            return False
+        pattern = re.compile(r'^\s*(?:\[?\d{2,4}[-/:]\d{2}|\[?(?:DEBUG|INFO|WARN|WARNING|ERROR|TRACE|FATAL)\b)')
+        return sum(1 for line in lines if pattern.match(line)) >= len(lines) * 0.6
+
+    @staticmethod
+    def _dedup_log_lines(text: str) -> Tuple[str, Optional[str]]:
+        """Collapse consecutive lines that only differ in numbers/timestamps.
+
+        Returns:
+            Tuple of (text, note) - note is None if nothing was removed
+        """
+        output: List[str] = []
+        removed = 0
+        previous_key = None
+        repeats = 0
+
+        def flush():
+            if repeats:
+                output.append(f"    ... (previous line repeated {repeats} more times)")
+
+        for line in _iter_lines(text):
+            key = _LOG_NOISE_PATTERN.sub('#', line).strip()
+            if key == previous_key:
+                repeats += 1
+                removed += 1
+                continue
+            flush()
+            repeats = 0
+            previous_key = key
+            output.append(line)
+        flush()
+
+        if not removed:
+            return text, None
+        return "\n".join(output), f"{removed} repeated log lines"
+
+    def _trim_code_bodies(self, text: str) -> Tuple[str, Optional[str]]:
+        """Elide the largest code bodies until the text fits the budget.
+
+        Bodies are the runs of lines between declarations (see
+        _outline_code); smaller bodies are kept verbatim.
+
+        Returns:
+            Tuple of (text, note) - note is None if the text only fits with
+            every body elided (the outline does that)
+        """
+        # (is_body, start, end) offsets of runs of declaration / body lines
+        runs: List[List[Any]] = []
+        start = 0
+        length = len(text)
+        while start < length:
+            end = text.find("\n", start)
+            end = length if end < 0 else end + 1
+            is_body = not _OUTLINE_PATTERN.match(text[start:end])
+            if runs and runs[-1][0] == is_body:
+                runs[-1][2] = end
+            else:
+                runs.append([is_body, start, end])
+            start = end
+
+        costs = [estimate_tokens(text[run_start:run_end]) for _, run_start, run_end in runs]
+        bodies = sorted((i for i, run in enumerate(runs) if run[0] and costs[i]),
+                        key=lambda i: costs[i], reverse=True)
+        total = sum(costs)
+        elided = set()
+        for i in bodies:
+            if total <= self.max_tokens:
+                break
+            total -= costs[i] - _ELISION_TOKENS
+            elided.add(i)
+        if not elided or total > self.max_tokens or len(elided) == len(bodies):
+            return text, None
+
+        output: List[str] = []
+        removed = 0
+        for i, (_, run_start, run_end) in enumerate(runs):
+            body = text[run_start:run_end]
+            if i not in elided:
+                output.append(body)
+                continue
+            lines = [line for line in body.splitlines() if line.strip()]
+            removed += len(lines)
+            indent = lines[0][:len(lines[0]) - len(lines[0].lstrip())]
+            blank = "\n" if body.endswith("\n\n") else ""  # Keep the gap before the next declaration
+            output.append(f"{indent}# ... {len(lines)} lines elided\n{blank}")
+
+        return "".join(output), f"{removed} lines from the {len(elided)} largest code bodies"
+
+    @staticmethod
+    def _outline_code(text: str) -> Tuple[str, Optional[str]]:
+        """Keep imports, decorators and declarations; elide everything else.
+
+        Returns:
+            Tuple of (text, note) - note is None if nothing was removed
+        """
+        output: List[str] = []
+        elided = 0
+        removed = 0
+
+        for line in _iter_lines(text):
+            if _OUTLINE_PATTERN.match(line):
+                if elided:
+                    output.append(f"    # ... {elided} lines elided")
+                    elided = 0
+                output.append(line)
+            elif line.strip():
+                elided += 1
+                removed += 1
+        if elided:
+            output.append(f"    # ... {elided} lines elided")
+
+        if not removed or not output:
+            return text, None
+        return "\n".join(output), f"{removed} lines of code bodies (outline kept)"
+
+    def _head_tail_window(self, text: str, tokens: int) -> Tuple[str, str]:
+        """Keep the beginning and the end of the text within the budget.
+
+        The window is sized from the average tokens per line (or character);
+        when the kept parts are denser than average it is re-estimated and
+        shrunk until it fits.
+
+        Args:
+            text: Text to cut
+            tokens: Estimated tokens of text
+
+        Returns:
+            Tuple of (text, note)
+        """
+        # Whole lines first; by characters if a few long lines do not fit
+        for by_lines in (True, False):
+            target = self.max_tokens - 20  # Room for the marker
+            for _ in range(16):
+                window, note = self._cut_window(text, tokens, target, by_lines)
+                window_tokens = estimate_tokens(window)
+                if window_tokens <= self.max_tokens:
+                    return window, note
+                if target <= 0:
+                    break
+                # Shrink by the overshoot (and proportionally, for large overshoots)
+                target = min(target - (window_tokens - self.max_tokens),
+                             int(target * self.max_tokens / window_tokens)) - 1
+        return window, note
+
+    def _cut_window(self, text: str, tokens: int, target: int, by_lines: bool = True) -> Tuple[str, str]:
+        """Cut the middle of the text, keeping about target tokens.
+
+        Args:
+            text: Text to cut
+            tokens: Estimated tokens of text
+            target: Tokens to keep (marker excluded)
+            by_lines: Cut at line boundaries when the text has enough lines
+
+        Returns:
+            Tuple of (text, note)
+        """
+        target = max(target, 0)
+        body = text[:-1] if text.endswith("\n") else text
+        line_count = body.count("\n") + 1
+        # Scale by average tokens per line
+        per_line = max(tokens / line_count, 1e-6)
+        keep = max(int(target / per_line), 2)
+        head = int(keep * self.head_ratio)
+        tail = keep - head
+
+        if by_lines and line_count > keep:
+            # Offsets of the end of the head and the start of the tail
+            head_end = -1
+            for _ in range(head):
+                head_end = body.find("\n", head_end + 1)
+            tail_start = len(body)
+            for _ in range(tail):
+                tail_start = body.rfind("\n", 0, tail_start)
+
+            omitted = line_count - keep
+            marker = f"\n... [{omitted} lines omitted to fit the input budget] ...\n"
+            return (
+                body[:max(head_end, 0)] + marker + body[tail_start + 1:],
+                f"{omitted} lines from the middle"
+            )
+
+        # Few, very long lines - cut by characters instead
+        chars = int(len(text) * target / tokens)
+        head_chars = int(chars * self.head_ratio)
+        tail_chars = chars - head_chars
+        omitted = len(text) - chars
+        marker = f"\n... [{omitted} characters omitted to fit the input budget] ...\n"
+        return text[:head_chars] + marker + text[len(text) - tail_chars:], f"{omitted} characters from the middle"
+
+
+def benchmark_input_budget(size_mb: int = 50) -> Dict[str, float]:
+    """Measure time and peak memory of budgeting a large input.
+
+    Args:
+        size_mb: Size of the synthetic input (a log-like selection)
+
+    Returns:
+        Dictionary with seconds, peak traced MB and final tokens
+    """
+    import logging
+    import time
+    import tracemalloc
+    from core.input_strategy import InputType
+
+    line = "2024-05-01 10:00:00 INFO handler processed request id={} status=ok value=abcdef\n"
+    text = "".join(line.format(i) if i % 5 else f"step {i} of the migration\n" for i in range(size_mb * 13_000))
+
+    logging.disable(logging.INFO)
+    try:
+        content = InputContent(input_type=InputType.TEXT_SELECTION, text=text)
+        start = time.perf_counter()
+        InputBudget().apply(content)
+        seconds = time.perf_counter() - start
+
+        # Memory used on top of the input itself
+        tracemalloc.start()
+        InputBudget().apply(InputContent(input_type=InputType.TEXT_SELECTION, text=text))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {
+        "input_mb": size_mb,
+        "seconds": seconds,
+        "peak_traced_mb": peak / (1024 * 1024),
+        "final_tokens": content.metadata["input_budget"]["final_tokens"],
+    }
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_input_budget().items():
+        print(f"{name:<16} {value:10.2f}")
@@ -3,20 +3,31 @@
 Manages multiple input strategies and selects appropriate one.
 """
 
-from typing import Optional, List, Dict
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
 from core.input_strategy import InputStrategy, InputType, InputContent
+from core.input_budget import BudgetReport, InputBudget
+from core.clipboard_snapshot import ClipboardSnapshot, ClipboardBackend
+from core.clipboard_monitor import ClipboardMonitor
 from core.input_strategies import (
     TextSelectionStrategy,
     FileUploadStrategy,
     ClipboardImageStrategy,
     ScreenshotStrategy,
     SelectedTextStrategy,
-    VSCodeActiveFileStrategy
+    VSCodeActiveFileStrategy,
+    GitDiffStrategy,
+    LogTailStrategy
 )
 from utils.logger import setup_logger
 
 logger = setup_logger('InputManager')
 
+# Probe modes for auto-detection
+PROBE_SEQUENTIAL = "sequential"  # Check strategies one by one in priority order
+PROBE_CONCURRENT = "concurrent"  # Check all strategies at once, pick by priority
+
 
 class InputManager:
     """Manages input strategies for AgentClick.
@@ -28,20 +39,58 @@ class InputManager:
     1. Text selection (fastest, most common)
     2. File upload (if file configured)
     3. Clipboard image (if image in clipboard)
-    4. Screenshot (always available but requires action)
+    4. Git diff (if the context folder has uncommitted changes)
+    5. Log tail (if a log file is configured and has new lines)
+    6. Screenshot (always available but requires action)
+
+    In concurrent probe mode the availability checks run in parallel on a
+    small thread pool; checks slower than probe_budget are ignored.
+
+    capture_composite() captures several sources in one activation (e.g.
+    selected text + screenshot + VSCode file), all at the same time.
     """
 
-    def __init__(self):
-        """Initialize input manager with all strategies."""
+    def __init__(
+        self,
+        budget: Optional[InputBudget] = None,
+        clipboard_backend: Optional[ClipboardBackend] = None,
+        probe_mode: str = PROBE_CONCURRENT,
+        probe_budget: float = 0.5,
+        probe_workers: int = 4,
+        composite_budget: float = 3.0
+    ):
+        """Initialize input manager with all strategies.
+
+        Args:
+            budget: Optional token budget applied to captured text
+            clipboard_backend: Optional clipboard backend (cached system clipboard by default)
+            probe_mode: PROBE_CONCURRENT or PROBE_SEQUENTIAL
+            probe_budget: Seconds to wait for concurrent availability checks
+            probe_workers: Threads used for concurrent availability checks
+            composite_budget: Seconds to wait for the sources of a composite capture
+        """
         self.strategies: List[InputStrategy] = [
             TextSelectionStrategy(),
             SelectedTextStrategy(),  # NOVO: Mouse selection without clipboard
             VSCodeActiveFileStrategy(),  # NOVO: Reads active file from VSCode
             FileUploadStrategy(),  # Will be configured when file is dropped
             ClipboardImageStrategy(),
-            ScreenshotStrategy()
+            ScreenshotStrategy(),
+            GitDiffStrategy(),  # Configured with the agent context folder
+            LogTailStrategy()  # Configured with the agent log file
         ]
         self.active_strategy: Optional[InputStrategy] = None
+        self.budget = budget or InputBudget()
+        self.clipboard_backend = clipboard_backend or ClipboardMonitor(ClipboardBackend())
+        self.probe_mode = probe_mode
+        self.probe_budget = probe_budget
+        self.probe_workers = probe_workers
+        self.composite_budget = composite_budget
+        self.probe_latencies: Dict[InputType, Optional[float]] = {}  # None = exceeded budget
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
+        self._capture_executor: Optional[ThreadPoolExecutor] = None
+        # Probes/captures still running past their budget (threads cannot be cancelled)
+        self._stragglers: Dict[Tuple[str, InputType], Future] = {}
         self.logger = logger
 
         self.logger.info(f"InputManager initialized with {len(self.strategies)} strategies")
@@ -67,6 +116,33 @@ class InputManager:
             - If fallback is True and preferred fails: tries other strategies
             - If no preferred_type: auto-detects best available input
             - NOVO: If allowed_inputs specified, only consider those types
+            - Captured text is reduced to fit the input budget
+            - The clipboard is read at most once per format for the whole call
+        """
+        # One clipboard snapshot per activation, shared by all strategies
+        snapshot = ClipboardSnapshot(self.clipboard_backend)
+        try:
+            return self._capture_with_snapshot(preferred_type, fallback, allowed_inputs, snapshot)
+        finally:
+            snapshot.close()
+
+    def _capture_with_snapshot(
+        self,
+        preferred_type: Optional[InputType],
+        fallback: bool,
+        allowed_inputs: Optional[list[str]],
+        snapshot: ClipboardSnapshot
+    ) -> Optional[InputContent]:
+        """Capture input, reading the clipboard through the given snapshot.
+
+        Args:
+            preferred_type: Optional preferred input type to use first
+            fallback: If True and preferred_type fails, try other strategies
+            allowed_inputs: Optional list of allowed input types to filter
+            snapshot: Clipboard snapshot of this activation
+
+        Returns:
+            InputContent or None if no input available
         """
         # If preferred type specified, try that first
         if preferred_type:
@@ -75,10 +151,11 @@ class InputManager:
                 self.logger.warning(f"Preferred input type {preferred_type.value} not in allowed inputs")
                 return None
 
-            content = self._try_strategy_by_type(preferred_type)
+            content = self._try_strategy_by_type(preferred_type, snapshot)
             if content:
                 self.active_strategy = self._get_strategy_by_type(preferred_type)
                 self.logger.info(f"✅ Captured input using preferred: {preferred_type.value}")
+                self.budget.apply(content)
                 return content
             elif not fallback:
                 self.logger.warning(f"Preferred input type {preferred_type.value} not available")
@@ -91,6 +168,8 @@ class InputManager:
             InputType.VSCODE_ACTIVE_FILE,  # NOVO: Try VSCode active file before file upload
             InputType.FILE_UPLOAD,
             InputType.CLIPBOARD_IMAGE,
+            InputType.GIT_DIFF,  # Only when a context folder in a git repository is set
+            InputType.LOG_TAIL,  # Only when a log file is set
         ]
 
         # NOVO: Filter by allowed inputs if specified
@@ -98,31 +177,295 @@ class InputManager:
             priority_order = [t for t in priority_order if t.value in allowed_inputs]
             self.logger.debug(f"Filtered priority order by allowed inputs: {[t.value for t in priority_order]}")
 
+        if self.probe_mode == PROBE_CONCURRENT and len(priority_order) > 1:
+            available = self._probe_concurrently(priority_order, snapshot)
+            for input_type in available:
+                content = self._get_strategy_by_type(input_type).capture_input(snapshot=snapshot)
+                if content:
+                    self.active_strategy = self._get_strategy_by_type(input_type)
+                    self.logger.info(f"✅ Auto-detected input: {input_type.value}")
+                    self.budget.apply(content)
+                    return content
+
+            self.logger.warning("⚠️  No input available from any source")
+            return None
+
         for input_type in priority_order:
-            content = self._try_strategy_by_type(input_type)
+            content = self._try_strategy_by_type(input_type, snapshot)
             if content:
                 self.active_strategy = self._get_strategy_by_type(input_type)
                 self.logger.info(f"✅ Auto-detected input: {input_type.value}")
+                self.budget.apply(content)
                 return content
 
         self.logger.warning("⚠️  No input available from any source")
         return None
 
-    def _try_strategy_by_type(self, input_type: InputType) -> Optional[InputContent]:
+    def capture_composite(self, sources: List[InputType]) -> Optional[InputContent]:
+        """Capture several input sources at once and combine them.
+
+        Sources are captured concurrently; sources that are unavailable, fail
+        or are still running after composite_budget are left out. The token
+        budget is shared evenly by the text of the captured sources.
+
+        Args:
+            sources: Input types to capture, in the order they are presented
+
+        Returns:
+            COMPOSITE InputContent with one part per captured source, or None
+            if no source could be captured
+        """
+        sources = [s for s in sources if s != InputType.COMPOSITE and self._get_strategy_by_type(s)]
+        if not sources:
+            self.logger.warning("No sources configured for composite input")
+            return None
+
+        snapshot = ClipboardSnapshot(self.clipboard_backend)
+        try:
+            return self._capture_composite_with_snapshot(sources, snapshot)
+        finally:
+            snapshot.close()
+
+    def _capture_composite_with_snapshot(self, sources: List[InputType],
+                                         snapshot: ClipboardSnapshot) -> Optional[InputContent]:
+        """Capture composite input, reading the clipboard through the given snapshot.
+
+        Args:
+            sources: Input types to capture
+            snapshot: Clipboard snapshot of this activation
+
+        Returns:
+            COMPOSITE InputContent or None
+        """
+        # Read the clipboard before Ctrl+C (selected text) can change it
+        snapshot.prefetch(
+            text=InputType.TEXT_SELECTION in sources,
+            image=InputType.CLIPBOARD_IMAGE in sources
+        )
+
+        if self._capture_executor is None:
+            # Own pool, one thread per source: probe stragglers cannot delay captures
+            self._capture_executor = ThreadPoolExecutor(
+                max_workers=len(self.strategies),
+                thread_name_prefix="InputCapture"
+            )
+
+        def capture(strategy: InputStrategy) -> Optional[InputContent]:
+            # Selected text copies with Ctrl+C and may invalidate its snapshot
+            snap = snapshot
+            if strategy.get_input_type() == InputType.SELECTED_TEXT:
+                snap = ClipboardSnapshot(self.clipboard_backend)
+            try:
+                if strategy.is_available(snapshot=snap):
+                    return strategy.capture_input(snapshot=snap)
+            except Exception as e:
+                self.logger.error(f"Error capturing {strategy.get_input_type().value}: {e}")
+            return None
+
+        start = time.perf_counter()
+        futures = {}
+        for input_type in sources:
+            if self._is_straggling("capture", input_type):
+                self.logger.warning(f"Source {input_type.value} still busy from a previous capture - skipped")
+                continue
+            futures[input_type] = self._capture_executor.submit(capture, self._get_strategy_by_type(input_type))
+        wait(futures.values(), timeout=self.composite_budget)
+
+        parts = []
+        for input_type, future in futures.items():
+            if not future.done():
+                self._stragglers[("capture", input_type)] = future
+                self.logger.warning(f"Source {input_type.value} exceeded {self.composite_budget:.1f}s budget - skipped")
+                continue
+            content = future.result()
+            if content:
+                parts.append(content)
+
+        if not parts:
+            self.logger.warning("⚠️  No input available from any composite source")
+            return None
+
+        # Share the token budget between the text sources
+        text_parts = [p for p in parts if p.text]
+        reports = []
+        if text_parts:
+            part_budget = InputBudget(
+                max_tokens=self.budget.max_tokens // len(text_parts),
+                head_ratio=self.budget.head_ratio
+            )
+            for part in text_parts:
+                report = part_budget.apply(part)
+                if report:
+                    reports.append((part.input_type, report))
+
+        # Every image reaches the agent (get_image_paths); image_path is the first one
+        images = [p.image_path for p in parts if p.image_path]
+        metadata = {
+            "sources": [p.input_type.value for p in parts],
+            "missing_sources": [t.value for t in sources if t not in {p.input_type for p in parts}],
+            "capture_ms": round((time.perf_counter() - start) * 1000, 1)
+        }
+        if reports:
+            metadata["input_budget"] = self._combine_budget_reports(reports)
+        content = InputContent(
+            input_type=InputType.COMPOSITE,
+            text="\n\n".join(p.text for p in text_parts) or None,
+            file_path=next((p.file_path for p in parts if p.file_path), None),
+            image_path=images[0] if images else None,
+            metadata=metadata,
+            parts=parts
+        )
+        self.active_strategy = None
+        self.logger.info(
+            f"✅ Composite input: {', '.join(content.metadata['sources'])} "
+            f"in {content.metadata['capture_ms']:.0f}ms"
+        )
+        return content
+
+    def _combine_budget_reports(self, reports: List[Tuple[InputType, BudgetReport]]) -> Dict[str, Any]:
+        """Merge the budget reports of composite parts into one.
+
+        Args:
+            reports: (source type, report) of each text part
+
+        Returns:
+            Report dictionary like InputContent.metadata["input_budget"]
+        """
+        combined = BudgetReport(
+            original_tokens=sum(r.original_tokens for _, r in reports),
+            final_tokens=sum(r.final_tokens for _, r in reports),
+            max_tokens=self.budget.max_tokens
+        )
+        for input_type, report in reports:
+            for strategy in report.strategies:
+                if strategy not in combined.strategies:
+                    combined.strategies.append(strategy)
+            combined.dropped.extend(f"{input_type.value}: {note}" for note in report.dropped)
+        return combined.to_dict()
+
+    def _try_strategy_by_type(self, input_type: InputType, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Try to capture input using strategy of specified type.
 
         Args:
             input_type: Type of input to try
+            snapshot: Clipboard snapshot of the current activation
 
         Returns:
             InputContent or None
         """
         for strategy in self.strategies:
             if strategy.get_input_type() == input_type:
-                if strategy.is_available():
-                    return strategy.capture_input()
+                if strategy.is_available(snapshot=snapshot):
+                    return strategy.capture_input(snapshot=snapshot)
         return None
 
+    def _probe_concurrently(self, priority_order: List[InputType], snapshot: ClipboardSnapshot) -> List[InputType]:
+        """Run availability checks in parallel.
+
+        Checks still running after probe_budget are ignored (they finish in
+        the background and their result is discarded); a check is not
+        started again until its straggler has finished.
+
+        Args:
+            priority_order: Input types to probe, highest priority first
+            snapshot: Clipboard snapshot of the current activation
+
+        Returns:
+            Available input types, highest priority first
+        """
+        if self._probe_executor is None:
+            self._probe_executor = ThreadPoolExecutor(
+                max_workers=self.probe_workers,
+                thread_name_prefix="InputProbe"
+            )
+
+        def probe(strategy: InputStrategy):
+            start = time.perf_counter()
+            try:
+                available = strategy.is_available(snapshot=snapshot)
+            except Exception as e:
+                self.logger.error(f"Error probing {strategy.get_input_type().value}: {e}")
+                available = False
+            return available, time.perf_counter() - start
+
+        futures = {}
+        for input_type in priority_order:
+            strategy = self._get_strategy_by_type(input_type)
+            if not strategy:
+                continue
+            if self._is_straggling("probe", input_type):
+                # Its previous probe still holds a thread - do not queue another behind it
+                self.probe_latencies[input_type] = None
+                self.logger.warning(f"Probe {input_type.value} still busy from a previous activation - skipped")
+                continue
+            futures[input_type] = self._probe_executor.submit(probe, strategy)
+
+        wait(futures.values(), timeout=self.probe_budget)
+
+        available = []
+        for input_type, future in futures.items():
+            if not future.done():
+                self._stragglers[("probe", input_type)] = future
+                self.probe_latencies[input_type] = None
+                self.logger.warning(f"Probe {input_type.value} exceeded {self.probe_budget:.2f}s budget - skipped")
+                continue
+
+            is_available, latency = future.result()
+            self.probe_latencies[input_type] = latency
+            if is_available:
+                available.append(input_type)
+
+        self.logger.debug(
+            "Probe latencies: " + ", ".join(
+                f"{t.value}={'timeout' if l is None else f'{l * 1000:.1f}ms'}"
+                for t, l in self.probe_latencies.items() if t in futures
+            )
+        )
+        return available
+
+    def commit_input(self, content: Optional[InputContent]) -> None:
+        """Tell the strategies that captured input was used by the agent.
+
+        Args:
+            content: Captured input (composite parts are committed one by one)
+        """
+        if content is None:
+            return
+        for part in content.parts or [content]:
+            strategy = self._get_strategy_by_type(part.input_type)
+            if strategy is not None:
+                try:
+                    strategy.commit(part)
+                except Exception as e:
+                    self.logger.error(f"Error committing {part.input_type.value} input: {e}")
+
+    def _is_straggling(self, kind: str, input_type: InputType) -> bool:
+        """Check if a probe/capture of input_type is still running past its budget.
+
+        Args:
+            kind: "probe" or "capture"
+            input_type: Input type
+
+        Returns:
+            True if the previous call has not finished yet
+        """
+        future = self._stragglers.get((kind, input_type))
+        if future is None:
+            return False
+        if future.done():
+            del self._stragglers[(kind, input_type)]
+            return False
+        return True
+
+    def shutdown(self) -> None:
+        """Stop the probe and capture thread pools."""
+        for executor in (self._probe_executor, self._capture_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self._probe_executor = None
+        self._capture_executor = None
+        self._stragglers.clear()
+
     def _get_strategy_by_type(self, input_type: InputType) -> Optional[InputStrategy]:
         """Get strategy instance by type.
 
@@ -137,18 +480,53 @@ class InputManager:
                 return strategy
         return None
 
-    def set_file_upload(self, file_path: str) -> None:
+    def set_file_upload(self, file_path: str, line_range: Optional[tuple] = None) -> None:
         """Configure file upload strategy.
 
         Args:
             file_path: Path to file to upload
+            line_range: Optional (first, last) lines to read (1-based, inclusive)
         """
         for strategy in self.strategies:
             if isinstance(strategy, FileUploadStrategy):
-                strategy.set_file(file_path)
+                strategy.set_file(file_path, line_range)
                 self.logger.info(f"📎 File upload configured: {file_path}")
                 break
 
+    def set_files_upload(self, paths: List[str]) -> None:
+        """Configure file upload strategy with several files/folders (one bundle).
+
+        Args:
+            paths: Dropped file and folder paths
+        """
+        for strategy in self.strategies:
+            if isinstance(strategy, FileUploadStrategy):
+                strategy.set_files(paths)
+                self.logger.info(f"📎 File bundle configured: {len(paths)} items")
+                break
+
+    def set_git_repository(self, folder: Optional[str]) -> None:
+        """Configure the git diff strategy with the agent context folder.
+
+        Args:
+            folder: Folder inside a git repository (None to clear)
+        """
+        for strategy in self.strategies:
+            if isinstance(strategy, GitDiffStrategy):
+                strategy.set_repository(folder)
+                break
+
+    def set_log_file(self, log_file: Optional[str]) -> None:
+        """Configure the log tail strategy with the agent log file.
+
+        Args:
+            log_file: Path to the log file (None to clear)
+        """
+        for strategy in self.strategies:
+            if isinstance(strategy, LogTailStrategy):
+                strategy.set_log_file(log_file)
+                break
+
     def clear_file_upload(self) -> None:
         """Clear configured file upload."""
         for strategy in self.strategies:
@@ -157,11 +535,13 @@ class InputManager:
                 self.logger.info("File upload cleared")
                 break
 
-    def take_screenshot(self, region: Optional[tuple] = None) -> Optional[InputContent]:
+    def take_screenshot(self, region: Optional[tuple] = None,
+                        region_description: str = "region") -> Optional[InputContent]:
         """Take screenshot.
 
         Args:
             region: Optional (left, top, width, height) for partial screenshot
+            region_description: What the region shows (e.g. "active window")
 
         Returns:
             InputContent with screenshot or None if failed
@@ -176,7 +556,7 @@ class InputManager:
         for strategy in self.strategies:
             if isinstance(strategy, ScreenshotStrategy):
                 self.logger.info("📸 Taking screenshot...")
-                content = strategy.capture_input(region=region)
+                content = strategy.capture_input(region=region, region_description=region_description)
                 if content:
                     self.active_strategy = strategy
                 return content
@@ -199,8 +579,10 @@ class InputManager:
             Dictionary mapping InputType to availability boolean
         """
         availability = {}
+        snapshot = ClipboardSnapshot(self.clipboard_backend)
         for strategy in self.strategies:
-            availability[strategy.get_input_type()] = strategy.is_available()
+            availability[strategy.get_input_type()] = strategy.is_available(snapshot=snapshot)
+        snapshot.close()
         return availability
 
     def get_status_summary(self) -> str:
@@ -9,6 +9,8 @@ from .clipboard_image_strategy import ClipboardImageStrategy
 from .screenshot_strategy import ScreenshotStrategy
 from .selected_text_strategy import SelectedTextStrategy
 from .vscode_active_file_strategy import VSCodeActiveFileStrategy
+from .git_diff_strategy import GitDiffStrategy
+from .log_tail_strategy import LogTailStrategy
 
 __all__ = [
     'TextSelectionStrategy',
@@ -16,5 +18,7 @@ __all__ = [
     'ClipboardImageStrategy',
     'ScreenshotStrategy',
     'SelectedTextStrategy',
-    'VSCodeActiveFileStrategy'
+    'VSCodeActiveFileStrategy',
+    'GitDiffStrategy',
+    'LogTailStrategy'
 ]
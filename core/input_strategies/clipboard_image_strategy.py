@@ -3,11 +3,14 @@
 Captures images copied to clipboard.
 """
 
+import io
 from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from core.image_dedup import dhash, get_image_dedup_index, probe_image
+from core.image_pipeline import get_image_encoder
+from core.image_store import ImageStore, get_image_store
 from pathlib import Path
 from typing import Optional
-import tempfile
-from datetime import datetime
 from utils.logger import setup_logger
 
 logger = setup_logger('ClipboardImageStrategy')
@@ -17,14 +20,23 @@ class ClipboardImageStrategy(InputStrategy):
     """Strategy for clipboard image input.
 
     User copies image to clipboard (Ctrl+C on image in browser,
-    file explorer, screenshot tool, etc.).
+    file explorer, screenshot tool, etc.). Near-identical images reuse the
+    file stored for an earlier clipboard image or screenshot.
     """
 
-    def __init__(self):
-        """Initialize clipboard image strategy."""
-        self.temp_dir = Path(tempfile.gettempdir()) / "agent_click_images"
-        self.temp_dir.mkdir(exist_ok=True)
+    def __init__(self, deduplicate: bool = True, store: Optional[ImageStore] = None):
+        """Initialize clipboard image strategy.
+
+        Args:
+            deduplicate: Reuse the stored file of a near-identical image
+            store: Image store (shared store by default)
+        """
+        self.store = store or get_image_store()
+        self.temp_dir = self.store.root
         self.captured_image_path: Optional[str] = None
+        self._captured_image = None  # Clipboard image saved at captured_image_path
+        self._captured_digest = None  # Pixel digest (Future) of _captured_image
+        self.deduplicate = deduplicate
         self.logger = logger
 
         self.logger.debug(f"Temp directory: {self.temp_dir}")
@@ -33,9 +45,12 @@ class ClipboardImageStrategy(InputStrategy):
         """Return input type."""
         return InputType.CLIPBOARD_IMAGE
 
-    def capture_input(self) -> Optional[InputContent]:
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Capture image from clipboard.
 
+        Args:
+            snapshot: Optional clipboard snapshot of the current activation
+
         Returns:
             InputContent with saved image path or None if no image in clipboard
 
@@ -44,10 +59,8 @@ class ClipboardImageStrategy(InputStrategy):
             Supports PNG, JPEG, and other image formats.
         """
         try:
-            from PIL import ImageGrab
-
             # Check if clipboard has image
-            clipboard_content = ImageGrab.grabclipboard()
+            clipboard_content = (snapshot or ClipboardSnapshot()).image
 
             if clipboard_content is None:
                 self.logger.debug("No content in clipboard")
@@ -58,55 +71,75 @@ class ClipboardImageStrategy(InputStrategy):
                 self.logger.debug("Clipboard does not contain image")
                 return None
 
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            image_path = self.temp_dir / f"clipboard_{timestamp}.png"
-
-            # Save image
-            clipboard_content.save(image_path, "PNG")
-            self.captured_image_path = str(image_path)
-
-            file_size = image_path.stat().st_size
-
-            self.logger.info(
-                f"Image captured from clipboard: {image_path.name} ({file_size} bytes)"
-            )
+            duplicate = None
+            if (clipboard_content is self._captured_image and self.captured_image_path
+                    and Path(self.captured_image_path).exists()):
+                # Same (cached) clipboard image as last time - reuse the saved file
+                image_path = Path(self.captured_image_path)
+                self.store.touch(image_path)
+                self.logger.info(f"Clipboard unchanged - reusing {image_path.name}")
+                pixel_digest = self._captured_digest
+            else:
+                index = get_image_dedup_index() if self.deduplicate else None
+                image_size = (clipboard_content.width, clipboard_content.height)
+                probe = probe_image(clipboard_content) if index else None
+                image_hash = dhash(probe) if index else None
+                duplicate = index.find(image_hash, image_size, probe) if index else None
+
+                if duplicate:
+                    # Near-identical to a stored image (e.g. a screenshot just taken)
+                    image_path = Path(self.store.resolve(duplicate.path))
+                    self.store.touch(image_path)
+                else:
+                    # Name the file by its encoded bytes - an identical image reuses it
+                    buffer = io.BytesIO()
+                    clipboard_content.save(buffer, "PNG")
+                    image_path = self.store.store_bytes("clipboard", buffer.getvalue(), ".png")
+                    if index:
+                        index.add(image_hash, str(image_path), InputType.CLIPBOARD_IMAGE.value, image_size, probe)
+
+                    self.logger.info(f"Image captured from clipboard: {image_path.name}")
+
+                # Exact content hash (background): agent results are only reused for exact duplicates
+                pixel_digest = get_image_encoder().digest(clipboard_content)
+
+                self.captured_image_path = str(image_path)
+                self._captured_image = clipboard_content
+                self._captured_digest = pixel_digest
+
+            # A reused screenshot may still be encoding
+            file_size = image_path.stat().st_size if image_path.exists() else None
 
             return InputContent(
                 input_type=InputType.CLIPBOARD_IMAGE,
                 text="[Image captured from clipboard - ready for visual analysis]",
                 image_path=str(image_path),
                 metadata={
-                    "image_format": "PNG",
+                    "image_format": image_path.suffix.lstrip('.').upper(),
                     "saved_path": str(image_path),
                     "file_size": file_size,
                     "width": clipboard_content.width if hasattr(clipboard_content, 'width') else None,
-                    "height": clipboard_content.height if hasattr(clipboard_content, 'height') else None
+                    "height": clipboard_content.height if hasattr(clipboard_content, 'height') else None,
+                    "duplicate_of": duplicate.path if duplicate else None,
+                    "pixel_digest": pixel_digest
                 }
             )
 
-        except ImportError:
-            self.logger.error("PIL not installed - install with: pip install Pillow")
-            return None
-
         except Exception as e:
             self.logger.error(f"Error capturing clipboard image: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Check if image is available in clipboard.
 
+        Args:
+            snapshot: Optional clipboard snapshot of the current activation
+
         Returns:
             True if clipboard contains image
         """
         try:
-            from PIL import ImageGrab
-
-            clipboard_content = ImageGrab.grabclipboard()
-            return clipboard_content is not None and hasattr(clipboard_content, 'save')
-
-        except ImportError:
-            return False
+            return (snapshot or ClipboardSnapshot()).has_image()
 
         except Exception:
             return False
@@ -4,52 +4,96 @@ Allows user to upload files for processing.
 """
 
 from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from core.file_reader import read_text_file
+from core.file_bundle import build_bundle
 from pathlib import Path
-from typing import Optional
-import os
+from typing import List, Optional, Tuple
 from utils.logger import setup_logger
 
 logger = setup_logger('FileUploadStrategy')
 
+# Files larger than this are read as head + tail only (the input budget
+# would drop the middle anyway)
+DEFAULT_MAX_READ_BYTES = 2 * 1024 * 1024
+
 
 class FileUploadStrategy(InputStrategy):
     """Strategy for file upload input.
 
     User can drag file to mini popup or select from VSCode.
     Supports text files, code files, JSON, YAML, etc.
+
+    Files are read once through core.file_reader (encoding sniffed, cached
+    while unchanged): only the requested line range, or the head and tail
+    of files larger than max_read_bytes, is decoded.
+
+    Several files or a folder are captured as one bundle (core.file_bundle).
     """
 
-    def __init__(self, file_path: Optional[str] = None):
+    def __init__(self, file_path: Optional[str] = None,
+                 max_read_bytes: int = DEFAULT_MAX_READ_BYTES):
         """Initialize file upload strategy.
 
         Args:
             file_path: Optional pre-configured file path
+            max_read_bytes: Larger files are read as head + tail only
         """
         self.file_path = file_path
+        self.line_range: Optional[Tuple[int, Optional[int]]] = None
+        self.bundle_paths: Optional[List[str]] = None  # Files/folders captured as one bundle
+        self.max_read_bytes = max_read_bytes
         self.logger = logger
 
     def get_input_type(self) -> InputType:
         """Return input type."""
         return InputType.FILE_UPLOAD
 
-    def set_file(self, file_path: str) -> None:
+    def set_file(self, file_path: str, line_range: Optional[Tuple[int, Optional[int]]] = None) -> None:
         """Set file to upload.
 
         Args:
             file_path: Path to file
+            line_range: Optional (first, last) lines to read, 1-based and
+                        inclusive (last None = end of file)
         """
         self.file_path = file_path
-        self.logger.info(f"File configured: {file_path}")
+        self.line_range = line_range
+        self.bundle_paths = None
+        self.logger.info(f"File configured: {file_path}" + (f" lines {line_range}" if line_range else ""))
+
+    def set_files(self, paths: List[str]) -> None:
+        """Set several files and/or folders to upload as one bundle.
 
-    def capture_input(self) -> Optional[InputContent]:
+        A single file is configured like set_file().
+
+        Args:
+            paths: File and folder paths
+        """
+        if len(paths) == 1 and Path(paths[0]).is_file():
+            self.set_file(paths[0])
+            return
+        self.file_path = None
+        self.line_range = None
+        self.bundle_paths = list(paths)
+        self.logger.info(f"Bundle configured: {len(paths)} dropped items")
+
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Capture file content.
 
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
         Returns:
             InputContent with file content or None if file not available
 
         Note:
             Only reads text files. Binary files will be skipped.
+            Large files are read as head + tail (see max_read_bytes).
         """
+        if self.bundle_paths:
+            return self._capture_bundle()
+
         if not self.file_path:
             self.logger.warning("No file path configured")
             return None
@@ -65,16 +109,22 @@ class FileUploadStrategy(InputStrategy):
             return None
 
         try:
-            # Try to read as text file
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            file_size = os.path.getsize(self.file_path)
+            decoded = read_text_file(self.file_path, self.max_read_bytes, self.line_range)
+            if decoded is None:
+                self.logger.error(
+                    f"Binary file detected (not supported): {self.file_path}"
+                )
+                return None
+
+            content = decoded.text
+            file_size = decoded.size
+            omitted_lines = decoded.omitted_lines
             file_ext = file_path_obj.suffix
             file_name = file_path_obj.name
 
             self.logger.info(
                 f"File loaded: {file_name} ({file_size} bytes, {len(content)} chars)"
+                + (f", {omitted_lines} lines not read" if omitted_lines else "")
             )
 
             return InputContent(
@@ -86,27 +136,29 @@ class FileUploadStrategy(InputStrategy):
                     "file_size": file_size,
                     "extension": file_ext,
                     "char_count": len(content),
-                    "line_count": len(content.split('\n'))
+                    "line_count": decoded.line_count,
+                    "encoding": decoded.encoding,
+                    "line_range": self.line_range,
+                    "omitted_lines": omitted_lines
                 }
             )
 
-        except UnicodeDecodeError:
-            # Binary file - cannot process as text
-            self.logger.error(
-                f"Binary file detected (not supported): {self.file_path}"
-            )
-            return None
-
         except Exception as e:
             self.logger.error(f"Error reading file: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Check if file is available.
 
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
         Returns:
             True if file exists and is readable
         """
+        if self.bundle_paths:
+            return any(Path(p).exists() for p in self.bundle_paths)
+
         if not self.file_path:
             return False
 
@@ -121,4 +173,36 @@ class FileUploadStrategy(InputStrategy):
     def clear_file(self) -> None:
         """Clear configured file."""
         self.file_path = None
+        self.line_range = None
+        self.bundle_paths = None
         self.logger.debug("File path cleared")
+
+    def _capture_bundle(self) -> Optional[InputContent]:
+        """Capture the configured files and folders as one bundled input.
+
+        Returns:
+            InputContent with the bundle or None if no file could be included
+        """
+        try:
+            bundle = build_bundle(self.bundle_paths)
+        except Exception as e:
+            self.logger.error(f"Error building file bundle: {e}")
+            return None
+
+        if not bundle.included:
+            self.logger.error("No readable text files in the dropped items")
+            return None
+
+        return InputContent(
+            input_type=InputType.FILE_UPLOAD,
+            text=bundle.text,
+            metadata={
+                "bundle": bundle.manifest(),
+                "file_count": len(bundle.included),
+                "skipped_count": len(bundle.entries) - len(bundle.included),
+                "truncated": bundle.truncated,
+                "char_count": len(bundle.text),
+                "estimated_tokens": bundle.tokens,
+                "build_ms": round(bundle.seconds * 1000, 1)
+            }
+        )
@@ -0,0 +1,250 @@
+"""Git diff input strategy.
+
+Captures "what I just changed": the staged or working-tree diff of the
+agent's context folder.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from typing import List, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('GitDiffStrategy')
+
+# Diff modes
+DIFF_AUTO = "auto"        # Staged changes if any, otherwise working tree
+DIFF_STAGED = "staged"    # Index vs HEAD
+DIFF_WORKING = "working"  # Working tree vs index
+DIFF_ALL = "all"          # Working tree vs HEAD
+
+# Hash of the empty tree (diff base of a repository without commits)
+_EMPTY_TREE = "4b825dc642cb6eb9a060e54bf8d69288fbee4904"
+
+
+class GitDiffStrategy(InputStrategy):
+    """Strategy for git diff input.
+
+    Runs git diff on the repository containing the context folder, with
+    rename detection. Hunks are bounded per file and in total, so a large
+    refactor or a regenerated lock file cannot flood the prompt.
+    """
+
+    def __init__(self, repo_path: Optional[str] = None, mode: str = DIFF_AUTO,
+                 max_file_lines: int = 400, max_total_lines: int = 3000,
+                 context_lines: int = 3, timeout: float = 5.0):
+        """Initialize git diff strategy.
+
+        Args:
+            repo_path: Folder inside the repository (usually the agent context folder)
+            mode: DIFF_AUTO, DIFF_STAGED, DIFF_WORKING or DIFF_ALL
+            max_file_lines: Maximum diff lines kept per file
+            max_total_lines: Maximum diff lines kept in total
+            context_lines: Unchanged lines around each change
+            timeout: Maximum seconds for a git command
+        """
+        self.repo_path = repo_path
+        self.mode = mode
+        self.max_file_lines = max_file_lines
+        self.max_total_lines = max_total_lines
+        self.context_lines = context_lines
+        self.timeout = timeout
+        self.logger = logger
+
+    def get_input_type(self) -> InputType:
+        """Return input type."""
+        return InputType.GIT_DIFF
+
+    def set_repository(self, repo_path: Optional[str]) -> None:
+        """Set the folder whose repository is diffed.
+
+        Args:
+            repo_path: Folder inside a git repository (None to clear)
+        """
+        self.repo_path = repo_path
+
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
+        """Capture the diff of the repository.
+
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
+        Returns:
+            InputContent with the diff or None if there are no changes
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            start = time.perf_counter()
+            scope = self.mode
+            if scope == DIFF_AUTO:
+                # Exit code 1 means there are staged changes
+                staged = self._git(["diff", "--cached", "--quiet", "--relative", self._head()], check=False)
+                scope = DIFF_STAGED if staged.returncode == 1 else DIFF_WORKING
+
+            patch = self._git(self._diff_args(scope)).stdout
+            if not patch.strip():
+                self.logger.info(f"No {scope} changes in {self.repo_path}")
+                return None
+
+            text, files, omitted = self._bound_patch(patch)
+            elapsed = time.perf_counter() - start
+
+            summary = ", ".join(
+                f"{name} (+{added}/-{removed})" for name, added, removed in files
+            )
+            self.logger.info(
+                f"Captured {scope} diff: {len(files)} files, {len(patch)} chars in {elapsed * 1000:.0f}ms"
+                + (f" ({omitted} lines omitted)" if omitted else "")
+            )
+
+            return InputContent(
+                input_type=InputType.GIT_DIFF,
+                text=f"Changed files: {summary}\n\n{text}",
+                metadata={
+                    "repository": self.repo_path,
+                    "scope": scope,
+                    "files": [name for name, _, _ in files],
+                    "lines_added": sum(added for _, added, _ in files),
+                    "lines_removed": sum(removed for _, _, removed in files),
+                    "omitted_lines": omitted,
+                    "git_ms": round(elapsed * 1000, 1)
+                }
+            )
+
+        except FileNotFoundError:
+            self.logger.error("git not found - install git and add it to PATH")
+            return None
+
+        except Exception as e:
+            self.logger.error(f"Error capturing git diff: {e}")
+            return None
+
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
+        """Check if the configured folder is inside a git repository.
+
+        Only looks for a .git entry in the folder and its parents (no git
+        process); whether there are changes is known after capture.
+
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
+        Returns:
+            True if the folder is in a git repository
+        """
+        if not self.repo_path or not os.path.isdir(self.repo_path):
+            return False
+
+        folder = os.path.abspath(self.repo_path)
+        while True:
+            if os.path.exists(os.path.join(folder, ".git")):
+                return True
+            parent = os.path.dirname(folder)
+            if parent == folder:
+                return False
+            folder = parent
+
+    def _git(self, args: List[str], check: bool = True) -> subprocess.CompletedProcess:
+        """Run a git command in the repository.
+
+        Args:
+            args: Git arguments
+            check: Raise if git fails
+
+        Returns:
+            Completed process (stdout decoded as UTF-8)
+        """
+        env = dict(os.environ, GIT_OPTIONAL_LOCKS="0", GIT_TERMINAL_PROMPT="0")
+        result = subprocess.run(
+            ["git", "-C", self.repo_path, "-c", "core.quotepath=off", *args],
+            capture_output=True,
+            timeout=self.timeout,
+            env=env,
+            encoding="utf-8",
+            errors="replace",
+            creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        )
+        if check and result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"git {args[0]} failed")
+        return result
+
+    def _head(self) -> str:
+        """Diff base: HEAD, or the empty tree before the first commit."""
+        result = self._git(["rev-parse", "--verify", "--quiet", "HEAD"], check=False)
+        return "HEAD" if result.returncode == 0 else _EMPTY_TREE
+
+    def _diff_args(self, scope: str) -> List[str]:
+        """Build the git diff arguments for a scope.
+
+        --relative limits the diff to the context folder (which may be a
+        subfolder of a larger repository) and shows paths relative to it.
+        """
+        args = [
+            "diff", "--no-color", "--no-ext-diff", "--no-textconv", "--relative",
+            "--find-renames", f"--unified={self.context_lines}"
+        ]
+        if scope == DIFF_STAGED:
+            args += ["--cached", self._head()]
+        elif scope == DIFF_ALL:
+            args.append(self._head())
+        return args
+
+    def _bound_patch(self, patch: str) -> Tuple[str, List[Tuple[str, int, int]], int]:
+        """Limit a patch to max_file_lines per file and max_total_lines overall.
+
+        File headers are always kept, so every changed file stays visible.
+
+        Args:
+            patch: Unified diff from git
+
+        Returns:
+            Tuple of (bounded patch, [(file, added, removed)], omitted line count)
+        """
+        output: List[str] = []
+        files: List[list] = []  # [name, added, removed]
+        omitted = 0
+        file_lines = 0
+        file_omitted = 0
+        in_header = False
+
+        def close_file():
+            nonlocal file_omitted
+            if file_omitted:
+                output.append(f"... [{file_omitted} diff lines of this file omitted]")
+                file_omitted = 0
+
+        for line in patch.splitlines():
+            if line.startswith("diff --git "):
+                close_file()
+                # "diff --git a/old b/new" - show the new name
+                files.append([line.split(" b/", 1)[-1], 0, 0])
+                file_lines = 0
+                in_header = True
+                output.append(line)
+                continue
+
+            if line.startswith("@@"):
+                in_header = False
+            elif not in_header and files:
+                if line.startswith("+"):
+                    files[-1][1] += 1
+                elif line.startswith("-"):
+                    files[-1][2] += 1
+
+            if in_header:
+                output.append(line)  # mode, index, rename and ---/+++ lines
+                continue
+
+            file_lines += 1
+            if file_lines > self.max_file_lines or len(output) >= self.max_total_lines:
+                file_omitted += 1
+                omitted += 1
+                continue
+            output.append(line)
+
+        close_file()
+        return "\n".join(output), [tuple(f) for f in files], omitted
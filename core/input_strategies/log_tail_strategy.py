@@ -0,0 +1,127 @@
+"""Log tail input strategy.
+
+Captures the new part of a configured log file, compacted (see core.log_tail).
+"""
+
+import os
+from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from typing import Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('LogTailStrategy')
+
+
+class LogTailStrategy(InputStrategy):
+    """Strategy for log file input.
+
+    The first activation reads the last tail_lines lines of the log; later
+    activations read only what was appended since (the offset is persisted).
+    Repeated lines and stack traces are collapsed into counts. The offset
+    is saved by commit(), once the agent has used the lines.
+    """
+
+    def __init__(self, log_file: Optional[str] = None, tail_lines: int = 500,
+                 incremental: bool = True, max_output_lines: int = 400):
+        """Initialize log tail strategy.
+
+        Args:
+            log_file: Path to the log file
+            tail_lines: Lines read on first activation (or after rotation)
+            incremental: Continue from the previous activation's offset
+            max_output_lines: Compacted lines sent to the agent
+        """
+        self.log_file = log_file
+        self.tail_lines = tail_lines
+        self.incremental = incremental
+        self.max_output_lines = max_output_lines
+        self.logger = logger
+
+    def get_input_type(self) -> InputType:
+        """Return input type."""
+        return InputType.LOG_TAIL
+
+    def set_log_file(self, log_file: Optional[str]) -> None:
+        """Set the log file to tail.
+
+        Args:
+            log_file: Path to the log file (None to clear)
+        """
+        self.log_file = log_file
+
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
+        """Capture the new lines of the log file.
+
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
+        Returns:
+            InputContent with the compacted lines or None if nothing was appended
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            from core.log_tail import read_log_tail
+
+            tail = read_log_tail(
+                self.log_file,
+                tail_lines=self.tail_lines,
+                incremental=self.incremental,
+                max_output_lines=self.max_output_lines,
+                commit=False
+            )
+            if not tail.text.strip():
+                self.logger.info(f"No new lines in {self.log_file}")
+                return None
+
+            return InputContent(
+                input_type=InputType.LOG_TAIL,
+                text=tail.text,
+                file_path=self.log_file,
+                metadata={
+                    "file_name": os.path.basename(self.log_file),
+                    "incremental": tail.incremental,
+                    "byte_range": (tail.start, tail.end),
+                    "lines_read": tail.lines_read,
+                    "lines_shown": tail.lines_shown,
+                    "repeated_lines": tail.repeated_lines,
+                    "repeated_traces": tail.trace_counts,
+                    "skipped_bytes": tail.skipped_bytes,
+                    "fingerprint": tail.fingerprint,
+                    "fingerprint_size": tail.fingerprint_size
+                }
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error reading log file: {e}")
+            return None
+
+    def commit(self, content: InputContent) -> None:
+        """Save the read offset of a used log tail.
+
+        Args:
+            content: InputContent returned by capture_input()
+        """
+        if not self.incremental:
+            return
+        from core.log_tail import get_log_offset_store
+
+        metadata = content.metadata or {}
+        get_log_offset_store().set(
+            content.file_path,
+            metadata["byte_range"][1],
+            metadata["fingerprint"],
+            metadata["fingerprint_size"]
+        )
+
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
+        """Check if a log file is configured and exists.
+
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
+        Returns:
+            True if the log file exists
+        """
+        return bool(self.log_file) and os.path.isfile(self.log_file)
@@ -1,13 +1,16 @@
 """Screenshot input strategy.
 
-Captures screenshots of entire screen or regions.
+Captures screenshots of entire screen or regions (see core.capture_region).
 """
 
 from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from core.image_pipeline import DEFAULT_MAX_DIMENSION, IMAGE_FORMATS, get_image_encoder, scaled_size
+from core.image_dedup import changed_region, dhash, get_image_dedup_index, probe_image
+from core.image_store import ImageStore, get_image_store
+import uuid
 from pathlib import Path
 from typing import Optional
-import tempfile
-from datetime import datetime
 from utils.logger import setup_logger
 
 logger = setup_logger('ScreenshotStrategy')
@@ -18,13 +21,39 @@ class ScreenshotStrategy(InputStrategy):
 
     Captures full screen or selected region.
     Useful for visual debugging, UI analysis, etc.
+
+    The grab stays in memory; downscaling and encoding run on the shared
+    ImageEncoder thread while the agent job starts. Near-identical
+    screenshots reuse the file stored for the earlier one.
     """
 
-    def __init__(self):
-        """Initialize screenshot strategy."""
-        self.temp_dir = Path(tempfile.gettempdir()) / "agent_click_screenshots"
-        self.temp_dir.mkdir(exist_ok=True)
+    # Crop to the changed region only when it covers less than this share of the screen
+    CHANGED_REGION_MAX_AREA = 0.6
+
+    def __init__(self, max_dimension: Optional[int] = DEFAULT_MAX_DIMENSION,
+                 image_format: str = "PNG", quality: Optional[int] = None,
+                 deduplicate: bool = True, send_changed_region: bool = False,
+                 store: Optional[ImageStore] = None):
+        """Initialize screenshot strategy.
+
+        Args:
+            max_dimension: Long edge limit of saved screenshots (None = full resolution)
+            image_format: "PNG", "JPEG" or "WEBP"
+            quality: Optional JPEG/WebP quality
+            deduplicate: Reuse the stored file of a near-identical screenshot
+            send_changed_region: Send only the region that changed since the
+                                 previous full-screen screenshot
+            store: Image store (shared store by default)
+        """
+        self.store = store or get_image_store()
+        self.temp_dir = self.store.root
         self.captured_screenshot_path: Optional[str] = None
+        self.max_dimension = max_dimension
+        self.image_format = image_format
+        self.quality = quality
+        self.deduplicate = deduplicate
+        self.send_changed_region = send_changed_region
+        self._previous_probe = None  # Downscaled copy of the previous full-screen grab
         self.logger = logger
 
         self.logger.debug(f"Temp directory: {self.temp_dir}")
@@ -33,12 +62,17 @@ class ScreenshotStrategy(InputStrategy):
         """Return input type."""
         return InputType.SCREENSHOT
 
-    def capture_input(self, region: Optional[tuple] = None) -> Optional[InputContent]:
+    def capture_input(self, region: Optional[tuple] = None, snapshot: Optional[ClipboardSnapshot] = None,
+                      region_description: str = "region") -> Optional[InputContent]:
         """Capture screenshot.
 
         Args:
-            region: Optional tuple (left, top, width, height) for partial screenshot.
+            region: Optional tuple (left, top, width, height) for partial screenshot,
+                   in physical pixels of the virtual desktop (any monitor).
                    If None, captures entire screen.
+            snapshot: Clipboard snapshot (unused)
+            region_description: What the region shows ("active window", ...),
+                                used in the context text
 
         Returns:
             InputContent with screenshot path or None if capture failed
@@ -55,8 +89,9 @@ class ScreenshotStrategy(InputStrategy):
 
             # Capture screenshot
             if region:
-                self.logger.debug(f"Capturing region: {region}")
-                screenshot = ImageGrab.grab(bbox=region)
+                self.logger.debug(f"Capturing {region_description}: {region}")
+                bbox = (region[0], region[1], region[0] + region[2], region[1] + region[3])
+                screenshot = ImageGrab.grab(bbox=bbox, all_screens=True)
                 region_info = {
                     "left": region[0],
                     "top": region[1],
@@ -68,23 +103,73 @@ class ScreenshotStrategy(InputStrategy):
                 screenshot = ImageGrab.grab()
                 region_info = None
 
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            screenshot_path = self.temp_dir / f"screenshot_{timestamp}.png"
+            captured_size = (screenshot.width, screenshot.height)
+
+            # Single full-resolution pass: change detection and dedup use the probe
+            probe = probe_image(screenshot)
+
+            # Region that changed since the previous full-screen screenshot
+            changed_box = None
+            if self.send_changed_region and not region:
+                if self._previous_probe is not None:
+                    changed_box = changed_region(self._previous_probe, probe, captured_size)
+                    if changed_box:
+                        area = (changed_box[2] - changed_box[0]) * (changed_box[3] - changed_box[1])
+                        if area > self.CHANGED_REGION_MAX_AREA * captured_size[0] * captured_size[1]:
+                            changed_box = None
+                self._previous_probe = probe
+
+            # Reuse the file of a near-identical screenshot
+            index = get_image_dedup_index() if self.deduplicate else None
+            image_hash = dhash(probe) if index else None
+            duplicate = index.find(image_hash, captured_size, probe) if index else None
+
+            if duplicate:
+                screenshot_path = Path(duplicate.path)
+                self.store.touch(screenshot_path)
+                changed_box = None
+                width, height = scaled_size(*captured_size, self.max_dimension)
+                self.logger.info(f"Screenshot unchanged - reusing {screenshot_path.name}")
+            else:
+                if changed_box:
+                    screenshot = screenshot.crop(changed_box)
+
+                # Downscale and encode in the background; the file is named by its
+                # encoded bytes (an identical grab reuses it) and the provisional
+                # path handed out now resolves to it (ImageStore.resolve)
+                extension = IMAGE_FORMATS[self.image_format][0]
+                screenshot_path = self.store.path_for("screenshot", f"pending-{uuid.uuid4().hex}", extension)
+                width, height = scaled_size(screenshot.width, screenshot.height, self.max_dimension)
+
+                provisional = screenshot_path
+                get_image_encoder().submit(
+                    screenshot, str(screenshot_path), self.image_format, self.max_dimension, self.quality,
+                    store_as=lambda data: self._store_encoded(provisional, data, extension)
+                )
+
+                # Crops are not registered: a later full screenshot must not reuse them
+                if index and not changed_box:
+                    index.add(image_hash, str(screenshot_path), InputType.SCREENSHOT.value, captured_size, probe)
+
+                self.logger.info(
+                    f"Screenshot captured: {screenshot_path.name} "
+                    f"({screenshot.width}x{screenshot.height} -> {width}x{height}, encoding)"
+                )
 
-            # Save screenshot
-            screenshot.save(screenshot_path, "PNG")
             self.captured_screenshot_path = str(screenshot_path)
 
-            file_size = screenshot_path.stat().st_size
-
-            self.logger.info(
-                f"Screenshot saved: {screenshot_path.name} ({file_size} bytes)"
-            )
+            # Exact content hash (after the encode, off the capture path): agent
+            # results are only reused for exact duplicates
+            pixel_digest = get_image_encoder().digest(screenshot)
 
             # Build context text
             if region:
-                context_text = f"[Screenshot of region: {region[0]}x{region[1]} size {region[2]}x{region[3]}]"
+                context_text = f"[Screenshot of {region_description}: {region[0]}x{region[1]} size {region[2]}x{region[3]}]"
+            elif changed_box:
+                context_text = (
+                    f"[Screenshot of the screen region that changed since the previous screenshot: "
+                    f"{changed_box[0]},{changed_box[1]} to {changed_box[2]},{changed_box[3]}]"
+                )
             else:
                 context_text = "[Screenshot of entire screen]"
 
@@ -93,12 +178,18 @@ class ScreenshotStrategy(InputStrategy):
                 text=f"{context_text}\nReady for visual analysis.",
                 image_path=str(screenshot_path),
                 metadata={
-                    "image_format": "PNG",
+                    "image_format": self.image_format,
                     "saved_path": str(screenshot_path),
-                    "file_size": file_size,
-                    "width": screenshot.width,
-                    "height": screenshot.height,
-                    "region": region_info
+                    "file_size": None,  # Known once encoding finishes
+                    "width": width,
+                    "height": height,
+                    "captured_width": captured_size[0],
+                    "captured_height": captured_size[1],
+                    "region": region_info,
+                    "region_description": region_description if region else None,
+                    "changed_region": changed_box,
+                    "duplicate_of": duplicate.path if duplicate else None,
+                    "pixel_digest": pixel_digest
                 }
             )
 
@@ -110,21 +201,36 @@ class ScreenshotStrategy(InputStrategy):
             self.logger.error(f"Error capturing screenshot: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Screenshot is always available.
 
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
         Returns:
             Always True (can always take screenshot)
         """
         return True
 
+    def _store_encoded(self, provisional: Path, data: bytes, extension: str) -> Path:
+        """Store an encoded screenshot by content and alias its provisional path.
+
+        Runs on the encoder thread before the encode is reported done, so
+        waiters always find the alias.
+        """
+        path = self.store.store_bytes("screenshot", data, extension)
+        self.store.alias(provisional, path)
+        return path
+
     def get_last_screenshot(self) -> Optional[str]:
         """Get path to last captured screenshot.
 
         Returns:
             Path to last screenshot or None
         """
-        return self.captured_screenshot_path
+        if self.captured_screenshot_path is None:
+            return None
+        return self.store.resolve(self.captured_screenshot_path)
 
     def cleanup_old_screenshots(self, hours: int = 24) -> int:
         """Clean up old screenshots from temp directory.
@@ -141,7 +247,7 @@ class ScreenshotStrategy(InputStrategy):
             cutoff_time = time.time() - (hours * 3600)
             deleted_count = 0
 
-            for file_path in self.temp_dir.glob("screenshot_*.png"):
+            for file_path in self.temp_dir.glob("screenshot_*"):
                 if file_path.stat().st_mtime < cutoff_time:
                     file_path.unlink()
                     deleted_count += 1
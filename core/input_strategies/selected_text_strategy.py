@@ -3,10 +3,13 @@
 Captures text currently selected by mouse (without requiring Ctrl+C).
 """
 
+import threading
 import time
+from collections import deque
 from core.input_strategy import InputStrategy, InputType, InputContent
 from core.selection_manager import SelectionManager
-from typing import Optional
+from core.clipboard_snapshot import ClipboardSnapshot, wait_for_clipboard_change
+from typing import Optional, Dict, Any
 from utils.logger import setup_logger
 
 logger = setup_logger('SelectedTextStrategy')
@@ -17,46 +20,79 @@ class SelectedTextStrategy(InputStrategy):
 
     This strategy captures text that user has currently selected with mouse
     by temporarily using Ctrl+C to copy it, then restoring the clipboard.
+
+    Instead of a fixed delay after Ctrl+C, the clipboard change counter is
+    polled until the copy lands (or copy_timeout expires). Copy-to-ready
+    latencies are recorded to tune the timeout.
     """
 
-    def __init__(self):
-        """Initialize selected text strategy."""
+    def __init__(self, copy_timeout: float = 0.3, latency_samples: int = 200):
+        """Initialize selected text strategy.
+
+        Args:
+            copy_timeout: Maximum seconds to wait for Ctrl+C to update the clipboard
+            latency_samples: Number of recent copy latencies kept
+        """
         self.selection_manager = SelectionManager()
+        self.copy_timeout = copy_timeout
+        self._copy_latencies: deque = deque(maxlen=latency_samples)
+        self._copy_timeouts = 0
+        self._stats_lock = threading.Lock()
         self.logger = logger
 
     def get_input_type(self) -> InputType:
         """Return input type."""
         return InputType.SELECTED_TEXT
 
-    def capture_input(self) -> Optional[InputContent]:
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Capture selected text by temporarily copying it.
 
         This method:
-        1. Saves current clipboard content
+        1. Saves current clipboard content (all formats when supported)
         2. Simulates Ctrl+C to copy selected text
-        3. Retrieves the copied text
+        3. Waits for the clipboard to change, then retrieves the copied text
         4. Restores original clipboard content
 
+        Args:
+            snapshot: Optional clipboard snapshot of the current activation
+
         Returns:
             InputContent with selected text or None if no text selected
         """
+        snapshot = snapshot or ClipboardSnapshot()
+        backend = snapshot.backend
+
         try:
             # Save current clipboard
-            old_clipboard = self.selection_manager.get_selected_text()
+            old_clipboard = snapshot.text
+            saved_formats = backend.save_formats()
+            before = backend.change_count()
 
             # Simulate Ctrl+C to copy selected text using keyboard module
             import keyboard
+            start = time.perf_counter()
             keyboard.press_and_release('ctrl+c')
 
-            # Small delay to let clipboard update
-            time.sleep(0.1)
+            # Wait for the copy to land instead of sleeping a fixed time
+            changed = wait_for_clipboard_change(
+                backend, before, previous_text=old_clipboard, timeout=self.copy_timeout
+            )
+            self._record_copy_latency(time.perf_counter() - start if changed else None)
 
-            # Get the copied text
-            text = self.selection_manager.get_selected_text()
+            # Get the copied text (None if the counter shows nothing was copied)
+            text = None
+            if changed or before is None:
+                text = self.selection_manager.get_selected_text()
 
             # Restore original clipboard
-            if old_clipboard:
-                self.selection_manager.copy_to_clipboard(old_clipboard)
+            if changed or before is None:
+                if saved_formats is not None:
+                    backend.restore_formats(saved_formats)
+                elif old_clipboard:
+                    self.selection_manager.copy_to_clipboard(old_clipboard)
+                else:
+                    # Nothing to restore - the snapshot no longer matches the clipboard
+                    snapshot.invalidate()
 
             if text and len(text.strip()) > 0:
                 self.logger.info(f"Captured selected text: {len(text)} chars")
@@ -76,7 +112,43 @@ class SelectedTextStrategy(InputStrategy):
             self.logger.error(f"Error capturing selected text: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def _record_copy_latency(self, latency: Optional[float]) -> None:
+        """Record a copy-to-ready latency (None = timed out)."""
+        with self._stats_lock:
+            if latency is None:
+                self._copy_timeouts += 1
+            else:
+                self._copy_latencies.append(latency)
+
+        if latency is None:
+            self.logger.debug(f"Clipboard unchanged after {self.copy_timeout:.2f}s")
+        else:
+            self.logger.debug(f"Clipboard ready {latency * 1000:.1f}ms after Ctrl+C")
+
+    def get_copy_latency_stats(self) -> Dict[str, Any]:
+        """Get the distribution of recent copy-to-ready latencies.
+
+        Returns:
+            Dictionary with sample count, timeouts and p50/p90/p99/max in ms
+        """
+        with self._stats_lock:
+            samples = sorted(self._copy_latencies)
+            timeouts = self._copy_timeouts
+
+        stats: Dict[str, Any] = {"samples": len(samples), "timeouts": timeouts}
+        if samples:
+            def percentile(p: float) -> float:
+                return samples[min(int(p * len(samples)), len(samples) - 1)] * 1000
+
+            stats.update({
+                "p50_ms": percentile(0.5),
+                "p90_ms": percentile(0.9),
+                "p99_ms": percentile(0.99),
+                "max_ms": samples[-1] * 1000,
+            })
+        return stats
+
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Check if text is currently selected.
 
         This is a non-destructive check - we always return True since we can't
@@ -85,6 +157,9 @@ class SelectedTextStrategy(InputStrategy):
 
         The actual availability will be determined when capture_input() is called.
 
+        Args:
+            snapshot: Optional clipboard snapshot (unused)
+
         Returns:
             True (always available to try)
         """
@@ -5,6 +5,7 @@ Captures text selected by user (current behavior).
 
 from core.input_strategy import InputStrategy, InputType, InputContent
 from core.selection_manager import SelectionManager
+from core.clipboard_snapshot import ClipboardSnapshot
 from typing import Optional
 from utils.logger import setup_logger
 
@@ -27,14 +28,17 @@ class TextSelectionStrategy(InputStrategy):
         """Return input type."""
         return InputType.TEXT_SELECTION
 
-    def capture_input(self) -> Optional[InputContent]:
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Capture selected text from clipboard.
 
+        Args:
+            snapshot: Optional clipboard snapshot of the current activation
+
         Returns:
             InputContent with selected text or None if clipboard empty
         """
         try:
-            text = self.selection_manager.get_selected_text()
+            text = (snapshot or ClipboardSnapshot()).text
 
             if text:
                 self.logger.info(f"Captured text selection: {len(text)} chars")
@@ -54,15 +58,17 @@ class TextSelectionStrategy(InputStrategy):
             self.logger.error(f"Error capturing text selection: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Check if text is available in clipboard.
 
+        Args:
+            snapshot: Optional clipboard snapshot of the current activation
+
         Returns:
             True if clipboard has text content
         """
         try:
-            text = self.selection_manager.get_selected_text()
-            return text is not None and len(text.strip()) > 0
+            return (snapshot or ClipboardSnapshot()).has_text()
         except Exception as e:
             self.logger.error(f"Error checking availability: {e}")
             return False
@@ -7,8 +7,12 @@ and extracting the file path from the window title.
 import os
 import re
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List
 from core.input_strategy import InputStrategy, InputType, InputContent
+from core.clipboard_snapshot import ClipboardSnapshot
+from core.file_index import FileNameIndex
+from core.file_reader import read_text_file
+from core.file_watcher import get_file_watcher
 from utils.logger import setup_logger
 
 logger = setup_logger('VSCodeActiveFileStrategy')
@@ -36,9 +40,18 @@ class VSCodeActiveFileStrategy(InputStrategy):
     - "Untitled-*" (unsaved files - not supported)
     """
 
-    def __init__(self):
-        """Initialize VSCode active file strategy."""
+    def __init__(self, file_index: Optional[FileNameIndex] = None):
+        """Initialize VSCode active file strategy.
+
+        Args:
+            file_index: Optional shared file name index (created if not given)
+        """
         self.logger = logger
+        self.file_index = file_index if file_index is not None else FileNameIndex(watcher=get_file_watcher())
+
+        # Start warming the index right away so the first activation is fast
+        if WINDOWS_AVAILABLE:
+            self._refresh_index_roots()
 
     def get_input_type(self) -> InputType:
         """Return input type."""
@@ -113,7 +126,11 @@ class VSCodeActiveFileStrategy(InputStrategy):
             if not parts:
                 return None
 
-            filename = parts[0].strip()
+            # Strip the unsaved-changes marker ("● app.py")
+            filename = parts[0].strip().lstrip("●").strip()
+
+            # Second part (if any) is the workspace folder name
+            folder_hint = parts[1].strip() if len(parts) > 1 else None
 
             # If filename contains path separators, it might already be a path
             if os.path.sep in filename or "/" in filename:
@@ -122,16 +139,51 @@ class VSCodeActiveFileStrategy(InputStrategy):
                 if os.path.exists(filename):
                     return os.path.abspath(filename)
 
-            # Search for the file in common project directories
-            # Start from current working directory and search up
-            return self._search_file_in_project(filename)
+            # Resolve through the file name index (O(1) once warm)
+            self._refresh_index_roots()
+            file_path = self.file_index.resolve(filename, folder_hint)
+            if file_path:
+                self.logger.debug(f"Resolved from index: {file_path}")
+                return file_path
+
+            # Index still warming up or stale - fall back to a direct search
+            index_ready = self.file_index.is_ready()
+            file_path = self._search_file_in_project(filename)
+            if file_path and index_ready:
+                self.logger.info(f"File missing from index, rescanning: {filename}")
+                self.file_index.add_path(file_path)
+                self.file_index.refresh()
+            return file_path
 
         except Exception as e:
             self.logger.error(f"Error extracting file path from title: {e}")
             return None
 
+    def _get_search_roots(self) -> List[str]:
+        """Get folders searched for the active file.
+
+        Returns:
+            Configured context folders of all agents plus the current directory
+        """
+        from config.agent_config import get_config_manager
+
+        roots = []
+        try:
+            for settings in get_config_manager().configs.values():
+                if settings.context_folder and settings.context_folder not in roots:
+                    roots.append(settings.context_folder)
+        except Exception as e:
+            self.logger.debug(f"Could not read context folders: {e}")
+
+        roots.append(os.getcwd())
+        return roots
+
+    def _refresh_index_roots(self) -> None:
+        """Keep index roots in sync with configured context folders."""
+        self.file_index.set_roots(self._get_search_roots())
+
     def _search_file_in_project(self, filename: str) -> Optional[str]:
-        """Search for file in project directories.
+        """Search for file in project directories (used when the index misses).
 
         Args:
             filename: Name of file to search for
@@ -140,21 +192,20 @@ class VSCodeActiveFileStrategy(InputStrategy):
             Absolute file path if found, None otherwise
         """
         try:
-            # Start from current directory
-            current_dir = os.getcwd()
-
-            # Search in current directory and subdirectories (limited depth)
-            for root, dirs, files in os.walk(current_dir):
-                # Limit search depth to avoid scanning entire filesystem
-                depth = root[len(current_dir):].count(os.sep)
-                if depth > 5:  # Limit to 5 levels deep
-                    dirs[:] = []  # Don't go deeper
-                    continue
-
-                if filename in files:
-                    filepath = os.path.join(root, filename)
-                    self.logger.debug(f"Found file: {filepath}")
-                    return os.path.abspath(filepath)
+            for current_dir in self._get_search_roots():
+                # Search in directory and subdirectories (limited depth)
+                for root, dirs, files in os.walk(current_dir):
+                    # Limit search depth to avoid scanning entire filesystem
+                    depth = root[len(current_dir):].count(os.sep)
+                    if depth > 5:  # Limit to 5 levels deep
+                        dirs[:] = []  # Don't go deeper
+                        continue
+
+                    if filename in files:
+                        filepath = os.path.abspath(os.path.join(root, filename))
+                        self.logger.debug(f"Found file: {filepath}")
+                        self.file_index.touch(filepath)
+                        return filepath
 
             self.logger.warning(f"File not found in project: {filename}")
             return None
@@ -182,32 +233,19 @@ class VSCodeActiveFileStrategy(InputStrategy):
             if file_size > 5 * 1024 * 1024:  # 5MB limit
                 self.logger.warning(f"File is very large ({file_size / 1024 / 1024:.1f}MB)")
 
-            # Try to read with different encodings
-            content = None
-            encoding = None
-
-            for enc in ['utf-8', 'utf-16', 'latin-1']:
-                try:
-                    with open(file_path, 'r', encoding=enc) as f:
-                        content = f.read()
-                        encoding = enc
-                        break
-                except UnicodeDecodeError:
-                    continue
-
-            if content is None:
-                self.logger.error(f"Could not decode file: {file_path}")
-                return None
-
-            # Check if it's a binary file (heuristic)
-            if '\x00' in content:
+            # Encoding and binary check in one pass (cached while the file is unchanged)
+            decoded = read_text_file(file_path)
+            if decoded is None:
                 self.logger.error(f"Binary file detected: {file_path}")
                 return None
 
+            content = decoded.text
+            encoding = decoded.encoding
+
             # Collect metadata
             filename = os.path.basename(file_path)
             extension = os.path.splitext(filename)[1]
-            line_count = len(content.splitlines())
+            line_count = decoded.line_count
 
             metadata = {
                 "filename": filename,
@@ -225,9 +263,12 @@ class VSCodeActiveFileStrategy(InputStrategy):
             self.logger.error(f"Error reading file: {e}")
             return None
 
-    def capture_input(self) -> Optional[InputContent]:
+    def capture_input(self, snapshot: Optional[ClipboardSnapshot] = None) -> Optional[InputContent]:
         """Capture the active file from VSCode.
 
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
         Returns:
             InputContent with file content or None if not available
         """
@@ -263,12 +304,15 @@ class VSCodeActiveFileStrategy(InputStrategy):
             self.logger.error(f"Error capturing VSCode active file: {e}")
             return None
 
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional[ClipboardSnapshot] = None) -> bool:
         """Check if VSCode active file input is available.
 
         This is a fast check - it only verifies VSCode is active and has
         a file in the title, without reading the file content.
 
+        Args:
+            snapshot: Clipboard snapshot (unused)
+
         Returns:
             True if VSCode is active with a file, False otherwise
         """
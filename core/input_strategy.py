@@ -5,10 +5,13 @@ Defines different ways users can provide input to agents.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from enum import Enum
 from utils.logger import setup_logger
 
+if TYPE_CHECKING:
+    from core.clipboard_snapshot import ClipboardSnapshot
+
 logger = setup_logger('InputStrategy')
 
 
@@ -20,6 +23,9 @@ class InputType(Enum):
     SCREENSHOT = "screenshot"
     SELECTED_TEXT = "selected_text"  # NOVO: Mouse selection without clipboard
     VSCODE_ACTIVE_FILE = "vscode_active_file"  # NOVO: Reads active file from VSCode window
+    GIT_DIFF = "git_diff"  # Staged or working-tree diff of the context folder
+    LOG_TAIL = "log_tail"  # New lines of the agent's log file, compacted
+    COMPOSITE = "composite"  # Several sources captured together (see InputManager.capture_composite)
 
 
 @dataclass
@@ -32,12 +38,14 @@ class InputContent:
         file_path: Path to file (if applicable)
         image_path: Path to image/screenshot (if applicable)
         metadata: Additional metadata
+        parts: Inputs of each source (composite input only)
     """
     input_type: InputType
     text: Optional[str] = None
     file_path: Optional[str] = None
     image_path: Optional[str] = None
     metadata: Optional[Dict[str, Any]] = None
+    parts: Optional[List['InputContent']] = None
 
     def get_text_for_agent(self) -> str:
         """Get text representation for agent processing.
@@ -67,8 +75,41 @@ class InputContent:
             filename = self.metadata.get("filename", "unknown") if self.metadata else "unknown"
             return f"[VSCODE ACTIVE FILE: {filename}]\n{self.text or ''}"
 
+        elif self.input_type == InputType.GIT_DIFF:
+            scope = self.metadata.get("scope", "") if self.metadata else ""
+            return f"[GIT DIFF: {scope} changes]\n{self.text or ''}"
+
+        elif self.input_type == InputType.LOG_TAIL:
+            file_name = self.metadata.get("file_name", "") if self.metadata else ""
+            return f"[LOG TAIL: {file_name}]\n{self.text or ''}"
+
+        elif self.input_type == InputType.COMPOSITE:
+            sections = []
+            image_count = len(self.get_image_paths())
+            image_number = 0
+            for index, part in enumerate(self.parts or [], start=1):
+                title = part.input_type.value.replace("_", " ").upper()
+                body = part.get_text_for_agent()
+                if part.image_path:
+                    # The image itself is sent as a VISUAL CONTEXT block (numbered if several)
+                    image_number += 1
+                    label = f"VISUAL CONTEXT {image_number}" if image_count > 1 else "VISUAL CONTEXT"
+                    body += f"\nImage attached: see {label}"
+                sections.append(f"===== SOURCE {index}: {title} =====\n{body}")
+            return "\n\n".join(sections)
+
         return ""
 
+    def get_image_paths(self) -> List[str]:
+        """Get every image of the input (all sources of a composite input).
+
+        Returns:
+            List of image paths
+        """
+        if self.parts:
+            return [part.image_path for part in self.parts if part.image_path]
+        return [self.image_path] if self.image_path else []
+
     def has_image(self) -> bool:
         """Check if input contains an image.
 
@@ -102,25 +143,44 @@ class InputStrategy(ABC):
         pass
 
     @abstractmethod
-    def capture_input(self) -> Optional[InputContent]:
+    def capture_input(self, snapshot: Optional['ClipboardSnapshot'] = None) -> Optional[InputContent]:
         """Capture input from user.
 
         This is the main method that performs the actual input capture.
 
+        Args:
+            snapshot: Clipboard snapshot shared by all strategies of an
+                      activation (strategies reading the clipboard must use it)
+
         Returns:
             InputContent object or None if no input available
         """
         pass
 
     @abstractmethod
-    def is_available(self) -> bool:
+    def is_available(self, snapshot: Optional['ClipboardSnapshot'] = None) -> bool:
         """Check if this input type is currently available.
 
+        Args:
+            snapshot: Clipboard snapshot shared by all strategies of an activation
+
         Returns:
             True if input is available and can be captured
         """
         pass
 
+    def commit(self, content: InputContent) -> None:
+        """Called once the agent has used captured input.
+
+        Strategies that consume their source (e.g. advance a read offset)
+        do it here, so an activation that fails - or a composite that
+        leaves the source out - does not lose input.
+
+        Args:
+            content: InputContent returned by capture_input()
+        """
+        pass
+
     def get_description(self) -> str:
         """Get human-readable description of this strategy.
 
@@ -0,0 +1,614 @@
+"""Log file tailing for AgentClick system.
+
+Crash logs are large and repetitive. read_log_tail() streams a log file from
+the last activation (or its last N lines) through LogCompactor, which
+collapses runs of repeated lines and stack traces seen before into counts,
+so only the compacted view reaches the prompt. Memory use is bounded by the
+compacted output, not by the size of the log.
+
+Read offsets are persisted per log file (LogOffsetStore), so repeated
+activations only read what was appended since the previous one. A log that
+shrank or whose first bytes changed was rotated and is tailed again.
+
+Run this module to measure throughput and compaction on a synthetic log:
+
+    python -m core.log_tail
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+from core.file_reader import BINARY_SAMPLE_SIZE, sniff_encoding
+from utils.logger import setup_logger
+
+logger = setup_logger('LogTail')
+
+# Bytes read per step
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Bytes hashed to recognize a rotated log (same name, new content)
+_FINGERPRINT_SIZE = 256
+
+# Lines kept of a single record (a very deep stack trace)
+MAX_RECORD_LINES = 200
+
+# Leading timestamps ("2024-05-01 10:00:00,123", "[10:00:00.5]") and
+# addresses differ between otherwise identical lines
+_TIMESTAMP_PATTERN = re.compile(
+    r"^\[?(?:\d{4}-\d\d-\d\d[T ])?\d\d:\d\d:\d\d(?:[.,]\d+)?(?:Z|[+-]\d\d:?\d\d)?\]?\s*"
+)
+_ADDRESS_PATTERN = re.compile(r"0x[0-9a-fA-F]+")
+
+# Codecs without a byte order mark, so offsets are plain byte positions
+_BOM_CODECS = {
+    codecs.BOM_UTF8: "utf-8",
+    codecs.BOM_UTF32_LE: "utf-32-le",
+    codecs.BOM_UTF32_BE: "utf-32-be",
+    codecs.BOM_UTF16_LE: "utf-16-le",
+    codecs.BOM_UTF16_BE: "utf-16-be",
+}
+
+
+def _normalize(line: str) -> str:
+    """Comparison key of a line (timestamp and addresses removed)."""
+    return _ADDRESS_PATTERN.sub("0x?", _TIMESTAMP_PATTERN.sub("", line, count=1))
+
+
+class LogCompactor:
+    """Compact log lines as they are streamed.
+
+    Lines are grouped into records: a line plus its indented continuation
+    lines (stack frames) and Python traceback. Consecutive identical
+    records become one record and a repeat count; a multi-line record that
+    was already shown is reduced to its first line and a reference.
+
+    Only the last max_output_lines of the compacted view are kept.
+    """
+
+    def __init__(self, max_output_lines: int = 400):
+        """Initialize compactor.
+
+        Args:
+            max_output_lines: Compacted lines kept (the most recent ones)
+        """
+        self.output: Deque[str] = deque(maxlen=max_output_lines)
+        self.lines_in = 0
+        self.repeated_lines = 0  # Lines removed as repeats
+        self.traces: Dict[str, int] = {}  # Stack trace key -> occurrences
+        self._record: List[str] = []
+        self._record_extra = 0  # Lines beyond MAX_RECORD_LINES
+        self._in_traceback = False
+        self._prev_key: Optional[str] = None
+        self._prev_size = 0
+        self._prev_count = 0
+        self._emitted = 0
+
+    @property
+    def dropped_lines(self) -> int:
+        """Compacted lines pushed out of the output by newer ones."""
+        return self._emitted - len(self.output)
+
+    def feed(self, line: str) -> None:
+        """Add one line (without line ending).
+
+        Args:
+            line: Log line
+        """
+        self.lines_in += 1
+
+        if self._record and (line[:1] in (" ", "\t") or line.startswith("Caused by:")):
+            self._append(line)  # Stack frame of the current record
+            return
+
+        if self._in_traceback:
+            # Exception line ending a Python traceback
+            self._in_traceback = False
+            self._append(line)
+            return
+
+        if line.startswith("Traceback (most recent call last)"):
+            # logging.exception() puts the traceback under the message line
+            self._in_traceback = True
+            if self._record:
+                self._append(line)
+                return
+
+        self._flush()
+        self._record = [line]
+
+    def finish(self) -> List[str]:
+        """Flush pending lines.
+
+        Returns:
+            Compacted lines
+        """
+        self._flush()
+        self._flush_repeats()
+        return list(self.output)
+
+    def _append(self, line: str) -> None:
+        """Add a continuation line to the current record."""
+        if len(self._record) < MAX_RECORD_LINES:
+            self._record.append(line)
+        else:
+            self._record_extra += 1
+
+    def _emit(self, line: str) -> None:
+        """Add a line to the compacted output."""
+        self.output.append(line)
+        self._emitted += 1
+
+    def _flush_repeats(self) -> None:
+        """Emit the repeat count of the previous record."""
+        if self._prev_count > 1:
+            what = "entry" if self._prev_size > 1 else "line"
+            self._emit(f"    [previous {what} repeated {self._prev_count - 1} more times]")
+        self._prev_count = 0
+
+    def _flush(self) -> None:
+        """Emit the current record, or count it as a repeat."""
+        record = self._record
+        if not record:
+            return
+        self._record = []
+        extra, self._record_extra = self._record_extra, 0
+        key = "\n".join(_normalize(line) for line in record)
+
+        if key == self._prev_key:
+            self._prev_count += 1
+            self.repeated_lines += len(record) + extra
+            return
+
+        self._flush_repeats()
+        self._prev_key = key
+        self._prev_size = len(record)
+        self._prev_count = 1
+
+        if len(record) > 1:
+            seen = key in self.traces
+            self.traces[key] = self.traces.get(key, 0) + 1
+            if seen:
+                self._emit(record[0])
+                self._emit(f"    [same {len(record) - 1 + extra} lines as an earlier occurrence]")
+                self.repeated_lines += len(record) - 1 + extra
+                return
+
+        for line in record:
+            self._emit(line)
+        if extra:
+            self._emit(f"    [... {extra} more lines]")
+
+
+@dataclass
+class LogTail:
+    """Compacted view of the new part of a log file.
+
+    Attributes:
+        path: Log file path
+        text: Compacted lines
+        start: Byte offset where reading started
+        end: Byte offset after the last complete line (where the next read continues)
+        lines_read: Lines read from the file
+        lines_shown: Lines in text
+        repeated_lines: Lines collapsed into repeat counts
+        trace_counts: Occurrences of each repeated stack trace (first line -> count)
+        skipped_bytes: Bytes not read because of max_read_bytes
+        incremental: True if reading continued from the previous activation
+        seconds: Read time
+        fingerprint: Hash of the first fingerprint_size bytes (rotation check)
+        fingerprint_size: Bytes covered by fingerprint
+    """
+    path: str
+    text: str
+    start: int = 0
+    end: int = 0
+    lines_read: int = 0
+    lines_shown: int = 0
+    repeated_lines: int = 0
+    trace_counts: Dict[str, int] = field(default_factory=dict)
+    skipped_bytes: int = 0
+    incremental: bool = False
+    seconds: float = 0.0
+    fingerprint: str = ""
+    fingerprint_size: int = 0
+
+
+class LogOffsetStore:
+    """Persisted read offsets of log files (thread-safe).
+
+    Offsets are saved as JSON next to the agent configuration.
+    """
+
+    def __init__(self, state_file: Optional[Path] = None):
+        """Initialize offset store.
+
+        Args:
+            state_file: JSON file (default: config/log_offsets.json)
+        """
+        if state_file is None:
+            state_file = Path(__file__).parent.parent / 'config' / 'log_offsets.json'
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._offsets: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        """Load offsets on first use."""
+        if self._offsets is None:
+            try:
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self._offsets = json.load(f)
+            except FileNotFoundError:
+                self._offsets = {}
+            except Exception as e:
+                logger.warning(f"Could not load log offsets: {e}")
+                self._offsets = {}
+        return self._offsets
+
+    def get(self, path: str) -> Optional[dict]:
+        """Get the saved state of a log file.
+
+        Args:
+            path: Log file path
+
+        Returns:
+            Dictionary with offset and fingerprint, or None
+        """
+        with self._lock:
+            return self._load().get(os.path.abspath(path))
+
+    def set(self, path: str, offset: int, fingerprint: str,
+            fingerprint_size: int = _FINGERPRINT_SIZE) -> None:
+        """Save the read offset of a log file.
+
+        Args:
+            path: Log file path
+            offset: Byte offset to continue from
+            fingerprint: Hash of the first bytes of the file
+            fingerprint_size: Number of bytes hashed (less than the default
+                for files that were shorter)
+        """
+        with self._lock:
+            offsets = self._load()
+            offsets[os.path.abspath(path)] = {
+                "offset": offset,
+                "fingerprint": fingerprint,
+                "fingerprint_size": fingerprint_size
+            }
+            try:
+                self.state_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.state_file, 'w', encoding='utf-8') as f:
+                    json.dump(offsets, f, indent=2, ensure_ascii=False)
+            except Exception as e:
+                logger.warning(f"Could not save log offsets: {e}")
+
+    def commit(self, tail: LogTail) -> None:
+        """Save the offset reached by a read made with commit=False.
+
+        Args:
+            tail: Result of read_log_tail()
+        """
+        self.set(tail.path, tail.end, tail.fingerprint, tail.fingerprint_size)
+
+    def reset(self, path: str) -> None:
+        """Forget the offset of a log file (next read tails it again).
+
+        Args:
+            path: Log file path
+        """
+        with self._lock:
+            if self._load().pop(os.path.abspath(path), None) is not None:
+                try:
+                    with open(self.state_file, 'w', encoding='utf-8') as f:
+                        json.dump(self._offsets, f, indent=2, ensure_ascii=False)
+                except Exception as e:
+                    logger.warning(f"Could not save log offsets: {e}")
+
+
+# Singleton instance
+_offset_store: Optional[LogOffsetStore] = None
+_offset_store_lock = threading.Lock()
+
+
+def get_log_offset_store() -> LogOffsetStore:
+    """Get the singleton instance of LogOffsetStore.
+
+    Returns:
+        The singleton LogOffsetStore instance
+    """
+    global _offset_store
+    with _offset_store_lock:
+        if _offset_store is None:
+            _offset_store = LogOffsetStore()
+        return _offset_store
+
+
+def _log_codec(f) -> Tuple[str, int]:
+    """Get the codec of an open log file and the size of its byte order mark.
+
+    Returns:
+        Tuple of (BOM-less codec name, BOM length)
+
+    Raises:
+        ValueError: If the file is binary
+    """
+    sample = f.read(BINARY_SAMPLE_SIZE)
+    encoding = sniff_encoding(sample)
+    if encoding is None:
+        raise ValueError("file is binary")
+    # Longest mark first: the UTF-32 LE mark starts with the UTF-16 LE one
+    for bom in sorted(_BOM_CODECS, key=len, reverse=True):
+        if sample.startswith(bom):
+            return _BOM_CODECS[bom], len(bom)
+    return encoding, 0
+
+
+def _tail_start(f, end: int, lines: int, newline: bytes, floor: int) -> int:
+    """Find the byte offset where the last lines of a file start.
+
+    Reads backwards in chunks counting newlines.
+
+    Args:
+        f: File opened in binary mode
+        end: File size
+        lines: Number of lines wanted
+        newline: Encoded newline
+        floor: Lowest offset (after the byte order mark)
+
+    Returns:
+        Byte offset
+    """
+    unit = len(newline)
+    position = end
+    found = 0
+    # A newline ending the file does not start a line
+    f.seek(max(floor, end - unit))
+    if f.read(unit) == newline:
+        position -= unit
+
+    while position > floor:
+        chunk_start = max(floor, position - READ_CHUNK_SIZE)
+        f.seek(chunk_start)
+        chunk = f.read(position - chunk_start)
+        index = len(chunk)
+        while True:
+            index = chunk.rfind(newline, 0, index)
+            if index < 0:
+                break
+            if (chunk_start + index - floor) % unit == 0:
+                found += 1
+                if found == lines:
+                    return chunk_start + index + unit
+        position = chunk_start
+    return floor
+
+
+def _next_line_start(f, position: int, newline: bytes, floor: int) -> int:
+    """Find the start of the first line beginning at or after a byte offset.
+
+    Args:
+        f: File opened in binary mode
+        position: Byte offset
+        newline: Encoded newline
+        floor: Offset after the byte order mark (character alignment base)
+
+    Returns:
+        Byte offset (position itself if no newline follows)
+    """
+    unit = len(newline)
+    position += (floor - position) % unit  # Align to a character
+    f.seek(position)
+    chunk = f.read(READ_CHUNK_SIZE)
+    index = chunk.find(newline)
+    while index >= 0 and index % unit:
+        index = chunk.find(newline, index + 1)
+    return position if index < 0 else position + index + unit
+
+
+def _last_line_end(f, start: int, end: int, newline: bytes, floor: int) -> int:
+    """Find the offset just after the last complete line in [start, end).
+
+    Args:
+        f: File opened in binary mode
+        start: Lowest offset
+        end: File size
+        newline: Encoded newline
+        floor: Offset after the byte order mark (character alignment base)
+
+    Returns:
+        Byte offset (start if the range holds no complete line)
+    """
+    unit = len(newline)
+    position = end
+    while position > start:
+        chunk_start = max(start, position - READ_CHUNK_SIZE)
+        f.seek(chunk_start)
+        chunk = f.read(position - chunk_start)
+        index = len(chunk)
+        while True:
+            index = chunk.rfind(newline, 0, index)
+            if index < 0:
+                break
+            if (chunk_start + index - floor) % unit == 0:
+                return chunk_start + index + unit
+        position = chunk_start
+    return start
+
+
+def read_log_tail(path: str, tail_lines: int = 500, incremental: bool = True,
+                  max_output_lines: int = 400, max_read_bytes: int = 64 * 1024 * 1024,
+                  offsets: Optional[LogOffsetStore] = None, commit: bool = True) -> LogTail:
+    """Read the new part of a log file and compact it.
+
+    A last line without its newline yet is shown, but the saved offset
+    stops before it, so the next read gets the whole line.
+
+    Args:
+        path: Log file path
+        tail_lines: Lines read on first use (or after rotation)
+        incremental: Continue from the offset saved by the previous read
+        max_output_lines: Compacted lines kept (the most recent ones)
+        max_read_bytes: Maximum bytes read (older bytes are skipped)
+        offsets: Offset store (default: the shared store)
+        commit: Save the offset now; with False the caller saves it with
+            LogOffsetStore.commit() once the input was actually used
+
+    Returns:
+        LogTail (text is empty if nothing was appended)
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is binary
+    """
+    start_time = time.perf_counter()
+    offsets = offsets or get_log_offset_store()
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        codec, floor = _log_codec(f)
+        newline = "\n".encode(codec)
+        # Fingerprint at most as many bytes as the file had: a short log that
+        # grows keeps its fingerprint, a rotated one does not
+        fingerprint_size = min(size, _FINGERPRINT_SIZE)
+        f.seek(0)
+        fingerprint = hashlib.blake2b(f.read(fingerprint_size), digest_size=8).hexdigest()
+
+        state = offsets.get(path) if incremental else None
+        resumed = False
+        if state is not None and floor <= state.get("offset", -1) <= size:
+            stored_size = state.get("fingerprint_size", _FINGERPRINT_SIZE)
+            if stored_size == fingerprint_size:
+                resumed = state.get("fingerprint") == fingerprint
+            elif stored_size < fingerprint_size:
+                f.seek(0)
+                resumed = state.get("fingerprint") == hashlib.blake2b(f.read(stored_size), digest_size=8).hexdigest()
+        if resumed:
+            start = state["offset"]
+        else:
+            if state is not None:
+                logger.info(f"Log was rotated or truncated - tailing again: {path}")
+            start = _tail_start(f, size, tail_lines, newline, floor)
+
+        skipped = 0
+        if size - start > max_read_bytes:
+            # Skip to the first line inside the last max_read_bytes
+            skipped_to = _next_line_start(f, size - max_read_bytes, newline, floor)
+            skipped = skipped_to - start
+            start = skipped_to
+
+        compactor = LogCompactor(max_output_lines)
+        decoder = codecs.getincrementaldecoder(codec)(errors="replace")
+        pending = ""
+        f.seek(start)
+        remaining = size - start
+        while remaining > 0:
+            chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            lines = (pending + decoder.decode(chunk)).split("\n")
+            pending = lines.pop()
+            for line in lines:
+                compactor.feed(line.rstrip("\r"))
+        pending += decoder.decode(b"", final=True)
+        if pending:
+            compactor.feed(pending.rstrip("\r"))
+
+        end = _last_line_end(f, start, size, newline, floor) if pending else size
+
+    output = compactor.finish()
+    if skipped:
+        output.insert(0, f"[... {skipped} older bytes skipped]")
+    if compactor.dropped_lines:
+        output.insert(0, f"[... {compactor.dropped_lines} earlier compacted lines omitted]")
+
+
+    traces = {}
+    for key, count in compactor.traces.items():
+        if count > 1:
+            traces[key.split("\n", 1)[0]] = count
+
+    tail = LogTail(
+        path=path,
+        text="\n".join(output) if compactor.lines_in else "",
+        start=start,
+        end=end,
+        lines_read=compactor.lines_in,
+        lines_shown=len(output),
+        repeated_lines=compactor.repeated_lines,
+        trace_counts=traces,
+        skipped_bytes=skipped,
+        incremental=resumed,
+        seconds=time.perf_counter() - start_time,
+        fingerprint=fingerprint,
+        fingerprint_size=fingerprint_size
+    )
+    if incremental and commit:
+        offsets.commit(tail)
+    logger.info(
+        f"Log tail: {tail.lines_read} lines -> {tail.lines_shown} "
+        f"({tail.repeated_lines} repeated) in {tail.seconds * 1000:.0f}ms"
+    )
+    return tail
+
+
+def benchmark_log_tail(repeats: int = 20000) -> Dict[str, float]:
+    """Measure read time and compaction of a log with repeated stack traces.
+
+    Args:
+        repeats: Number of error blocks in the synthetic log
+
+    Returns:
+        Dictionary of measurements
+    """
+    import logging
+    import shutil
+    import tempfile
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "app.log")
+    block = (
+        "2024-05-01 10:00:{s:02d},123 ERROR request {i} failed\n"
+        "Traceback (most recent call last):\n"
+        '  File "app.py", line 10, in handle\n'
+        "    process(request)\n"
+        '  File "app.py", line 20, in process\n'
+        "    raise ValueError('bad request')\n"
+        "ValueError: bad request\n"
+        "2024-05-01 10:00:{s:02d},124 INFO retrying\n"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(repeats):
+            f.write(block.format(s=i % 60, i=i % 3))
+
+    store = LogOffsetStore(Path(folder) / "offsets.json")
+    logging.disable(logging.INFO)
+    try:
+        full = read_log_tail(path, tail_lines=10 ** 9, offsets=store)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("2024-05-01 10:01:00,000 INFO shutdown\n")
+        incremental = read_log_tail(path, offsets=store)
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        "log_mb": full.end / (1024 * 1024),
+        "full_read_ms": full.seconds * 1000,
+        "lines_read": full.lines_read,
+        "lines_shown": full.lines_shown,
+        "incremental_ms": incremental.seconds * 1000,
+        "incremental_lines": incremental.lines_read,
+    }
+
+
+if __name__ == "__main__":
+    for name, value in benchmark_log_tail().items():
+        print(f"{name:<18} {value:10.1f}")
@@ -0,0 +1,168 @@
+"""Extraction of file-annotated code blocks from agent output.
+
+Agents often answer with several fenced code blocks meant for different
+files. A block is written to a file only when its path is stated
+explicitly, in one of these forms:
+
+    ```python src/app.py            (path in the info string)
+    ```js title="web/main.js"       (title=/file=/filename=/path= attribute)
+
+    **src/app.py**                  (path alone on the line before the fence:
+    ```python                        plain, bold, `code`, heading, "File: ...",
+                                     optionally ending with ':')
+
+    ```python
+    # file: src/app.py              (annotation comment on the first line,
+                                     removed from the written content)
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('OutputFiles')
+
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})\s*(.*?)\s*$")
+
+# A relative file path: has a directory or an extension (so "python" is not a path)
+_PATH = r"[\w.\-]+(?:[/\\][\w.\-]+)*"
+_PATH_LIKE = re.compile(rf"^(?:{_PATH}[/\\][\w.\-]+|{_PATH}\.[A-Za-z0-9_]{{1,10}}|Dockerfile|Makefile)$")
+
+_ATTRIBUTE = re.compile(r"""\b(?:title|file|filename|path)=["']?([^"'\s]+)["']?""")
+
+# Line before the fence: "### File: `src/app.py`:" and similar
+_HEADER = re.compile(
+    r"^\s*(?:#{1,6}\s+|[-*]\s+)?(?:(?:file|filename|path)\s*:\s*)?"
+    r"(?:\*\*|__)?`?([^`*\s]+?)`?(?:\*\*|__)?\s*:?\s*$",
+    re.IGNORECASE
+)
+
+# First line inside the block: "# file: src/app.py", "// filename: x.js", "<!-- file: x.html -->"
+_ANNOTATION = re.compile(r"^\s*(?:#|//|--|;|/\*|<!--)\s*(?:file|filename|path)\s*:\s*(\S+?)\s*(?:\*/|-->)?\s*$", re.IGNORECASE)
+
+
+@dataclass
+class FileBlock:
+    """A code block annotated with its target path.
+
+    Attributes:
+        path: Relative path as written by the agent
+        content: Block content (ends with a newline)
+        language: Language from the fence info string ("" if none)
+    """
+    path: str
+    content: str
+    language: str = ""
+
+
+def _is_path(text: str) -> bool:
+    """Check if text looks like a relative file path."""
+    return bool(text) and bool(_PATH_LIKE.match(text))
+
+
+def path_from_info(info: str) -> Optional[str]:
+    """Get the path stated in a fence info string (None if none)."""
+    match = _ATTRIBUTE.search(info)
+    if match:
+        return match.group(1)
+
+    tokens = info.split()
+    if not tokens:
+        return None
+    # "python:src/app.py"
+    if ":" in tokens[0]:
+        candidate = tokens[0].split(":", 1)[1]
+        if _is_path(candidate):
+            return candidate
+    for token in tokens[:2]:
+        if _is_path(token):
+            return token
+    return None
+
+
+def path_from_header(line: str) -> Optional[str]:
+    """Get the path stated alone on the line before a fence (None if none)."""
+    match = _HEADER.match(line)
+    if match and _is_path(match.group(1)):
+        return match.group(1)
+    return None
+
+
+def extract_files(content: str) -> List[FileBlock]:
+    """Find the file-annotated code blocks in agent output.
+
+    Blocks without an explicit path are ignored. If a path appears more than
+    once, the last block wins.
+
+    Args:
+        content: Agent output (markdown)
+
+    Returns:
+        File blocks in order of first appearance
+    """
+    blocks: dict = {}
+    lines = content.splitlines()
+    index = 0
+    previous = ""  # Last non-empty line outside code blocks
+
+    while index < len(lines):
+        line = lines[index]
+        fence = _FENCE.match(line)
+        if not fence:
+            if line.strip():
+                previous = line
+            index += 1
+            continue
+
+        marker, info = fence.group(1), fence.group(2)
+        body = []
+        index += 1
+        while index < len(lines):
+            closing = _FENCE.match(lines[index])
+            if (closing and closing.group(1)[0] == marker[0]
+                    and len(closing.group(1)) >= len(marker) and not closing.group(2)):
+                break
+            body.append(lines[index])
+            index += 1
+        index += 1  # Skip the closing fence
+
+        path = path_from_info(info) or path_from_header(previous)
+        if not path and body:
+            annotation = _ANNOTATION.match(body[0])
+            if annotation and _is_path(annotation.group(1)):
+                path = annotation.group(1)
+                body = body[1:]
+        previous = ""
+
+        if not path:
+            continue
+        path = path.replace("\\", "/")
+        language = info.split()[0].split(":")[0] if info.split() else ""
+        if path in blocks:
+            logger.info(f"{path} appears more than once - using the last block")
+            del blocks[path]
+        blocks[path] = FileBlock(path=path, content="\n".join(body) + "\n",
+                                 language="" if _is_path(language) else language)
+
+    return list(blocks.values())
+
+
+def resolve_output_path(context_folder: str, relative_path: str) -> Optional[Path]:
+    """Resolve a block path inside the context folder.
+
+    Args:
+        context_folder: Folder the files are written to
+        relative_path: Path from the agent output
+
+    Returns:
+        Absolute path, or None if the path is absolute or leaves the folder
+    """
+    if relative_path.startswith(("/", "~")) or re.match(r"^[A-Za-z]:", relative_path):
+        return None
+    root = Path(context_folder).resolve()
+    target = (root / relative_path).resolve()
+    if target == root or not target.is_relative_to(root):
+        return None
+    return target
@@ -4,12 +4,17 @@ Handles different output modes for agent results.
 """
 
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from PyQt6.QtWidgets import QApplication
 from agents.output_modes import OutputMode, AgentResult
 from core.selection_manager import SelectionManager
 from core.interactive_editor import InteractiveEditorDialog
+from core.output_files import extract_files, resolve_output_path
+from core.output_patch import PatchError, PatchReport, apply_patches, parse_patches
+from core.output_writer import WriteResult, get_output_writer
 from utils.logger import setup_logger
 
 logger = setup_logger('OutputHandler')
@@ -61,6 +66,14 @@ class OutputHandler:
             elif mode == OutputMode.FILE:
                 return self._handle_file(result, context_folder)
 
+            # FILES: save each annotated code block to its file
+            elif mode == OutputMode.FILES:
+                return self._handle_files(result, context_folder)
+
+            # PATCH: apply edits to files in place
+            elif mode == OutputMode.PATCH:
+                return self._handle_patch(result, context_folder)
+
             # INTERACTIVE_EDITOR: preview and edit
             elif mode == OutputMode.INTERACTIVE_EDITOR:
                 return self._handle_interactive(result, context_folder)
@@ -69,6 +82,10 @@ class OutputHandler:
             elif mode == OutputMode.PASTE_TEXT:
                 return self._handle_paste_text(result)
 
+            # PASTE_STREAM: already pasted while streaming
+            elif mode == OutputMode.PASTE_STREAM:
+                return self._handle_paste_stream(result)
+
             else:
                 self.logger.warning(f"Unknown mode: {mode}, defaulting to AUTO")
                 return self._handle_auto(result, context_folder)
@@ -135,7 +152,12 @@ class OutputHandler:
 
 
     def _handle_file(self, result: AgentResult, context_folder: Optional[str]) -> bool:
-        """Save content to file."""
+        """Save content to file.
+
+        The file is written atomically on the output writer's I/O thread
+        (core.output_writer); if it changed since the job started, the
+        output is saved next to it instead.
+        """
         if not context_folder:
             self.logger.warning("No context folder for FILE mode, falling back to clipboard")
             return self._handle_clipboard_pure(result)
@@ -149,15 +171,16 @@ class OutputHandler:
         file_path = Path(context_folder) / filename
 
         try:
-            # Ensure directory exists
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write content
+            # Queue the write (directories are created by the writer)
             content = result.get_pure_content()
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            get_output_writer().submit(
+                file_path,
+                content,
+                started_at=result.metadata.get("started_at"),
+                callback=self._on_file_written
+            )
 
-            self.logger.info(f"✅ Saved to file: {file_path}")
+            self.logger.info(f"💾 Queued write: {file_path}")
 
             # Also copy to clipboard for convenience
             self.selection_manager.copy_to_clipboard(content)
@@ -169,6 +192,153 @@ class OutputHandler:
             self.logger.error(f"❌ Failed to save file: {e}")
             return False
 
+    def _on_file_written(self, write: WriteResult) -> None:
+        """Report a finished file write (called on the writer's I/O thread)."""
+        if write.error:
+            message, level = f"❌ Failed to save {write.requested_path}: {write.error}", "error"
+        elif write.conflict:
+            message, level = (
+                f"⚠️ {os.path.basename(write.requested_path)} changed while the agent was working - "
+                f"saved as {os.path.basename(write.path)}", "warning"
+            )
+        elif write.unchanged:
+            message, level = f"✅ {write.path} already up to date", "success"
+        else:
+            message, level = f"✅ Saved to file: {write.path} ({write.latency_ms:.0f}ms)", "success"
+
+        getattr(self.logger, "info" if level == "success" else level)(message)
+        if self.system_signals:
+            self.system_signals.log_message_signal.emit(message, level)
+
+
+    def _handle_files(self, result: AgentResult, context_folder: Optional[str]) -> bool:
+        """Save each file-annotated code block to its path (see core.output_files).
+
+        Files are written in parallel by the output writer, with the same
+        atomic and conflict semantics as FILE mode; a summary is logged once
+        all of them are done. Output without annotated blocks is saved as a
+        single file.
+        """
+        if not context_folder:
+            self.logger.warning("No context folder for FILES mode, falling back to clipboard")
+            return self._handle_clipboard_pure(result)
+
+        content = result.get_pure_content()
+        blocks = extract_files(content)
+        if not blocks:
+            self.logger.info("No file-annotated code blocks, using FILE mode")
+            return self._handle_file(result, context_folder)
+
+        targets = []
+        skipped = []
+        for block in blocks:
+            path = resolve_output_path(context_folder, block.path)
+            if path is None:
+                self.logger.warning(f"⚠️ Skipping {block.path}: outside the context folder")
+                skipped.append(block.path)
+            else:
+                targets.append((path, block))
+
+        writes: List[WriteResult] = []
+        lock = threading.Lock()
+        start = time.perf_counter()
+
+        def on_written(write: WriteResult) -> None:
+            with lock:
+                writes.append(write)
+                if len(writes) < len(targets):
+                    return
+            self._report_files(context_folder, writes, skipped, time.perf_counter() - start)
+
+        writer = get_output_writer()
+        for path, block in targets:
+            writer.submit(path, block.content, started_at=result.metadata.get("started_at"), callback=on_written)
+
+        self.logger.info(f"💾 Saving {len(targets)} files to {context_folder}")
+        if not targets:
+            self._report_files(context_folder, writes, skipped, 0.0)
+
+        # Also copy to clipboard for convenience
+        self.selection_manager.copy_to_clipboard(content)
+        return bool(targets)
+
+    def _report_files(self, context_folder: str, writes: List[WriteResult],
+                      skipped: List[str], seconds: float) -> None:
+        """Log the summary of a FILES mode activation."""
+        def relative(path: str) -> str:
+            return os.path.relpath(path, context_folder)
+
+        written = [relative(w.path) for w in writes if not w.error and not w.conflict and not w.unchanged]
+        lines = [f"📂 Saved {len(written)} of {len(writes) + len(skipped)} files in {seconds * 1000:.0f}ms"]
+        if written:
+            lines.append(f"  ✅ {', '.join(written)}")
+        for w in writes:
+            if w.conflict:
+                lines.append(f"  ⚠️ {relative(w.requested_path)} changed meanwhile - saved as {relative(w.path)}")
+            elif w.unchanged:
+                lines.append(f"  ➖ {relative(w.path)} already up to date")
+            elif w.error:
+                lines.append(f"  ❌ {relative(w.requested_path)}: {w.error}")
+        for path in skipped:
+            lines.append(f"  ⛔ {path}: outside the context folder")
+
+        problems = any(w.error for w in writes)
+        level = "error" if problems else "warning" if skipped or any(w.conflict for w in writes) else "success"
+        message = "\n".join(lines)
+        getattr(self.logger, "info" if level == "success" else level)(message)
+        if self.system_signals:
+            self.system_signals.log_message_signal.emit(message, level)
+
+    def _handle_patch(self, result: AgentResult, context_folder: Optional[str]) -> bool:
+        """Apply search/replace blocks and unified diffs in place (see core.output_patch).
+
+        Nothing is written unless every edit applies. The output is also
+        copied to the clipboard so failed edits can be applied by hand.
+        """
+        content = result.get_pure_content()
+        self.selection_manager.copy_to_clipboard(content)
+
+        if not context_folder:
+            self.logger.warning("No context folder for PATCH mode, output copied to clipboard")
+            return False
+
+        try:
+            patches = parse_patches(content)
+        except PatchError as e:
+            patches = []
+            self.logger.warning(f"⚠️ {e}")
+        if not patches:
+            message, level = "⚠️ No edits found in the output - copied to clipboard", "warning"
+        else:
+            report = apply_patches(context_folder, patches)
+            message, level = self._describe_patch(result, report), "success" if report.ok else "error"
+
+        getattr(self.logger, "info" if level == "success" else level)(message)
+        if self.system_signals:
+            self.system_signals.log_message_signal.emit(message, level)
+        return level == "success"
+
+    @staticmethod
+    def _describe_patch(result: AgentResult, report: PatchReport) -> str:
+        """Summarize a patch report, with output tokens vs. a full rewrite."""
+        if not report.ok:
+            state = "rolled back" if report.rolled_back else "not applied"
+            errors = "\n".join(f"  ❌ {error}" for error in report.errors)
+            return f"🩹 Patch {state} - no files changed, output copied to clipboard\n{errors}"
+
+        lines = [
+            f"🩹 Patched {len(report.files)} files, created {len(report.created)} "
+            f"({report.hunks} edits, {report.fuzzy_hunks} fuzzy) in {report.apply_seconds * 1000:.0f}ms"
+        ]
+        if report.files:
+            lines.append(f"  ✏️ {', '.join(report.files)}")
+        if report.created:
+            lines.append(f"  ➕ {', '.join(report.created)}")
+
+        output_tokens = (result.metadata.get("usage") or {}).get("output_tokens")
+        if output_tokens:
+            lines.append(f"  📉 {output_tokens} output tokens vs ~{report.full_rewrite_tokens} for full rewrites")
+        return "\n".join(lines)
 
     def _handle_interactive(self, result: AgentResult, context_folder: Optional[str]) -> bool:
         """Open interactive editor for preview and editing."""
@@ -244,3 +414,31 @@ class OutputHandler:
             # Fallback: just copy to clipboard and let user paste manually
             self.logger.info("📋 Content copied to clipboard (paste manually with Ctrl+V)")
             return True
+
+    def _handle_paste_stream(self, result: AgentResult) -> bool:
+        """Finish a streaming paste (see core.stream_paster).
+
+        The text was pasted at the cursor while it was generated; the full
+        content is also left on the clipboard. Results that were not
+        streamed (e.g. cached ones) are pasted at once.
+        """
+        report = result.metadata.get("stream_paste")
+        if report is None or result.metadata.get("reused_result"):
+            return self._handle_paste_text(result)
+
+        content = result.get_pure_content()
+        if not self.selection_manager.copy_to_clipboard(content):
+            self.logger.error("❌ Failed to copy to clipboard")
+            return False
+
+        if report["aborted"]:
+            self.logger.warning(
+                f"⚠️ Streaming paste stopped after {report['pasted_chars']} chars - "
+                f"full content copied to clipboard ({len(content)} chars)"
+            )
+        else:
+            self.logger.info(
+                f"✅ Streamed {report['pasted_chars']} chars in {report['chunks']} chunks "
+                f"(first after {report['first_paste_ms']}ms)"
+            )
+        return True
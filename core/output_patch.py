@@ -0,0 +1,517 @@
+"""Patch output for AgentClick system.
+
+With the PATCH output mode agents change existing files with edits instead
+of regenerating them whole, which is much cheaper for small changes to
+large files. Two edit formats are accepted:
+
+    src/app.py                      (path on the line before the block,
+    <<<<<<< SEARCH                   or in the info string of its fence)
+    old lines
+    =======
+    new lines
+    >>>>>>> REPLACE
+
+    --- a/src/app.py                (unified diff)
+    +++ b/src/app.py
+    @@ -10,3 +10,3 @@
+     context
+    -old line
+    +new line
+
+Hunks are located like GNU patch does: at the stated line first, then the
+nearest match elsewhere, then ignoring trailing whitespace or indentation,
+then with up to two lines of leading/trailing context dropped. Every edit
+is validated before anything is written; if one fails, no file changes,
+and if a write fails, files already written are restored.
+"""
+
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from core.output_files import path_from_header, path_from_info, resolve_output_path
+from utils.logger import setup_logger
+
+logger = setup_logger('OutputPatch')
+
+# Added to the prompt of agents using the PATCH output mode
+PATCH_FORMAT_INSTRUCTIONS = """OUTPUT FORMAT:
+Change files with edit blocks instead of rewriting them. For each change, write the file path (relative to the context folder) on its own line, then:
+<<<<<<< SEARCH
+exact lines currently in the file, with a few lines of context
+=======
+the lines that replace them
+>>>>>>> REPLACE
+Keep SEARCH sections short and unique in the file. Use an empty SEARCH section to create a new file. Unified diffs (--- a/path, +++ b/path, @@ hunks) are also accepted."""
+
+# Most context lines dropped from each end of a hunk when it does not match
+MAX_FUZZ = 2
+
+_FENCE = re.compile(r"^ {0,3}(?:`{3,}|~{3,})\s*(.*?)\s*$")
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_SEARCH = re.compile(r"^\s*<{5,9} ?SEARCH\s*$")
+_DIVIDER = re.compile(r"^\s*={5,9}\s*$")
+_REPLACE = re.compile(r"^\s*>{5,9} ?REPLACE\s*$")
+
+
+class PatchError(Exception):
+    """An edit could not be parsed or applied."""
+
+
+@dataclass
+class Hunk:
+    """One edit of a file.
+
+    Attributes:
+        lines: (op, text) pairs; op is " " (context), "-" (removed) or "+" (added)
+        old_start: 1-based line the hunk starts at (0 if unknown, e.g. search/replace)
+    """
+    lines: List[Tuple[str, str]]
+    old_start: int = 0
+
+    @property
+    def old_lines(self) -> List[str]:
+        """Lines the hunk expects in the file."""
+        return [text for op, text in self.lines if op != "+"]
+
+    @property
+    def added(self) -> int:
+        """Number of added lines."""
+        return sum(1 for op, _ in self.lines if op == "+")
+
+    def trimmed(self, fuzz: int) -> Optional["Hunk"]:
+        """Copy without up to fuzz context lines at each end (None if nothing to drop)."""
+        if not fuzz:
+            return self
+        lines = list(self.lines)
+        start = 0
+        for _ in range(fuzz):
+            if lines and lines[0][0] == " ":
+                lines.pop(0)
+                start += 1
+            if lines and lines[-1][0] == " ":
+                lines.pop()
+        if len(lines) == len(self.lines) or not any(op == "-" or op == " " for op, _ in lines):
+            return None
+        return Hunk(lines, self.old_start + start if self.old_start else 0)
+
+
+@dataclass
+class FilePatch:
+    """Edits of one file.
+
+    Attributes:
+        path: Relative path as written by the agent
+        hunks: Edits in file order (diffs) or output order (search/replace)
+        new_file: The file is created by the patch
+        delete: The diff deletes the file (not applied)
+    """
+    path: str
+    hunks: List[Hunk] = field(default_factory=list)
+    new_file: bool = False
+    delete: bool = False
+
+
+@dataclass
+class PatchReport:
+    """Outcome of applying the patches of an activation.
+
+    Attributes:
+        files: Relative paths changed
+        created: Relative paths created
+        hunks: Hunks applied
+        fuzzy_hunks: Hunks that needed whitespace or context fuzz
+        errors: Why edits were rejected (nothing is written if any)
+        rolled_back: A write failed and the files were restored
+        apply_seconds: Time to validate and write
+        full_rewrite_tokens: Estimated tokens to output the changed files whole
+    """
+    files: List[str] = field(default_factory=list)
+    created: List[str] = field(default_factory=list)
+    hunks: int = 0
+    fuzzy_hunks: int = 0
+    errors: List[str] = field(default_factory=list)
+    rolled_back: bool = False
+    apply_seconds: float = 0.0
+    full_rewrite_tokens: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """True if every edit was applied."""
+        return not self.errors and not self.rolled_back
+
+
+def _diff_path(header: str) -> Optional[str]:
+    """Get the path of a ---/+++ line (None for /dev/null)."""
+    path = header[4:].split("\t")[0].strip()
+    if path == "/dev/null":
+        return None
+    if path.startswith(("a/", "b/")):
+        path = path[2:]
+    return path
+
+
+def parse_patches(content: str) -> List[FilePatch]:
+    """Find the search/replace blocks and unified diffs in agent output.
+
+    Args:
+        content: Agent output
+
+    Returns:
+        File patches in order of first appearance (one per path)
+    """
+    patches: Dict[str, FilePatch] = {}
+    lines = content.splitlines()
+    current: Optional[FilePatch] = None  # File of the diff being read
+    last_path: Optional[str] = None  # Last path stated before a search/replace block
+    index = 0
+
+    def patch_for(path: str) -> FilePatch:
+        path = path.replace("\\", "/")
+        if path not in patches:
+            patches[path] = FilePatch(path)
+        return patches[path]
+
+    while index < len(lines):
+        line = lines[index]
+
+        # Unified diff file header
+        if line.startswith("--- ") and index + 1 < len(lines) and lines[index + 1].startswith("+++ "):
+            old_path, new_path = _diff_path(line), _diff_path(lines[index + 1])
+            current = patch_for(new_path or old_path or "")
+            current.new_file = current.new_file or old_path is None
+            current.delete = new_path is None
+            index += 2
+            continue
+
+        # Unified diff hunk
+        header = _HUNK_HEADER.match(line)
+        if header and current is not None:
+            hunk = Hunk([], int(header.group(1)))
+            index += 1
+            while index < len(lines):
+                text = lines[index]
+                if text.startswith((" ", "-", "+")) and not (
+                        text.startswith("--- ") and index + 1 < len(lines) and lines[index + 1].startswith("+++ ")):
+                    hunk.lines.append((text[0], text[1:]))
+                elif text == "":
+                    hunk.lines.append((" ", ""))  # Context line that lost its leading space
+                elif not text.startswith("\\"):  # "\ No newline at end of file"
+                    break
+                index += 1
+            while hunk.lines and hunk.lines[-1] == (" ", ""):
+                hunk.lines.pop()
+            if hunk.lines:
+                current.hunks.append(hunk)
+            continue
+
+        # Search/replace block
+        if _SEARCH.match(line):
+            search, replace = [], []
+            index += 1
+            while index < len(lines) and not _DIVIDER.match(lines[index]):
+                search.append(lines[index])
+                index += 1
+            index += 1
+            while index < len(lines) and not _REPLACE.match(lines[index]):
+                replace.append(lines[index])
+                index += 1
+            index += 1
+            if not last_path:
+                raise PatchError("SEARCH/REPLACE block without a file path")
+            patch = patch_for(last_path)
+            patch.hunks.append(Hunk([("-", text) for text in search] + [("+", text) for text in replace]))
+            continue
+
+        fence = _FENCE.match(line)
+        if fence:
+            last_path = path_from_info(fence.group(1)) or last_path
+        elif line.strip():
+            last_path = path_from_header(line) or last_path
+            current = None if not line.startswith(("diff ", "index ")) else current
+        index += 1
+
+    return [patch for patch in patches.values() if patch.hunks or patch.delete]
+
+
+def _normalizers():
+    """Line comparisons from strict to loose."""
+    return (lambda s: s, str.rstrip, str.strip)
+
+
+def _find(lines: List[str], old: List[str], expected: Optional[int], normalize) -> Optional[int]:
+    """Find old in lines, nearest to expected.
+
+    Raises:
+        PatchError: If expected is None (no line numbers, as in SEARCH/REPLACE
+            blocks) and old matches more than one place
+    """
+    if not old:
+        return None
+    target = [normalize(text) for text in old]
+    first = target[0]
+    best = None
+    matches = 0
+    for i in range(len(lines) - len(old) + 1):
+        if normalize(lines[i]) != first:
+            continue
+        if all(normalize(lines[i + j]) == target[j] for j in range(1, len(old))):
+            matches += 1
+            if expected is None:
+                best = i if best is None else best
+            elif best is None or abs(i - expected) < abs(best - expected):
+                best = i
+            elif i > expected:
+                break
+    if expected is None and matches > 1:
+        raise PatchError(f"SEARCH matches {matches} places")
+    return best
+
+
+def _reindent(text: str, hunk_indent: str, file_indent: str) -> str:
+    """Move an added line from the hunk's indentation to the file's."""
+    if text.startswith(hunk_indent):
+        return file_indent + text[len(hunk_indent):]
+    return text
+
+
+def _leading_ws(text: str) -> str:
+    """Leading whitespace of a line."""
+    return text[:len(text) - len(text.lstrip())]
+
+
+def apply_hunks(lines: List[str], hunks: List[Hunk]) -> Tuple[List[str], int]:
+    """Apply hunks to the lines of a file.
+
+    Args:
+        lines: File lines (without newlines)
+        hunks: Hunks to apply in order
+
+    Returns:
+        (new lines, number of hunks that needed fuzz)
+
+    Raises:
+        PatchError: If a hunk cannot be located
+    """
+    lines = list(lines)
+    offset = 0
+    fuzzy = 0
+
+    for number, hunk in enumerate(hunks, 1):
+        if not hunk.old_lines:
+            # Pure insertion (diff "-n,0") or empty SEARCH
+            if hunk.old_start:
+                at = min(max(hunk.old_start + offset, 0), len(lines))
+            elif not any(text.strip() for text in lines):
+                at, lines = 0, []
+            else:
+                raise PatchError(f"hunk {number}: empty SEARCH section on a file that is not empty")
+            added = [text for _, text in hunk.lines]
+            lines[at:at] = added
+            offset += len(added)
+            continue
+
+        located = None
+        for fuzz in range(MAX_FUZZ + 1):
+            candidate = hunk.trimmed(fuzz)
+            if candidate is None:
+                break
+            expected = candidate.old_start - 1 + offset if candidate.old_start else None
+            for level, normalize in enumerate(_normalizers()):
+                try:
+                    at = _find(lines, candidate.old_lines, expected, normalize)
+                except PatchError as e:
+                    raise PatchError(f"hunk {number}: {e}") from None
+                if at is not None:
+                    located = (candidate, at, level, fuzz)
+                    break
+            if located:
+                break
+        if not located:
+            preview = hunk.old_lines[0].strip()[:60]
+            raise PatchError(f"hunk {number} does not match the file (starting with {preview!r})")
+
+        candidate, at, level, fuzz = located
+        if level or fuzz:
+            fuzzy += 1
+
+        # Keep the file's own context lines; reindent added lines if only indentation matched
+        hunk_indent = _leading_ws(candidate.old_lines[0])
+        file_indent = _leading_ws(lines[at])
+        replacement = []
+        position = at
+        for op, text in candidate.lines:
+            if op == " ":
+                replacement.append(lines[position])
+                position += 1
+            elif op == "-":
+                position += 1
+            else:
+                replacement.append(_reindent(text, hunk_indent, file_indent) if level == 2 else text)
+
+        lines[at:position] = replacement
+        offset += len(replacement) - (position - at)
+
+    return lines, fuzzy
+
+
+def _split_lines(text: str) -> Tuple[List[str], str, bool]:
+    """Split file text into lines, newline style and final-newline flag."""
+    newline = "\r\n" if "\r\n" in text else "\n"
+    text = text.replace("\r\n", "\n")
+    ends_with_newline = text.endswith("\n")
+    if ends_with_newline:
+        text = text[:-1]
+    return (text.split("\n") if text else []), newline, ends_with_newline
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """Get (mtime_ns, size) of a file (None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def apply_patches(context_folder: str, patches: List[FilePatch]) -> PatchReport:
+    """Validate and apply file patches under the context folder.
+
+    All patches are applied in memory first; files are only written if
+    every hunk applies. If a write fails, the files written so far are
+    restored (or removed, if they were created).
+
+    Args:
+        context_folder: Folder the patch paths are relative to
+        patches: Patches from parse_patches()
+
+    Returns:
+        PatchReport
+    """
+    from core.input_budget import estimate_tokens
+    from core.output_writer import write_atomic
+
+    report = PatchReport()
+    start = time.perf_counter()
+    pending = []  # (relative path, path, original bytes or None, stat, new bytes)
+
+    for patch in patches:
+        path = resolve_output_path(context_folder, patch.path)
+        if path is None:
+            report.errors.append(f"{patch.path}: outside the context folder")
+            continue
+        if patch.delete:
+            report.errors.append(f"{patch.path}: file deletions are not applied")
+            continue
+
+        try:
+            stat = _stat_key(path)
+            original = path.read_bytes() if stat is not None else None
+            if original is None and not patch.new_file and any(h.old_lines for h in patch.hunks):
+                raise PatchError("file does not exist")
+
+            text = original.decode("utf-8") if original is not None else ""
+            lines, newline, ends_with_newline = _split_lines(text)
+            new_lines, fuzzy = apply_hunks(lines, patch.hunks)
+        except UnicodeDecodeError:
+            report.errors.append(f"{patch.path}: not a UTF-8 text file")
+            continue
+        except (PatchError, OSError) as e:
+            report.errors.append(f"{patch.path}: {e}")
+            continue
+
+        new_text = "\n".join(new_lines) + ("\n" if ends_with_newline or original is None else "")
+        pending.append((patch.path, path, original, stat, new_text.replace("\n", newline).encode("utf-8")))
+        report.hunks += len(patch.hunks)
+        report.fuzzy_hunks += fuzzy
+        report.full_rewrite_tokens += estimate_tokens(new_text)
+
+    if report.errors:
+        report.apply_seconds = time.perf_counter() - start
+        return report
+
+    written = []
+    try:
+        for relative, path, original, stat, data in pending:
+            if _stat_key(path) != stat:
+                raise PatchError(f"{relative} changed while the patch was applied")
+            if data != original:
+                write_atomic(path, data)
+                written.append((path, original))
+            (report.created if original is None else report.files).append(relative)
+    except Exception as e:
+        report.errors.append(str(e))
+        report.rolled_back = True
+        for path, original in reversed(written):
+            try:
+                if original is None:
+                    path.unlink()
+                else:
+                    write_atomic(path, original)
+            except OSError as restore_error:
+                logger.error(f"Failed to restore {path}: {restore_error}")
+        report.files, report.created = [], []
+
+    report.apply_seconds = time.perf_counter() - start
+    return report
+
+
+def benchmark_patch(file_lines: int = 3000, edits: int = 3) -> Dict[str, float]:
+    """Compare a patch with a full rewrite of a large file.
+
+    Args:
+        file_lines: Lines in the generated file
+        edits: Functions changed
+
+    Returns:
+        Output tokens and apply/write times of both approaches
+    """
+    import tempfile
+    from core.input_budget import estimate_tokens
+    from core.output_writer import write_atomic
+
+    functions = file_lines // 6
+    source = "".join(
+        f"def function_{i}(value):\n    \"\"\"Function {i}.\"\"\"\n    result = value * {i}\n"
+        f"    result += {i} // 2\n    return result\n\n"
+        for i in range(functions)
+    )
+    blocks = []
+    for i in range(1, functions, functions // edits)[:edits]:
+        blocks.append(
+            f"module.py\n<<<<<<< SEARCH\n    result = value * {i}\n=======\n"
+            f"    result = value * {i} + 1\n>>>>>>> REPLACE\n"
+        )
+    patch_text = "\n".join(blocks)
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = Path(folder) / "module.py"
+        path.write_text(source, encoding="utf-8")
+
+        start = time.perf_counter()
+        report = apply_patches(folder, parse_patches(patch_text))
+        patch_seconds = time.perf_counter() - start
+        assert report.ok, report.errors
+
+        rewritten = path.read_text(encoding="utf-8")
+        start = time.perf_counter()
+        write_atomic(path, rewritten.encode("utf-8"))
+        rewrite_seconds = time.perf_counter() - start
+
+    return {
+        "patch_tokens": estimate_tokens(patch_text),
+        "rewrite_tokens": estimate_tokens(rewritten),
+        "patch_apply_ms": patch_seconds * 1000,
+        "rewrite_write_ms": rewrite_seconds * 1000,
+    }
+
+
+if __name__ == "__main__":
+    for lines in (1000, 3000, 10000):
+        stats = benchmark_patch(lines)
+        print(
+            f"{lines} lines: patch {stats['patch_tokens']} tokens, applied in {stats['patch_apply_ms']:.1f}ms | "
+            f"full rewrite {stats['rewrite_tokens']} tokens, written in {stats['rewrite_write_ms']:.1f}ms"
+        )
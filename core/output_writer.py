@@ -0,0 +1,346 @@
+"""Atomic, write-behind file output for AgentClick system.
+
+FILE output is written on background I/O threads so large outputs do not
+block the job (or GUI) thread. Each write goes to a temporary file in the
+target folder that is renamed over the target when complete, so a crash
+mid-write never leaves a truncated file.
+
+If the target changed after the job started (edited by the user, another
+tool or another activation), the output is written side by side
+(e.g. "plan.agentclick.md") instead of clobbering those changes.
+"""
+
+import hashlib
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from utils.logger import setup_logger
+
+logger = setup_logger('OutputWriter')
+
+# Marker inserted before the extension of side-by-side versions
+SIDE_BY_SIDE_MARKER = "agentclick"
+
+
+@dataclass
+class WriteResult:
+    """Outcome of a queued write.
+
+    Attributes:
+        requested_path: Path the output was meant for
+        path: Path actually written (side-by-side version on conflict)
+        conflict: Target changed since the job started
+        unchanged: Target already had this content (nothing written)
+        bytes_written: Encoded size of the content
+        queue_seconds: Time waiting in the queue
+        write_seconds: Time spent writing and renaming
+        error: Error message if the write failed
+    """
+    requested_path: str
+    path: str
+    conflict: bool = False
+    unchanged: bool = False
+    bytes_written: int = 0
+    queue_seconds: float = 0.0
+    write_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def latency_ms(self) -> float:
+        """Submit-to-done latency in milliseconds."""
+        return (self.queue_seconds + self.write_seconds) * 1000
+
+
+@dataclass
+class _WriteJob:
+    """A write waiting for the I/O thread."""
+    path: Path
+    data: bytes
+    started_at: Optional[float]
+    baseline: Optional[Tuple[int, int]]  # (mtime_ns, size) of the target at submit
+    submitted: float
+    future: Future
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int]]:
+    """Get (mtime_ns, size) of a file (None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _same_content(path: Path, data: bytes) -> bool:
+    """Check if a file holds exactly data (hash compared in chunks)."""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        digest = hashlib.blake2b()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return False
+    return digest.digest() == hashlib.blake2b(data).digest()
+
+
+def side_by_side_path(path: Path) -> Path:
+    """Get a free path next to path for a conflicting version.
+
+    Args:
+        path: Target path
+
+    Returns:
+        e.g. plan.agentclick.md, then plan.agentclick-2.md, ...
+    """
+    candidate = path.with_name(f"{path.stem}.{SIDE_BY_SIDE_MARKER}{path.suffix}")
+    number = 2
+    while candidate.exists():
+        candidate = path.with_name(f"{path.stem}.{SIDE_BY_SIDE_MARKER}-{number}{path.suffix}")
+        number += 1
+    return candidate
+
+
+def write_atomic(path: Path, data: bytes, replace_attempts: int = 5) -> None:
+    """Write data to path through a temporary file and an atomic rename.
+
+    Args:
+        path: Target path (parent folders are created)
+        data: Content bytes
+        replace_attempts: Rename attempts (on Windows the target may be
+            briefly locked by an editor or indexer)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if path.exists():
+            try:
+                shutil.copymode(path, temp_path)
+            except OSError:
+                pass
+
+        for attempt in range(replace_attempts):
+            try:
+                os.replace(temp_path, path)
+                return
+            except PermissionError:
+                if attempt == replace_attempts - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class OutputWriter:
+    """Writes files atomically on background I/O threads."""
+
+    def __init__(self, workers: int = 4, max_pending: int = 16, submit_timeout: float = 5.0):
+        """Initialize writer.
+
+        Args:
+            workers: Number of I/O threads (files of one activation are
+                written in parallel)
+            max_pending: Queue size; submit() blocks while the queue is full
+            submit_timeout: Seconds submit() waits for room before writing
+                in the calling thread instead
+        """
+        self.workers = workers
+        self.submit_timeout = submit_timeout
+        self._queue: "queue.Queue[Optional[_WriteJob]]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+        self.writes = 0
+        self.conflicts = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def start(self) -> None:
+        """Start the I/O threads."""
+        with self._lock:
+            if self._threads:
+                return
+            for number in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"OutputWriter-{number}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finish queued writes and stop the I/O threads.
+
+        Args:
+            timeout: Maximum seconds to wait for pending writes
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.perf_counter() + timeout
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.perf_counter()))
+
+    def submit(self, path, content: str, started_at: Optional[float] = None,
+               callback: Optional[Callable[[WriteResult], None]] = None,
+               encoding: str = "utf-8") -> Future:
+        """Queue content to be written to path.
+
+        Args:
+            path: Target path
+            content: Text to write (newlines are translated like text-mode open())
+            started_at: time.time() when the job producing the content started;
+                a target modified after it is not overwritten
+            callback: Called with the WriteResult on an I/O thread
+            encoding: Text encoding
+
+        Returns:
+            Future resolving to a WriteResult
+        """
+        if os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        path = Path(path)
+        future: Future = Future()
+        if callback:
+            future.add_done_callback(lambda f: callback(f.result()))
+
+        job = _WriteJob(
+            path=path,
+            data=content.encode(encoding),
+            started_at=started_at,
+            baseline=_stat_key(path),
+            submitted=time.perf_counter(),
+            future=future
+        )
+
+        self.start()
+        try:
+            self._queue.put(job, timeout=self.submit_timeout)
+        except queue.Full:
+            logger.warning(f"Write queue full - writing {path.name} in the calling thread")
+            self._execute(job)
+        return future
+
+    def flush(self) -> None:
+        """Wait until every queued write is done."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        """Write queued jobs until stopped (I/O threads)."""
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    def _is_conflict(self, job: _WriteJob) -> bool:
+        """Check if the target changed since the job started or was queued."""
+        current = _stat_key(job.path)
+        if current is None:
+            return False  # Missing (or deleted meanwhile): nothing to clobber
+        if current != job.baseline:
+            return True
+        return job.started_at is not None and current[0] > job.started_at * 1e9
+
+    def _execute(self, job: _WriteJob) -> None:
+        """Write one job and resolve its future."""
+        start = time.perf_counter()
+        result = WriteResult(
+            requested_path=str(job.path),
+            path=str(job.path),
+            bytes_written=len(job.data),
+            queue_seconds=start - job.submitted
+        )
+
+        try:
+            if self._is_conflict(job):
+                if _same_content(job.path, job.data):
+                    result.unchanged = True
+                else:
+                    result.conflict = True
+                    target = side_by_side_path(job.path)
+                    result.path = str(target)
+                    write_atomic(target, job.data)
+            else:
+                write_atomic(job.path, job.data)
+        except Exception as e:
+            result.error = str(e)
+            logger.error(f"Failed to write {job.path}: {e}")
+
+        result.write_seconds = time.perf_counter() - start
+        self._record(result)
+        job.future.set_result(result)
+
+    def _record(self, result: WriteResult) -> None:
+        """Update counters and log a finished write."""
+        latency = result.queue_seconds + result.write_seconds
+        with self._lock:
+            self.writes += 1
+            self.conflicts += result.conflict
+            self.unchanged += result.unchanged
+            self.failures += result.error is not None
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+        if result.error is None:
+            logger.info(
+                f"Wrote {result.path} ({result.bytes_written} bytes"
+                f"{', conflict' if result.conflict else ''}{', unchanged' if result.unchanged else ''}) "
+                f"in {result.latency_ms:.1f}ms (queued {result.queue_seconds * 1000:.1f}ms)"
+            )
+
+    def get_stats(self) -> dict:
+        """Get writer counters.
+
+        Returns:
+            Dictionary with writes, conflicts, failures and latencies (ms)
+        """
+        with self._lock:
+            return {
+                "writes": self.writes,
+                "conflicts": self.conflicts,
+                "unchanged": self.unchanged,
+                "failures": self.failures,
+                "pending": self._queue.qsize(),
+                "avg_latency_ms": (self.total_latency / self.writes * 1000) if self.writes else 0.0,
+                "max_latency_ms": self.max_latency * 1000,
+            }
+
+
+# Singleton instance
+_writer: Optional[OutputWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_output_writer() -> OutputWriter:
+    """Get the shared OutputWriter instance (starts its I/O threads).
+
+    Returns:
+        The singleton OutputWriter
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = OutputWriter()
+            _writer.start()
+    return _writer
@@ -0,0 +1,236 @@
+"""Streaming paste-at-cursor output for AgentClick system.
+
+With the PASTE_STREAM output mode the agent's text is pasted into the
+focused application while it is being generated: text deltas from the SDK
+are buffered and pasted (clipboard + Ctrl+V) a sentence or line at a time
+by a worker thread, at most once per min_interval so the target application
+is not flooded.
+
+Pasting stops for good if the foreground window changes (the user moved
+on), and at the separator that BaseAgent._parse_output() treats as the
+start of the agent's thoughts. Trailing newlines are held back until more
+text arrives, so a separator split across deltas is still recognized.
+"""
+
+import re
+import sys
+import threading
+import time
+from typing import Dict, Optional
+from utils.logger import setup_logger
+
+logger = setup_logger('StreamPaster')
+
+# Must match BaseAgent._parse_output(): text after these is not content
+CONTENT_SEPARATORS = ("\n---\n", "\n\n### Reasoning", "\n\n## Thoughts")
+
+# Sentence ends followed by whitespace (the whitespace goes with the next chunk)
+_SENTENCE_END = re.compile(r"[.!?:;](?=\s)")
+
+
+def _foreground_window() -> Optional[int]:
+    """Get the handle of the foreground window (None if unavailable)."""
+    if sys.platform != "win32":
+        return None
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetForegroundWindow()
+    except Exception:
+        return None
+
+
+class StreamingPaster:
+    """Pastes streamed text at the cursor in sentence/line batches.
+
+    Use feed() as the agent's stream callback and finish() with the final
+    result once the agent is done.
+    """
+
+    def __init__(self, selection_manager, min_interval: float = 0.3,
+                 max_chunk_chars: int = 400):
+        """Initialize streaming paster.
+
+        Args:
+            selection_manager: SelectionManager for clipboard operations
+            min_interval: Minimum seconds between two pastes
+            max_chunk_chars: Paste at a space when this much text has no sentence end
+        """
+        self.selection_manager = selection_manager
+        self.min_interval = min_interval
+        self.max_chunk_chars = max_chunk_chars
+
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._buffer = ""
+        self._finishing = False
+        self._content_ended = False  # Separator reached: the rest is thoughts
+        self.aborted = False
+        self.pasted_chars = 0
+        self.chunks = 0
+        self._started = time.perf_counter()
+        self.first_paste_seconds: Optional[float] = None
+
+        self._window = _foreground_window()
+        if self._window is None:
+            logger.debug("Foreground window unavailable - focus changes are not detected")
+
+        self._thread = threading.Thread(target=self._run, name="StreamPaster", daemon=True)
+        self._thread.start()
+
+    def feed(self, text: str) -> None:
+        """Add streamed text (SDK text delta).
+
+        Args:
+            text: Text delta
+        """
+        with self._lock:
+            if self._content_ended or self.aborted:
+                return
+            self._buffer += text
+        self._wake.set()
+
+    def finish(self, result=None, timeout: float = 10.0) -> Dict[str, object]:
+        """Paste the remaining text and stop.
+
+        Args:
+            result: AgentResult of the activation; the stream report is
+                stored in result.metadata["stream_paste"]
+            timeout: Maximum seconds to wait for pending pastes
+
+        Returns:
+            Report with pasted chars, chunks, abort flag and time to first paste
+        """
+        with self._lock:
+            self._finishing = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+        report = {
+            "pasted_chars": self.pasted_chars,
+            "chunks": self.chunks,
+            "aborted": self.aborted,
+            "first_paste_ms": round(self.first_paste_seconds * 1000) if self.first_paste_seconds else None,
+        }
+        if result is not None:
+            result.metadata["stream_paste"] = report
+
+        logger.info(
+            f"Stream paste {'aborted' if self.aborted else 'done'}: {self.pasted_chars} chars "
+            f"in {self.chunks} chunks, first after {report['first_paste_ms']}ms"
+        )
+        return report
+
+    def abort(self) -> None:
+        """Stop pasting (e.g. the agent failed)."""
+        with self._lock:
+            self.aborted = True
+            self._finishing = True
+        self._wake.set()
+
+    def _take_chunk(self) -> Optional[str]:
+        """Remove the next chunk to paste from the buffer.
+
+        Returns:
+            Text to paste, or None if nothing is ready
+        """
+        with self._lock:
+            text = self._buffer
+            final = self._finishing
+
+            for separator in CONTENT_SEPARATORS:
+                index = text.find(separator)
+                if index >= 0:
+                    text = text[:index]
+                    self._content_ended = True
+                    final = True
+
+            if not self.chunks:
+                text = text.lstrip()  # Content is stripped by _parse_output()
+
+            if final:
+                self._buffer = ""
+                text = text.rstrip()
+                return text or None
+
+            cut = max(text.rfind("\n"), self._last_sentence_end(text))
+            if cut <= 0 and len(text) >= self.max_chunk_chars:
+                cut = text.rfind(" ")
+            # Hold back trailing newlines: they may start a separator
+            while cut > 0 and text[cut - 1] == "\n":
+                cut -= 1
+            if cut <= 0:
+                if not self.chunks:
+                    self._buffer = text
+                return None
+
+            self._buffer = text[cut:]
+            return text[:cut]
+
+    @staticmethod
+    def _last_sentence_end(text: str) -> int:
+        """Index just after the last sentence end in text (-1 if none)."""
+        end = -1
+        for match in _SENTENCE_END.finditer(text, max(0, len(text) - 2000)):
+            end = match.end()
+        return end
+
+    def _run(self) -> None:
+        """Paste chunks until finished (worker thread)."""
+        last_paste = 0.0
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+
+            # Batch whatever arrives during the interval
+            delay = self.min_interval - (time.perf_counter() - last_paste)
+            if delay > 0 and not self._finishing:
+                time.sleep(delay)
+
+            pasted = False
+            while not self.aborted:
+                chunk = self._take_chunk()
+                if chunk is None or not self._paste(chunk):
+                    break
+                pasted = True
+                last_paste = time.perf_counter()
+                if not self._finishing:
+                    break  # One chunk per interval while streaming
+
+            with self._lock:
+                if self._finishing and (self.aborted or self._content_ended or not self._buffer):
+                    return
+                pending = bool(self._buffer)
+            if pasted and pending:
+                self._wake.set()  # More may be ready after the interval
+
+    def _paste(self, text: str) -> bool:
+        """Paste one chunk at the cursor.
+
+        Returns:
+            False if pasting was aborted
+        """
+        if self._window is not None and _foreground_window() != self._window:
+            logger.warning("Focus changed - streaming paste stopped")
+            self.abort()
+            return False
+
+        try:
+            import keyboard
+
+            if not self.selection_manager.copy_to_clipboard(text):
+                self.abort()
+                return False
+            time.sleep(0.03)  # Let the clipboard settle before pasting
+            keyboard.press_and_release('ctrl+v')
+            time.sleep(0.05)  # Let the target read the clipboard before it changes again
+
+        except Exception as e:
+            logger.error(f"Streaming paste failed: {e}")
+            self.abort()
+            return False
+
+        if self.first_paste_seconds is None:
+            self.first_paste_seconds = time.perf_counter() - self._started
+        self.pasted_chars += len(text)
+        self.chunks += 1
+        return True
@@ -3,6 +3,8 @@
 Orchestrates all components: click processing, agents, UI, and configuration.
 """
 
+import threading
+from dataclasses import replace
 from typing import Optional, Dict, Any
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 from agents.base_agent import BaseAgent
@@ -13,6 +15,12 @@ from core.selection_manager import SelectionManager
 from core.output_handler import OutputHandler
 from core.input_manager import InputManager
 from core.input_strategy import InputType, InputContent
+from core.file_watcher import get_file_watcher
+from core.output_writer import get_output_writer
+from core.image_pipeline import get_image_encoder
+from core.image_dedup import get_image_dedup_index
+from core.image_store import get_image_store
+from core.capture_region import CaptureMode, resolve_capture_region
 from ui.popup_window import PopupWindow
 from ui.mini_popup import MiniPopupWidget
 from config.agent_config import AgentConfigManager
@@ -28,11 +36,26 @@ class SystemSignals(QObject):
     update_large_popup_agent_signal = pyqtSignal(object)  # Update large popup agent
     log_message_signal = pyqtSignal(str, str)  # message, level
     show_interactive_editor_signal = pyqtSignal(object, object)  # result, context_folder - Open interactive editor in main thread
+    select_region_signal = pyqtSignal(object)  # _RegionRequest - Show region selector in main thread
+
+
+class _RegionRequest:
+    """Region selection handed from the keyboard thread to the Qt main thread."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.region: Optional[tuple] = None
+
+    def finish(self, region: Optional[tuple]) -> None:
+        self.region = region
+        self.done.set()
 
 
 class AgentClickSystem:
     """Main system coordinator."""
 
+    PIXEL_DIGEST_TIMEOUT = 2.0  # Seconds to wait for an image's exact hash before skipping reuse
+
     def __init__(self):
         """Initialize AgentClick system."""
         logger.info("=" * 60)
@@ -46,6 +69,7 @@ class AgentClickSystem:
         self.signals.update_large_popup_agent_signal.connect(self._update_large_popup_agent_in_main_thread)
         self.signals.log_message_signal.connect(self._log_in_main_thread)
         self.signals.show_interactive_editor_signal.connect(self._show_interactive_editor_in_main_thread)  # NOVO: Interactive editor thread-safe
+        self.signals.select_region_signal.connect(self._select_region_in_main_thread)
 
         # Initialize components
         self.input_manager = InputManager()  # NOVO: Gerenciador de múltiplos inputs
@@ -62,11 +86,15 @@ class AgentClickSystem:
         self.mini_popup: Optional[MiniPopupWidget] = MiniPopupWidget(initial_agent)
         self.mini_popup.clicked.connect(self._on_mini_popup_clicked)
         self.mini_popup.file_dropped.connect(self._on_file_dropped)  # NOVO: Drag & drop
+        self.mini_popup.files_dropped.connect(self._on_files_dropped)
         self.mini_popup.show()
 
         # Large popup (shown only when clicked)
         self.large_popup: Optional[PopupWindow] = None
 
+        # Region selector overlay (shown while selecting a screenshot region)
+        self._region_selector = None
+
         # Register callbacks
         self.click_processor.register_pause_handler(self._on_pause_pressed)
         self.click_processor.register_switch_handler(self._on_switch_pressed)
@@ -92,9 +120,16 @@ class AgentClickSystem:
         # Get agent configuration
         agent_name = current_agent.metadata.name
         allowed_inputs = self.config_manager.get_allowed_inputs(agent_name)  # NOVO
+        self.input_manager.set_git_repository(self.config_manager.get_context_folder(agent_name))
+        self.input_manager.set_log_file(self.config_manager.get_log_file(agent_name))
 
-        # NOVO: Usar InputManager para capturar input (auto-detect com filtro)
-        input_content = self.input_manager.capture_input(allowed_inputs=allowed_inputs)
+        if self.config_manager.is_composite(agent_name):
+            # Several sources at once, merged into one input
+            sources = [InputType(s) for s in self.config_manager.get_composite_inputs(agent_name)]
+            input_content = self.input_manager.capture_composite(sources)
+        else:
+            # NOVO: Usar InputManager para capturar input (auto-detect com filtro)
+            input_content = self.input_manager.capture_input(allowed_inputs=allowed_inputs)
 
         if not input_content:
             logger.warning("No input available")
@@ -120,8 +155,9 @@ class AgentClickSystem:
         logger.info(f"Processing with {current_agent.metadata.name}...")
         logger.info(f"Output mode: {output_mode}")
 
-        # Pass image path if available
-        image_path = input_content.image_path
+        # Pass image path if available (every image of a composite input)
+        image_paths = input_content.get_image_paths()
+        image_path = image_paths if len(image_paths) > 1 else input_content.image_path
 
         # Get verbose logging setting
         verbose_logging = self.config_manager.get_verbose_logging(agent_name)
@@ -132,6 +168,23 @@ class AgentClickSystem:
             if self.large_popup:
                 self.signals.log_message_signal.emit(message, "info")
 
+        # Near-duplicate image already processed by this agent
+        cached_result = self._get_cached_image_result(
+            agent_name, input_content, selected_text, output_mode, context_folder, focus_file
+        )
+        if cached_result:
+            self._handle_result(cached_result, current_agent)
+            self.input_manager.commit_input(input_content)
+            return
+
+        # Keep the images from being evicted while the agent uses them
+        for path in image_paths:
+            get_image_store().pin(path)
+
+        # Streaming paste starts at the cursor while the agent is still generating
+        paster = self._create_stream_paster(current_agent, output_mode)
+        stream_kwargs = {"stream_callback": paster.feed} if paster else {}
+
         # Process with agent (this happens in keyboard thread)
         try:
             result = current_agent.process(
@@ -141,10 +194,20 @@ class AgentClickSystem:
                 output_mode,
                 image_path=image_path,  # NOVO: Pass image path
                 verbose_logging=verbose_logging,
-                log_callback=verbose_log_callback
+                log_callback=verbose_log_callback,
+                **stream_kwargs
+            )
+            if paster:
+                paster.finish(result)
+            self._attach_input_budget(result, input_content)
+            self._store_image_result(
+                agent_name, input_content, selected_text, output_mode, context_folder, focus_file, result
             )
             self._handle_result(result, current_agent)
+            self.input_manager.commit_input(input_content)
         except Exception as e:
+            if paster:
+                paster.abort()
             error_msg = f"Error processing: {str(e)}"
             logger.error(error_msg)
             if self.large_popup:
@@ -152,6 +215,9 @@ class AgentClickSystem:
                     f"❌ {error_msg}",
                     "error"
                 )
+        finally:
+            for path in image_paths:
+                get_image_store().unpin(path)
 
     def _on_switch_pressed(self) -> None:
         """Handle Ctrl+Pause - switch to next agent."""
@@ -193,12 +259,51 @@ class AgentClickSystem:
         logger.info("Auto-processing dropped file...")
         self._process_input_with_current_agent(InputType.FILE_UPLOAD)
 
+    def _on_files_dropped(self, paths: list) -> None:
+        """Handle several files or a folder dropped on mini popup.
+
+        Args:
+            paths: Dropped file and folder paths
+        """
+        logger.info(f"{len(paths)} items dropped")
+
+        # Configure one bundled file upload
+        self.input_manager.set_files_upload(paths)
+
+        if self.large_popup:
+            self.signals.log_message_signal.emit(
+                f"📎 Bundling {len(paths)} dropped items",
+                "info"
+            )
+
+        logger.info("Auto-processing dropped files...")
+        self._process_input_with_current_agent(InputType.FILE_UPLOAD)
+
     def _on_screenshot_pressed(self) -> None:
         """Handle Ctrl+Shift+Pause - take screenshot."""
         logger.info("Screenshot hotkey pressed")
 
+        # Capture only the part of the screen the agent is configured for
+        current_agent = self.agent_registry.get_current_agent()
+        mode = CaptureMode.FULL_SCREEN
+        if current_agent:
+            mode = CaptureMode.from_string(self.config_manager.get_screenshot_mode(current_agent.metadata.name))
+
+        if mode == CaptureMode.REGION:
+            region = self._select_region()
+            if region is None:
+                logger.info("Screenshot cancelled")
+                if self.large_popup:
+                    self.signals.log_message_signal.emit("📸 Screenshot cancelled", "info")
+                return
+        else:
+            region = resolve_capture_region(mode)
+
         # Take screenshot
-        input_content = self.input_manager.take_screenshot()
+        input_content = self.input_manager.take_screenshot(
+            region=region,
+            region_description=mode.description
+        )
 
         if input_content:
             if self.large_popup:
@@ -208,7 +313,7 @@ class AgentClickSystem:
                 )
 
             # Auto-process screenshot
-            self._process_input_with_current_agent(InputType.SCREENSHOT)
+            self._process_input_with_current_agent(InputType.SCREENSHOT, input_content)
         else:
             logger.error("Failed to capture screenshot")
             if self.large_popup:
@@ -217,11 +322,13 @@ class AgentClickSystem:
                     "error"
                 )
 
-    def _process_input_with_current_agent(self, input_type: InputType) -> None:
+    def _process_input_with_current_agent(self, input_type: InputType,
+                                          input_content: Optional[InputContent] = None) -> None:
         """Process input with current agent.
 
         Args:
             input_type: Type of input to process
+            input_content: Input already captured by the caller (captured here if None)
         """
         current_agent = self.agent_registry.get_current_agent()
         if not current_agent:
@@ -233,6 +340,12 @@ class AgentClickSystem:
         # Get agent configuration
         agent_name = current_agent.metadata.name
         allowed_inputs = self.config_manager.get_allowed_inputs(agent_name)
+        if self.config_manager.is_composite(agent_name):
+            # Composite agents accept each of their sources on its own
+            allowed_inputs = allowed_inputs + self.config_manager.get_composite_inputs(agent_name)
+
+        self.input_manager.set_git_repository(self.config_manager.get_context_folder(agent_name))
+        self.input_manager.set_log_file(self.config_manager.get_log_file(agent_name))
 
         # Check if input type is allowed
         if input_type.value not in allowed_inputs:
@@ -256,10 +369,11 @@ class AgentClickSystem:
             return
 
         # Capture input
-        input_content = self.input_manager.capture_input(
-            preferred_type=input_type,
-            allowed_inputs=allowed_inputs  # NOVO: Pass allowed inputs
-        )
+        if input_content is None:
+            input_content = self.input_manager.capture_input(
+                preferred_type=input_type,
+                allowed_inputs=allowed_inputs  # NOVO: Pass allowed inputs
+            )
 
         if not input_content:
             logger.warning(f"No input available for type: {input_type.value}")
@@ -282,8 +396,9 @@ class AgentClickSystem:
         logger.info(f"Input type: {input_type.value}")
         logger.info(f"Output mode: {output_mode}")
 
-        # Pass image path if available
-        image_path = input_content.image_path
+        # Pass image path if available (every image of a composite input)
+        image_paths = input_content.get_image_paths()
+        image_path = image_paths if len(image_paths) > 1 else input_content.image_path
 
         # Get verbose logging setting
         verbose_logging = self.config_manager.get_verbose_logging(agent_name)
@@ -294,6 +409,23 @@ class AgentClickSystem:
             if self.large_popup:
                 self.signals.log_message_signal.emit(message, "info")
 
+        # Near-duplicate image already processed by this agent
+        cached_result = self._get_cached_image_result(
+            agent_name, input_content, selected_text, output_mode, context_folder, focus_file
+        )
+        if cached_result:
+            self._handle_result(cached_result, current_agent)
+            self.input_manager.commit_input(input_content)
+            return
+
+        # Keep the images from being evicted while the agent uses them
+        for path in image_paths:
+            get_image_store().pin(path)
+
+        # Streaming paste starts at the cursor while the agent is still generating
+        paster = self._create_stream_paster(current_agent, output_mode)
+        stream_kwargs = {"stream_callback": paster.feed} if paster else {}
+
         # Process with agent
         try:
             result = current_agent.process(
@@ -303,10 +435,20 @@ class AgentClickSystem:
                 output_mode,
                 image_path=image_path,  # NOVO: Pass image path
                 verbose_logging=verbose_logging,
-                log_callback=verbose_log_callback
+                log_callback=verbose_log_callback,
+                **stream_kwargs
+            )
+            if paster:
+                paster.finish(result)
+            self._attach_input_budget(result, input_content)
+            self._store_image_result(
+                agent_name, input_content, selected_text, output_mode, context_folder, focus_file, result
             )
             self._handle_result(result, current_agent)
+            self.input_manager.commit_input(input_content)
         except Exception as e:
+            if paster:
+                paster.abort()
             error_msg = f"Error processing: {str(e)}"
             logger.error(error_msg)
             if self.large_popup:
@@ -314,6 +456,9 @@ class AgentClickSystem:
                     f"❌ {error_msg}",
                     "error"
                 )
+        finally:
+            for path in image_paths:
+                get_image_store().unpin(path)
 
     def _on_mini_popup_clicked(self) -> None:
         """Handle mini popup click - show large popup."""
@@ -385,6 +530,159 @@ class AgentClickSystem:
             if self.large_popup:
                 self.signals.log_message_signal.emit(f"❌ Error: {str(e)}", "error")
 
+    def _select_region(self, timeout: float = 120.0) -> Optional[tuple]:
+        """Let the user drag out a screenshot region (blocks the calling thread).
+
+        Args:
+            timeout: Maximum seconds to wait for the selection
+
+        Returns:
+            (left, top, width, height) in physical pixels, or None if cancelled
+        """
+        request = _RegionRequest()
+        self.signals.select_region_signal.emit(request)
+        if not request.done.wait(timeout):
+            logger.warning("Region selection timed out")
+            return None
+        return request.region
+
+    def _select_region_in_main_thread(self, request: _RegionRequest) -> None:
+        """Show the region selector overlay in main thread (called via signal for thread safety)."""
+        from ui.region_selector import RegionSelectorWidget
+
+        try:
+            self._region_selector = RegionSelectorWidget()
+            self._region_selector.region_selected.connect(request.finish)
+            self._region_selector.start()
+        except Exception as e:
+            logger.error(f"❌ Error showing region selector: {e}", exc_info=True)
+            request.finish(None)
+
+    def _attach_input_budget(self, result: AgentResult, input_content: InputContent) -> None:
+        """Copy the input budget report into the result metadata.
+
+        Args:
+            result: AgentResult from agent
+            input_content: Input the agent processed
+        """
+        report = (input_content.metadata or {}).get("input_budget")
+        if not report:
+            return
+
+        result.metadata["input_budget"] = report
+        if report["truncated"] and self.large_popup:
+            self.signals.log_message_signal.emit(
+                f"✂️ Input reduced to fit budget: dropped {'; '.join(report['dropped'])}",
+                "warning"
+            )
+
+    def _create_stream_paster(self, agent: BaseAgent, output_mode: str):
+        """Create a StreamingPaster for the PASTE_STREAM output mode.
+
+        Args:
+            agent: Agent about to process the input
+            output_mode: Output mode of the agent
+
+        Returns:
+            StreamingPaster, or None if the mode is not PASTE_STREAM or the
+            agent cannot stream (process() without stream_callback)
+        """
+        from agents.output_modes import OutputMode
+
+        if OutputMode.from_string(output_mode) != OutputMode.PASTE_STREAM:
+            return None
+
+        import inspect
+        if "stream_callback" not in inspect.signature(agent.process).parameters:
+            logger.info(f"{agent.metadata.name} does not support streaming - pasting when done")
+            return None
+
+        from core.stream_paster import StreamingPaster
+        return StreamingPaster(self.selection_manager)
+
+    @staticmethod
+    def _image_result_key(text: str, output_mode: str, context_folder: Optional[str],
+                          focus_file: Optional[str]) -> Optional[str]:
+        """Key of a reusable image result (None if results must not be reused).
+
+        Only clipboard results are reused: file and patch results write to
+        disk, and replaying them could overwrite edits made since.
+        """
+        from agents.output_modes import OutputMode
+
+        if OutputMode.from_string(output_mode) not in (OutputMode.CLIPBOARD_PURE, OutputMode.CLIPBOARD_RICH):
+            return None
+        return f"{output_mode}\n{context_folder}\n{focus_file}\n{text}"
+
+    def _get_cached_image_result(self, agent_name: str, input_content: InputContent,
+                                 text: str, output_mode: str, context_folder: Optional[str],
+                                 focus_file: Optional[str]) -> Optional[AgentResult]:
+        """Get the result of a previous run on an exactly identical image.
+
+        Args:
+            agent_name: Agent name
+            input_content: Captured input
+            text: Text passed to the agent
+            output_mode: Output mode of the agent
+            context_folder: Context folder of the agent
+            focus_file: Focus file of the agent
+
+        Returns:
+            Cached AgentResult or None
+        """
+        digest = (input_content.metadata or {}).get("pixel_digest")
+        if not input_content.image_path or digest is None:
+            return None
+        if not self.config_manager.get_reuse_image_results(agent_name):
+            return None
+
+        key = self._image_result_key(text, output_mode, context_folder, focus_file)
+        index = get_image_dedup_index()
+        if not key or not index.has_results(agent_name, key):
+            return None
+        try:
+            cached = index.get_result(digest.result(timeout=self.PIXEL_DIGEST_TIMEOUT), agent_name, key)
+        except Exception as e:
+            logger.debug(f"Pixel digest unavailable - not reusing a result: {e}")
+            return None
+        if cached is None:
+            return None
+
+        logger.info("♻️  Same image already processed - reusing previous result")
+        if self.large_popup:
+            self.signals.log_message_signal.emit("♻️  Same image - reusing previous result", "info")
+        # Nothing was streamed yet (the result must be pasted at once); the
+        # original started_at is kept for the output writer's conflict check
+        metadata = {k: v for k, v in (cached.metadata or {}).items() if k != "stream_paste"}
+        return replace(cached, metadata={**metadata, "reused_result": True})
+
+    def _store_image_result(self, agent_name: str, input_content: InputContent, text: str,
+                            output_mode: str, context_folder: Optional[str], focus_file: Optional[str],
+                            result: AgentResult) -> None:
+        """Remember a result for reuse with exactly identical images.
+
+        Args:
+            agent_name: Agent name
+            input_content: Captured input
+            text: Text passed to the agent
+            output_mode: Output mode of the agent
+            context_folder: Context folder of the agent
+            focus_file: Focus file of the agent
+            result: AgentResult from agent
+        """
+        digest = (input_content.metadata or {}).get("pixel_digest")
+        if digest is None or not input_content.image_path or not result.content:
+            return
+        if not self.config_manager.get_reuse_image_results(agent_name):
+            return
+        key = self._image_result_key(text, output_mode, context_folder, focus_file)
+        if not key:
+            return
+        try:
+            get_image_dedup_index().store_result(digest.result(timeout=self.PIXEL_DIGEST_TIMEOUT), agent_name, key, result)
+        except Exception as e:
+            logger.debug(f"Pixel digest unavailable - result not cached: {e}")
+
     def _handle_result(self, result: AgentResult, agent: BaseAgent) -> None:
         """Handle agent processing result.
 
@@ -407,10 +705,12 @@ class AgentClickSystem:
 
         if success:
             mode = result.output_mode
-            if mode == OutputMode.FILE:
-                logger.info("✅ Output saved to file")
-                if self.large_popup:
-                    self.signals.log_message_signal.emit("✅ Saved to file", "success")
+            if mode == OutputMode.PATCH:
+                logger.info("✅ Patch applied")
+            elif mode.should_use_file():
+                # Written on the output writer's I/O threads; the output
+                # handler reports the outcome once the write is done
+                logger.info("💾 Output queued for writing")
             elif mode == OutputMode.INTERACTIVE_EDITOR:
                 logger.info("✅ Interactive editor completed")
                 if self.large_popup:
@@ -434,6 +734,11 @@ class AgentClickSystem:
         """Cleanup system resources."""
         logger.info("Cleaning up...")
         self.click_processor.cleanup()
+        self.input_manager.shutdown()
+        get_image_encoder().shutdown()
+        get_image_store().stop()
+        get_file_watcher().stop()
+        get_output_writer().stop()
         if self.mini_popup:
             self.mini_popup.close()
         if self.large_popup:
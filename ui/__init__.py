@@ -2,5 +2,6 @@
 
 from .popup_window import PopupWindow
 from .mini_popup import MiniPopupWidget
+from .region_selector import RegionSelectorWidget
 
-__all__ = ['PopupWindow', 'MiniPopupWidget']
+__all__ = ['PopupWindow', 'MiniPopupWidget', 'RegionSelectorWidget']
@@ -1,5 +1,6 @@
 """Mini popup widget - Always visible, discreet indicator in bottom-right corner."""
 
+import os
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QCursor, QFont, QDragEnterEvent, QDropEvent
@@ -14,6 +15,7 @@ class MiniPopupWidget(QWidget):
 
     clicked = pyqtSignal()  # Signal when clicked
     file_dropped = pyqtSignal(str)  # NOVO: Signal when file dropped
+    files_dropped = pyqtSignal(list)  # Signal when several files or a folder are dropped
 
     def __init__(self, initial_agent: BaseAgent):
         """Initialize mini popup.
@@ -197,14 +199,15 @@ class MiniPopupWidget(QWidget):
         mime_data = event.mimeData()
 
         if mime_data.hasUrls():
-            # Get first file from the list
-            files = [u.toLocalFile() for u in mime_data.urls()]
+            files = [u.toLocalFile() for u in mime_data.urls() if u.isLocalFile()]
             if files:
-                file_path = files[0]
-                self.logger.info(f"File dropped on mini popup: {file_path}")
-
-                # Emit signal
-                self.file_dropped.emit(file_path)
+                # Several files or a folder become one bundled input
+                if len(files) == 1 and not os.path.isdir(files[0]):
+                    self.logger.info(f"File dropped on mini popup: {files[0]}")
+                    self.file_dropped.emit(files[0])
+                else:
+                    self.logger.info(f"{len(files)} items dropped on mini popup")
+                    self.files_dropped.emit(files)
 
                 # Reset appearance
                 self.setFixedSize(60, 60)
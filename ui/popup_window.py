@@ -324,6 +324,38 @@ class PopupWindow(QWidget):
 
         config_form.addRow("Focus File:", focus_layout)
 
+        # Log File
+        self.log_file_edit = QLineEdit()
+        self.log_file_edit.setPlaceholderText(r"C:\path\to\app.log")
+        self.log_file_edit.setStyleSheet("""
+            QLineEdit {
+                padding: 5px;
+                border: 1px solid #cccccc;
+                border-radius: 3px;
+            }
+        """)
+
+        log_browse_btn = QPushButton("📄 Browse")
+        log_browse_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #0078d4;
+                color: #ffffff;
+                border: none;
+                padding: 5px 10px;
+                border-radius: 3px;
+            }
+            QPushButton:hover {
+                background-color: #005a9e;
+            }
+        """)
+        log_browse_btn.clicked.connect(self._browse_log_file)
+
+        log_layout = QHBoxLayout()
+        log_layout.addWidget(self.log_file_edit)
+        log_layout.addWidget(log_browse_btn)
+
+        config_form.addRow("Log File:", log_layout)
+
         # Output
         output_mode_label = QLabel("Output:")
         output_mode_label.setStyleSheet("""
@@ -392,7 +424,10 @@ class PopupWindow(QWidget):
             ("VSCode Active File", InputType.VSCODE_ACTIVE_FILE.value),
             ("File Upload (drag & drop)", InputType.FILE_UPLOAD.value),
             ("Clipboard Image", InputType.CLIPBOARD_IMAGE.value),
-            ("Screenshot (Ctrl+Shift+Pause)", InputType.SCREENSHOT.value)
+            ("Screenshot (Ctrl+Shift+Pause)", InputType.SCREENSHOT.value),
+            ("Git Diff (context folder changes)", InputType.GIT_DIFF.value),
+            ("Log Tail (new log lines)", InputType.LOG_TAIL.value),
+            ("Composite (several sources at once)", InputType.COMPOSITE.value)
         ]
 
         for display_name, value in input_options:
@@ -400,6 +435,57 @@ class PopupWindow(QWidget):
 
         config_form.addRow(input_label, self.input_combo)
 
+        # Sources captured together by the composite input
+        self.composite_checkboxes = {}
+        composite_layout = QVBoxLayout()
+        composite_layout.setSpacing(2)
+        for display_name, value in input_options[:-1]:
+            checkbox = QCheckBox(display_name)
+            self.composite_checkboxes[value] = checkbox
+            composite_layout.addWidget(checkbox)
+
+        self.composite_group = QWidget()
+        self.composite_group.setLayout(composite_layout)
+        config_form.addRow("Combine:", self.composite_group)
+        self.input_combo.currentIndexChanged.connect(self._update_composite_enabled)
+
+        # Screenshot capture mode
+        screenshot_mode_label = QLabel("Screenshot:")
+        screenshot_mode_label.setStyleSheet("""
+            QLabel {
+                font-size: 11px;
+                font-weight: bold;
+                color: #333333;
+            }
+        """)
+
+        self.screenshot_mode_combo = QComboBox()
+        self.screenshot_mode_combo.setStyleSheet("""
+            QComboBox {
+                padding: 5px;
+                border: 1px solid #cccccc;
+                border-radius: 3px;
+                background-color: white;
+            }
+            QComboBox::drop-down {
+                border: none;
+            }
+            QComboBox::down-arrow {
+                width: 12px;
+                height: 12px;
+            }
+        """)
+
+        from core.capture_region import CaptureMode
+        for mode in CaptureMode:
+            self.screenshot_mode_combo.addItem(mode.display_name, mode.value)
+
+        config_form.addRow(screenshot_mode_label, self.screenshot_mode_combo)
+
+        # Reuse of clipboard results for identical images
+        self.reuse_image_results_checkbox = QCheckBox("Reuse results for identical images")
+        config_form.addRow("Images:", self.reuse_image_results_checkbox)
+
 
         config_group.setLayout(config_form)
         config_layout.addWidget(config_group)
@@ -452,6 +538,17 @@ class PopupWindow(QWidget):
         if file:
             self.focus_file_edit.setText(file)
 
+    def _browse_log_file(self):
+        """Browse for log file."""
+        file, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Log File",
+            "",
+            "Log Files (*.log *.txt);;All Files (*.*)"
+        )
+        if file:
+            self.log_file_edit.setText(file)
+
     def _load_current_config(self):
         """Load configuration for current agent."""
         settings = self.config_manager.get_settings(self.current_agent.metadata.name)
@@ -462,12 +559,26 @@ class PopupWindow(QWidget):
         if settings.focus_file:
             self.focus_file_edit.setText(settings.focus_file)
 
+        if settings.log_file:
+            self.log_file_edit.setText(settings.log_file)
+
         # Load output mode
         if settings.output_mode:
             mode_index = self.output_mode_combo.findData(settings.output_mode)
             if mode_index >= 0:
                 self.output_mode_combo.setCurrentIndex(mode_index)
 
+        # Load composite sources
+        for value, checkbox in self.composite_checkboxes.items():
+            checkbox.setChecked(value in settings.composite_inputs)
+
+        # Load screenshot mode
+        mode_index = self.screenshot_mode_combo.findData(settings.screenshot_mode)
+        if mode_index >= 0:
+            self.screenshot_mode_combo.setCurrentIndex(mode_index)
+
+        self.reuse_image_results_checkbox.setChecked(settings.reuse_image_results)
+
         # Load selected input (first allowed input or default to text_selection)
         allowed_inputs = settings.allowed_inputs
         if allowed_inputs and len(allowed_inputs) > 0:
@@ -482,13 +593,22 @@ class PopupWindow(QWidget):
             if default_index >= 0:
                 self.input_combo.setCurrentIndex(default_index)
 
+        self._update_composite_enabled()
         self.logger.info(f"Loaded config for {self.current_agent.metadata.name}")
 
+    def _update_composite_enabled(self):
+        """Enable the composite source checkboxes only for the composite input."""
+        from core.input_strategy import InputType
+        self.composite_group.setEnabled(self.input_combo.currentData() == InputType.COMPOSITE.value)
+
     def _save_config(self):
         """Save configuration for current agent."""
         context_folder = self.context_folder_edit.text().strip() or None
         focus_file = self.focus_file_edit.text().strip() or None
+        log_file = self.log_file_edit.text().strip() or None
         output_mode = self.output_mode_combo.currentData()
+        screenshot_mode = self.screenshot_mode_combo.currentData()
+        composite_inputs = [v for v, checkbox in self.composite_checkboxes.items() if checkbox.isChecked()]
 
         # Get selected input (single selection)
         selected_input = self.input_combo.currentData()
@@ -499,6 +619,10 @@ class PopupWindow(QWidget):
             focus_file=focus_file,
             output_mode=output_mode,
             allowed_inputs=allowed_inputs,
+            screenshot_mode=screenshot_mode,
+            composite_inputs=composite_inputs,
+            log_file=log_file,
+            reuse_image_results=self.reuse_image_results_checkbox.isChecked(),
         )
 
         self.config_manager.update_settings(
@@ -0,0 +1,116 @@
+"""Region selector - translucent overlay for dragging out a screenshot region."""
+
+from typing import Optional
+from PyQt6.QtWidgets import QWidget, QRubberBand, QApplication
+from PyQt6.QtCore import Qt, QRect, QPoint, QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QCursor, QGuiApplication, QPainter
+from utils.logger import setup_logger
+
+logger = setup_logger('RegionSelector')
+
+
+class RegionSelectorWidget(QWidget):
+    """Full-screen overlay on the monitor under the cursor.
+
+    The user drags a rectangle with the left mouse button; Esc or a right
+    click cancels. Emits region_selected with (left, top, width, height) in
+    physical screen pixels, or None if cancelled.
+    """
+
+    region_selected = pyqtSignal(object)
+
+    # Selections smaller than this (in pixels) are treated as a click and cancel
+    MIN_SIZE = 8
+
+    def __init__(self):
+        """Initialize region selector."""
+        super().__init__()
+        self.screen_ = QGuiApplication.screenAt(QCursor.pos()) or QApplication.primaryScreen()
+        self._origin: Optional[QPoint] = None
+        self._finished = False
+        self._rubber_band = QRubberBand(QRubberBand.Shape.Rectangle, self)
+
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.Tool
+        )
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.setCursor(QCursor(Qt.CursorShape.CrossCursor))
+        self.setGeometry(self.screen_.geometry())
+
+    def start(self) -> None:
+        """Show the overlay and grab keyboard focus."""
+        self.show()
+        self.activateWindow()
+        self.raise_()
+        self.setFocus()
+
+    def paintEvent(self, event):
+        """Dim the screen behind the overlay."""
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 90))
+
+    def mousePressEvent(self, event):
+        """Start the selection (left) or cancel (right)."""
+        if event.button() == Qt.MouseButton.RightButton:
+            self._finish(None)
+            return
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._origin = event.position().toPoint()
+            self._rubber_band.setGeometry(QRect(self._origin, QSize()))
+            self._rubber_band.show()
+
+    def mouseMoveEvent(self, event):
+        """Resize the rubber band."""
+        if self._origin is not None:
+            self._rubber_band.setGeometry(QRect(self._origin, event.position().toPoint()).normalized())
+
+    def mouseReleaseEvent(self, event):
+        """Finish the selection."""
+        if event.button() != Qt.MouseButton.LeftButton or self._origin is None:
+            return
+        rect = QRect(self._origin, event.position().toPoint()).normalized()
+        if rect.width() < self.MIN_SIZE or rect.height() < self.MIN_SIZE:
+            self._finish(None)
+        else:
+            self._finish(self._to_physical(rect))
+
+    def keyPressEvent(self, event):
+        """Cancel on Esc."""
+        if event.key() == Qt.Key.Key_Escape:
+            self._finish(None)
+
+    def closeEvent(self, event):
+        """Closing the overlay any other way counts as cancel."""
+        self._finish(None, close=False)
+        event.accept()
+
+    def _to_physical(self, rect: QRect) -> tuple:
+        """Convert a widget rectangle to physical screen pixels.
+
+        Qt keeps each screen's top-left corner in native coordinates and
+        scales the rest by the device pixel ratio.
+        """
+        origin = self.screen_.geometry().topLeft()
+        ratio = self.screen_.devicePixelRatio()
+        return (
+            origin.x() + round(rect.x() * ratio),
+            origin.y() + round(rect.y() * ratio),
+            round(rect.width() * ratio),
+            round(rect.height() * ratio),
+        )
+
+    def _finish(self, region: Optional[tuple], close: bool = True) -> None:
+        """Emit the result once and close the overlay."""
+        if self._finished:
+            return
+        self._finished = True
+        logger.info(f"Region selected: {region}" if region else "Region selection cancelled")
+        if close:
+            # Hide first so the overlay is not in the screenshot
+            self.hide()
+            QApplication.processEvents()
+            self.close()
+        self.region_selected.emit(region)